@@ -0,0 +1,471 @@
+"""
+Import Libraries
+"""
+
+import numpy as np
+
+import parameters
+
+from spatial_hash import SpatialHash
+from rock_field import RockField
+
+
+"""
+Function that adds up a value of every drone's nearby drones (or rocks)
+"""
+
+def sum_nearby(drones, values, number_of_drones):
+    x_total = np.bincount(drones, weights = values[:, 0], minlength = number_of_drones)
+    y_total = np.bincount(drones, weights = values[:, 1], minlength = number_of_drones)
+
+    return np.stack((x_total, y_total), axis = 1)
+
+
+"""
+Create the NeighborData class
+
+NOTE: The neighbor data is found once per time step and shared by every rule that needs
+      nearby drones. It holds every pair of drones within the largest sight distance the
+      rules use, and the drones' velocities from before any rule was applied (the nearby
+      drones' velocities are always taken from before the rules).
+"""
+
+class NeighborData():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, swarm, sight_offset):
+        # find every pair of drones within the largest sight distance
+        self.drones, self.neighbors, self.distance_magnitudes = swarm.update_neighbors(sight_offset)
+        swarm.profiler.count("neighbor_search", swarm.spatial_hash.number_of_checks, len(self.drones))
+
+        # the drones' velocities before the rules
+        self.velocities = swarm.velocities.copy()
+
+        # the pairs within each sight distance (so rules with the same sight distance share them)
+        self.nearby_pairs = {}
+
+
+    """
+    Function that finds which drones are within a sight distance of each other
+
+    NOTE: Returns the drones (i) and the nearby drones they can see (j). A drone never sees
+          itself.
+    """
+
+    def nearby(self, swarm, sight_offset):
+        # find the pairs if no other rule has found them yet
+        if (sight_offset not in self.nearby_pairs):
+            # only keep the pairs that are closer than the drone's sight distance
+            nearby = self.distance_magnitudes < (swarm.sight_distances[self.drones] + sight_offset)
+            self.nearby_pairs[sight_offset] = (self.drones[nearby], self.neighbors[nearby])
+
+        # return the nearby drones
+        return self.nearby_pairs[sight_offset]
+
+
+"""
+Create the Rule class
+
+NOTE: A rule calculates a velocity for every drone that is added to the drones' velocities.
+      Each rule has a weight (the percentage or factor that scales the velocity), a sight
+      offset (added to each drone's sight distance), and can be turned off. Rules that need
+      nearby drones set needs_neighbors so the pipeline finds the nearby drones for them.
+
+NOTE 2: setting_names lists the values that change how the rule moves the drones. They are
+        saved in run manifests so a run can be repeated with the same rules.
+"""
+
+class Rule():
+    # the rule's name in the pipeline
+    name = "rule"
+
+    # whether the rule needs the nearby drones
+    needs_neighbors = False
+
+    # the values that change how the rule moves the drones
+    setting_names = ("weight", "sight_offset", "enabled")
+
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, weight, sight_offset = 0, enabled = True):
+        self.weight = weight
+        self.sight_offset = sight_offset
+        self.enabled = enabled
+
+
+    """
+    Functions that return the rule's settings and change them
+    """
+
+    def settings(self):
+        return {name: getattr(self, name) for name in self.setting_names}
+
+    def load_settings(self, settings):
+        for name in self.setting_names:
+            if (name in settings):
+                setattr(self, name, settings[name])
+
+
+    """
+    Function that calculates the rule's velocity for every drone
+
+    NOTE: velocities are the drones' current velocities (after the rules before this one).
+          neighbor_data is None for rules that do not need nearby drones.
+    """
+
+    def velocities(self, swarm, velocities, neighbor_data, rocks_positions):
+        raise NotImplementedError
+
+
+"""
+Boids Algorithm
+
+Rule 1: Separation
+Rule that makes drones avoid nearby drones
+"""
+
+class Separation(Rule):
+    name = "separation"
+    needs_neighbors = True
+
+    def __init__(self, weight = parameters.drone_avoidance_percentage_factor, sight_offset = 0, enabled = True):
+        super().__init__(weight, sight_offset, enabled)
+
+    def velocities(self, swarm, velocities, neighbor_data, rocks_positions):
+        # find the drones within the sight distance
+        drones, neighbors = neighbor_data.nearby(swarm, self.sight_offset)
+        swarm.profiler.count(self.name, len(neighbor_data.drones), len(drones))
+
+        # add the distances between each drone and its nearby drones to the total
+        drone_avoid_directions = sum_nearby(drones, swarm.positions[drones] - swarm.positions[neighbors], swarm.number_of_drones)
+
+        # multiply the avoid directions by the drone avoid percentage
+        return self.weight * drone_avoid_directions
+
+
+"""
+Rule 2: Alignment
+Rule that makes drones match the average velocity of nearby drones
+"""
+
+class Alignment(Rule):
+    name = "alignment"
+    needs_neighbors = True
+
+    def __init__(self, weight = parameters.match_velocity_percentage_factor, sight_offset = 30, enabled = True):
+        super().__init__(weight, sight_offset, enabled)
+
+    def velocities(self, swarm, velocities, neighbor_data, rocks_positions):
+        # find the drones within the sight distance
+        drones, neighbors = neighbor_data.nearby(swarm, self.sight_offset)
+        swarm.profiler.count(self.name, len(neighbor_data.drones), len(drones))
+
+        # count the nearby drones and add their velocities to the total
+        number_of_nearby_drones = np.bincount(drones, minlength = swarm.number_of_drones)
+        total_drone_velocities = sum_nearby(drones, neighbor_data.velocities[neighbors], swarm.number_of_drones)
+
+        # only update the drones that have nearby drones (avoids dividing by 0)
+        has_nearby_drones = number_of_nearby_drones != 0
+
+        # divide the total velocity by the number of nearby drones to get the average velocity
+        average_drone_velocities = total_drone_velocities[has_nearby_drones] / number_of_nearby_drones[has_nearby_drones, None]
+
+        # subtract the average velocity by the drone's velocity and multiply it by the match velocity percentage
+        drone_alignment_velocities = np.zeros_like(velocities)
+        drone_alignment_velocities[has_nearby_drones] = self.weight * (average_drone_velocities - velocities[has_nearby_drones])
+
+        # return the drone alignment velocities
+        return drone_alignment_velocities
+
+
+"""
+Rule 3: Cohesion
+Rule that makes drones fly towards the center of mass of nearby drones
+"""
+
+class Cohesion(Rule):
+    name = "cohesion"
+    needs_neighbors = True
+
+    def __init__(self, weight = parameters.go_to_center_percentage_factor, sight_offset = 30, enabled = True):
+        super().__init__(weight, sight_offset, enabled)
+
+    def velocities(self, swarm, velocities, neighbor_data, rocks_positions):
+        # find the drones within the sight distance
+        drones, neighbors = neighbor_data.nearby(swarm, self.sight_offset)
+        swarm.profiler.count(self.name, len(neighbor_data.drones), len(drones))
+
+        # count the nearby drones and add their positions to the total
+        number_of_nearby_drones = np.bincount(drones, minlength = swarm.number_of_drones)
+        total_drone_positions = sum_nearby(drones, swarm.positions[neighbors], swarm.number_of_drones)
+
+        # only update the drones that have nearby drones (avoids dividing by 0)
+        has_nearby_drones = number_of_nearby_drones != 0
+
+        # divide the total position by the number of nearby drones to get the center of mass
+        centers_of_mass = total_drone_positions[has_nearby_drones] / number_of_nearby_drones[has_nearby_drones, None]
+
+        # subtract the center of mass by the drone's position and multiply it by the go to center percentage
+        drone_cohesion_velocities = np.zeros_like(velocities)
+        drone_cohesion_velocities[has_nearby_drones] = self.weight * (centers_of_mass - swarm.positions[has_nearby_drones])
+
+        # return the drone cohesion velocities
+        return drone_cohesion_velocities
+
+
+"""
+Self-defined models:
+
+Rule that makes drones near the border change direction
+"""
+
+class BorderAvoidance(Rule):
+    name = "border_avoidance"
+    setting_names = ("weight", "margin", "enabled")
+
+    def __init__(self, weight = parameters.change_border_direction_factor, margin = parameters.border_margin, enabled = True):
+        super().__init__(weight, 0, enabled)
+
+        # the border margin
+        self.margin = margin
+
+    def velocities(self, swarm, velocities, neighbor_data, rocks_positions):
+        # start from the drones' current velocities
+        border_avoid_velocities = velocities.copy()
+
+        # get the drones' positions
+        x_positions = swarm.positions[:, 0]
+        y_positions = swarm.positions[:, 1]
+
+        # reverse the velocity of the drones at the left of the screen
+        border_avoid_velocities[x_positions < self.margin, 0] += self.weight
+
+        # reverse the velocity of the drones at the right of the screen
+        # (add 100 to shift graph)
+        border_avoid_velocities[x_positions > (swarm.width + 100 - self.margin), 0] -= self.weight
+
+        # reverse the velocity of the drones at the top of the screen
+        border_avoid_velocities[y_positions < self.margin, 1] += self.weight
+
+        # reverse the velocity of the drones at the bottom of the screen
+        # (add 100 to shift graph)
+        border_avoid_velocities[y_positions > (swarm.height + 100 - self.margin), 1] -= self.weight
+
+        # return the border avoidance velocities
+        return border_avoid_velocities
+
+
+"""
+Rule that makes drones near a rock avoid it
+
+NOTE: The rocks never move after they are scattered, so they are put into a spatial hash
+      (cells as wide as the largest rock sight distance) the first time they are avoided.
+      The spatial hash is only rebuilt if a different rock list, number of rocks,
+      avoid_rock_radius, or sight distance is used.
+"""
+
+class RockAvoidance(Rule):
+    name = "rock_avoidance"
+    setting_names = ("weight", "sight_offset", "avoid_rock_radius", "rock_field_resolution", "enabled")
+
+    def __init__(self, weight = parameters.rock_avoidance_percentage_factor, sight_offset = 10, avoid_rock_radius = parameters.avoid_rock_radius, enabled = True):
+        super().__init__(weight, sight_offset, enabled)
+
+        # the avoidance radius of the rocks
+        self.avoid_rock_radius = avoid_rock_radius
+
+        # the spatial hash of the rocks and what it was built from
+        self.rock_index = None
+        self.rocks_positions = None
+        self.rocks = None
+        self.index_parameters = None
+
+        # the precomputed rock avoidance field (only used if use_rock_field() is called)
+        self.rock_field = None
+        self.rock_field_resolution = None
+        self.rock_field_cache_folder = None
+
+
+    """
+    Function that puts the rocks into a spatial hash
+    """
+
+    def update_rocks(self, swarm, rocks_positions):
+        # create an area of avoidance for each rock
+        self.rocks = np.asarray(rocks_positions, dtype = float).reshape(-1, 2) + self.avoid_rock_radius
+
+        # the largest sight distance used to avoid rocks
+        largest_sight_distance = swarm.sight_distances.max(initial = 0) + self.sight_offset
+
+        # put every rock into its cell
+        # (add 100 to shift graph)
+        self.rock_index = SpatialHash(swarm.width + 100, swarm.height + 100, largest_sight_distance)
+        self.rock_index.rebuild(self.rocks)
+
+        # remember what the spatial hash was built from
+        self.rocks_positions = rocks_positions
+        self.index_parameters = (len(rocks_positions), self.avoid_rock_radius, largest_sight_distance, self.weight)
+
+        # calculate the rock avoidance field if it is used
+        # (add 100 to shift graph)
+        if (self.rock_field_resolution is not None):
+            self.rock_field = RockField(swarm.width + 100, swarm.height + 100, rocks_positions, self.avoid_rock_radius, swarm.sight_distances.max(initial = 0), self.weight, self.rock_field_resolution, self.sight_offset)
+
+            # read the field from the cache folder if it has been saved before
+            if (self.rock_field_cache_folder is not None):
+                self.rock_field.load_or_build(self.rock_field_cache_folder)
+            else:
+                self.rock_field.build()
+
+
+    """
+    Function that makes the rule use a precomputed rock avoidance field
+
+    NOTE: The field is calculated once on a grid with the given resolution (the spacing
+          between grid points) and each drone blends the 4 grid points around it. The cost
+          per drone then does not depend on the number of rocks. The field is saved in the
+          cache folder (if given) and read back the next time the same rocks are used
+          with the same settings (including the sight offset).
+    """
+
+    def use_rock_field(self, resolution = 5, cache_folder = None):
+        # turn on the rock avoidance field
+        self.rock_field_resolution = resolution
+        self.rock_field_cache_folder = cache_folder
+
+        # make sure the field is calculated the next time the rocks are avoided
+        self.rock_index = None
+
+
+    def load_settings(self, settings):
+        super().load_settings(settings)
+
+        # make sure the rocks (and the field) are put back together with the new settings
+        self.rock_index = None
+        self.rock_field = None
+
+
+    def velocities(self, swarm, velocities, neighbor_data, rocks_positions):
+        # the largest sight distance used to avoid rocks
+        largest_sight_distance = swarm.sight_distances.max(initial = 0) + self.sight_offset
+
+        # put the rocks into a spatial hash if they have changed
+        index_parameters = (len(rocks_positions), self.avoid_rock_radius, largest_sight_distance, self.weight)
+        if ((self.rock_index is None) or (rocks_positions is not self.rocks_positions) or (index_parameters != self.index_parameters)):
+            self.update_rocks(swarm, rocks_positions)
+
+        # look up the rock avoidance velocities if the rock avoidance field is used
+        if (self.rock_field is not None):
+            return self.rock_field.lookup(swarm.positions)
+
+        # find the rocks within each drone's largest possible sight distance
+        drones, rocks, distance_magnitudes = self.rock_index.query(swarm.positions, largest_sight_distance)
+
+        # check which rocks are closer than the allowed distance
+        nearby = distance_magnitudes < (swarm.sight_distances[drones] + self.sight_offset)
+        drones = drones[nearby]
+        rocks = rocks[nearby]
+        swarm.profiler.count(self.name, self.rock_index.number_of_checks, len(drones))
+
+        # add the distances of the nearby rocks to the total
+        rock_avoid_directions = sum_nearby(drones, swarm.positions[drones] - self.rocks[rocks], swarm.number_of_drones)
+
+        # multiply the avoid directions by the rock avoid percentage
+        return self.weight * rock_avoid_directions
+
+
+"""
+Create the BehaviorPipeline class
+
+NOTE: The pipeline applies its rules in order, adding each rule's velocity to the drones'
+      velocities as soon as it is calculated. Rules that are turned off are skipped
+      completely. The nearby drones are found once for every rule that needs them, using
+      the largest sight distance of the rules that are turned on, so turning rules off
+      makes each time step faster.
+"""
+
+class BehaviorPipeline():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+
+
+    """
+    Function that returns the rule with the given name
+    """
+
+    def __getitem__(self, name):
+        for rule in self.rules:
+            if (rule.name == name):
+                return rule
+
+        raise KeyError(name)
+
+
+    """
+    Functions that return every rule's settings (by rule name) and change them
+    """
+
+    def settings(self):
+        return {rule.name: rule.settings() for rule in self.rules}
+
+    def load_settings(self, settings):
+        for name, rule_settings in settings.items():
+            self[name].load_settings(rule_settings)
+
+
+    """
+    Function that finds the nearby drones for the rules that are turned on (None if no rule needs them)
+    """
+
+    def neighbor_data(self, swarm, rules):
+        # the sight offsets of the rules that need nearby drones
+        sight_offsets = [rule.sight_offset for rule in rules if rule.needs_neighbors]
+
+        # check if any rule needs nearby drones
+        if (len(sight_offsets) == 0):
+            return None
+
+        # find the nearby drones within the largest sight distance
+        return NeighborData(swarm, max(sight_offsets))
+
+
+    """
+    Function that applies every rule that is turned on to the swarm
+    """
+
+    def apply(self, swarm, rocks_positions):
+        # the rules that are turned on
+        rules = [rule for rule in self.rules if rule.enabled]
+
+        # find the nearby drones once for every rule
+        neighbor_data = self.neighbor_data(swarm, rules)
+
+        # go through each rule
+        for rule in rules:
+            # add the rule's velocity to the drones' velocities
+            swarm.velocities = swarm.velocities + rule.velocities(swarm, swarm.velocities, neighbor_data, rocks_positions)
+
+
+"""
+Function that creates the default pipeline from the changeable parameters
+
+NOTE: The rules are in the same order main.py has always used (separation, alignment,
+      cohesion, border avoidance, rock avoidance).
+"""
+
+def default_pipeline():
+    return BehaviorPipeline([
+        Separation(parameters.drone_avoidance_percentage_factor),
+        Alignment(parameters.match_velocity_percentage_factor),
+        Cohesion(parameters.go_to_center_percentage_factor),
+        BorderAvoidance(parameters.change_border_direction_factor, parameters.border_margin),
+        RockAvoidance(parameters.rock_avoidance_percentage_factor, avoid_rock_radius = parameters.avoid_rock_radius),
+    ])
@@ -0,0 +1,226 @@
+"""
+Import Libraries
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from manifest import create_simulation
+
+
+"""
+Create the benchmark sizes
+
+NOTE: Every amount of drones is timed with every amount of rocks.
+"""
+
+drone_counts = [10, 100, 1000, 10000]
+rock_counts = [5, 100, 10000]
+
+
+"""
+Create the timed methods
+
+NOTE: Each Swarm method is timed on its own, and "tick" times a whole Swarm.step() (the
+      speed check, moving the drones, and every rule of the pipeline).
+"""
+
+method_names = ["rule_one_separation", "rule_two_alignment", "rule_three_cohesion", "border_avoidance", "rock_avoidance", "drone_speed_check", "tick"]
+
+
+"""
+Create the benchmark settings
+"""
+
+# the seed used to scatter the drones and rocks (so every benchmark times the same swarm)
+benchmark_seed = 0
+
+# the least and most times each method is run, and how long to keep running it (seconds)
+minimum_repeats = 3
+maximum_repeats = 50
+target_seconds = 0.25
+
+# how much slower than the baseline a method can be before it is a regression
+default_tolerance = 1.5
+
+
+"""
+Function that times a function
+
+NOTE: The function is run once before it is timed (so one-time costs like building the
+      rock index or compiling the numba kernel are not counted), then run until it has
+      taken target_seconds (at least minimum_repeats and at most maximum_repeats times).
+      Returns the median and fastest time of one run in seconds.
+"""
+
+def time_function(function):
+    # run the function once without timing it
+    function()
+
+    # time the function
+    times = []
+    while ((len(times) < minimum_repeats) or ((sum(times) < target_seconds) and (len(times) < maximum_repeats))):
+        start_time = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start_time)
+
+    # return the median and fastest time
+    return float(np.median(times)), float(min(times)), len(times)
+
+
+"""
+Function that times every method for one amount of drones and rocks
+"""
+
+def benchmark_swarm(number_of_drones, number_of_rocks):
+    # create the drones and rocks
+    swarm, rocks_positions = create_simulation(benchmark_seed, number_of_drones, number_of_rocks)
+
+    # the functions that run each method
+    functions = {
+        "rule_one_separation": swarm.rule_one_separation,
+        "rule_two_alignment": swarm.rule_two_alignment,
+        "rule_three_cohesion": swarm.rule_three_cohesion,
+        "border_avoidance": swarm.border_avoidance,
+        "rock_avoidance": lambda: swarm.rock_avoidance(rocks_positions),
+        "drone_speed_check": swarm.drone_speed_check,
+        "tick": lambda: swarm.step(rocks_positions),
+    }
+
+    # time each method
+    results = []
+    for method in method_names:
+        median, fastest, repeats = time_function(functions[method])
+        results.append({
+            "number_of_drones": number_of_drones,
+            "number_of_rocks": number_of_rocks,
+            "method": method,
+            "seconds": median,
+            "fastest_seconds": fastest,
+            "repeats": repeats,
+        })
+
+    # return the results
+    return results
+
+
+"""
+Function that times every method for every amount of drones and rocks
+
+NOTE: Returns the results with the machine and library versions they were timed on (the
+      format saved by save_results()).
+"""
+
+def run_benchmarks(drone_counts = drone_counts, rock_counts = rock_counts, log = True):
+    results = []
+
+    # go through each amount of drones and rocks
+    for number_of_drones in drone_counts:
+        for number_of_rocks in rock_counts:
+            swarm_results = benchmark_swarm(number_of_drones, number_of_rocks)
+            results.extend(swarm_results)
+
+            # print the tick time
+            if (log):
+                print(str(number_of_drones) + " drones, " + str(number_of_rocks) + " rocks: " + ('%.3f' % (1000 * swarm_results[-1]["seconds"])) + " ms per tick")
+
+    # return the results and what they were timed on
+    return {
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "python_version": platform.python_version(),
+        "numpy_version": np.__version__,
+        "results": results,
+    }
+
+
+"""
+Functions that save the results to a JSON file and read them back
+"""
+
+def save_results(results, file_name):
+    with open(file_name, "w") as file:
+        json.dump(results, file, indent = 4)
+
+def load_results(file_name):
+    with open(file_name) as file:
+        return json.load(file)
+
+
+"""
+Function that compares results against a baseline
+
+NOTE: Returns one row per method timed in both (drones, rocks, method, seconds, baseline
+      seconds, how many times slower it is, and whether that is more than the tolerance).
+"""
+
+def compare_results(results, baseline, tolerance = default_tolerance):
+    # the baseline time of each method
+    baseline_seconds = {(row["number_of_drones"], row["number_of_rocks"], row["method"]): row["seconds"] for row in baseline["results"]}
+
+    # compare each method
+    comparison = []
+    for row in results["results"]:
+        key = (row["number_of_drones"], row["number_of_rocks"], row["method"])
+        if (key not in baseline_seconds):
+            continue
+
+        ratio = row["seconds"] / baseline_seconds[key]
+        comparison.append(key + (row["seconds"], baseline_seconds[key], ratio, ratio > tolerance))
+
+    return comparison
+
+
+"""
+Function that prints a comparison against a baseline
+"""
+
+def print_comparison(comparison):
+    print("%8s %8s  %-20s %12s %12s %8s" % ("drones", "rocks", "method", "ms", "baseline ms", "ratio"))
+
+    for number_of_drones, number_of_rocks, method, seconds, baseline_seconds, ratio, regression in comparison:
+        print("%8d %8d  %-20s %12.4f %12.4f %8.2f%s" % (number_of_drones, number_of_rocks, method, 1000 * seconds, 1000 * baseline_seconds, ratio, "  REGRESSION" if (regression) else ""))
+
+
+"""
+Run the benchmarks and compare them against the baseline
+
+NOTE: The results are saved to benchmark.json. If a baseline is saved (benchmark_baseline.json
+      by default) the results are compared against it, and the script exits with an error if
+      any method is more than the tolerance times slower. --save-baseline makes these results
+      the new baseline.
+"""
+
+if __name__ == "__main__":
+    # read the command line options
+    parser = argparse.ArgumentParser(description = "Time one simulation tick and each rule for different amounts of drones and rocks")
+    parser.add_argument("--drones", type = int, nargs = "+", default = drone_counts, help = "the amounts of drones to time")
+    parser.add_argument("--rocks", type = int, nargs = "+", default = rock_counts, help = "the amounts of rocks to time")
+    parser.add_argument("--output", default = "benchmark.json", help = "the file the results are saved to")
+    parser.add_argument("--baseline", default = "benchmark_baseline.json", help = "the baseline the results are compared against")
+    parser.add_argument("--tolerance", type = float, default = default_tolerance, help = "how many times slower than the baseline is a regression")
+    parser.add_argument("--save-baseline", action = "store_true", help = "save the results as the new baseline")
+    arguments = parser.parse_args()
+
+    # run the benchmarks and save the results
+    results = run_benchmarks(arguments.drones, arguments.rocks)
+    save_results(results, arguments.output)
+
+    # make the results the new baseline
+    if (arguments.save_baseline):
+        save_results(results, arguments.baseline)
+
+    # compare the results against the baseline
+    elif (os.path.exists(arguments.baseline)):
+        comparison = compare_results(results, load_results(arguments.baseline), arguments.tolerance)
+        print_comparison(comparison)
+
+        # exit with an error if anything got slower
+        if (any(row[-1] for row in comparison)):
+            sys.exit(1)
@@ -18,46 +18,16 @@ import matplotlib.pyplot as plt
 
 
 """
-Changeable parameters
-
-NOTE: These parameters are meant to help smoothly tune the changes in a drone's trajectory.
-      Not having these parameters would result in the drone's having jittery movements that
-      are not realistic. When one is driving and they need to make a right turn, the driver
-      would start slowly apply pressure to the brakes and gradually turn the steering wheel
-      to the right in order to make the turn as smooth as possible. Without the gradual
-      turning and slow pressure, there is a high chance the car might turn over. 
-"""
-
-global border_margin                        # create a border margin to have the drone object change direction once it gets close to the border
-
-global change_border_direction_factor       # a factor that helps change the drone's direction when it gets close to the border
-
-global avoid_rock_radius                    # avoidance radius of the rock
-
-global rock_avoidance_percentage_factor     # the percentage that can adjust the drone's velocity to prevent collision with a rock (curves the trajectory)
-
-global drone_avoidance_percentage_factor    # the percentage that can adjust the drone's velocity to prevent collision with a drone (curves the trajectory)
-
-global match_velocity_percentage_factor     # the percentage that can adjust the drone's velocity to match average velocity of nearby drones
+Import the swarm
 
-global go_to_center_percentage_factor       # the percentage that can adjust the drone's velocity to go to the center of mass of nearby drones 
-
-
-#border_margin = 50 + 100                   # (add 100 to shift graph)
-border_margin = 75 + 100                    # (add 100 to shift graph)
-#change_border_direction_factor = 4
-change_border_direction_factor = 10
-
-avoid_rock_radius = 0                       # NOTE: This would most likely shift the rock's position rather than create a circle of avoidance
-rock_avoidance_percentage_factor = 0.25     # NOTE: The higher the percentage the sharper the change in trajectory (set it low for smoother curves)
-#rock_avoidance_percentage_factor = 0.1
-
-drone_avoidance_percentage_factor = 0.15    # NOTE: The higher the percentage the sharper the change in trajectory (set it low for smoother curves)
-#drone_avoidance_percentage_factor = 0.1
-
-match_velocity_percentage_factor = 0.1      # NOTE: Don't set this to a high percentage or the code will break
+NOTE: The changeable parameters live in parameters.py so that the Swarm engine can use
+      them without importing p5. Each swarm copies them into its own rules
+      (swarm.behaviors), and the rules below read their weights, sight offsets, and
+      radii from the drone's swarm so they match the swarm after it has been tuned.
+"""
 
-go_to_center_percentage_factor = 0.005      # NOTE: Don't set this to a percentage higher than 0.05 or the code will break
+from swarm import Swarm
+from ring_buffer import RingBuffer
 
 
 """
@@ -69,43 +39,23 @@ class Boids():
     Function that initializes variables to an object
     """
     
-    def __init__(self, x, y, width, height, flag, color):
+    def __init__(self, x, y, width, height, flag, color, swarm = None, trail_length = 10):
         # border values
         self.width = width
         self.height = height
 
 
-        # the object's position on graph
-        self.position = Vector(x, y)
-
+        # create a swarm of its own if the object is not part of a swarm
+        if (swarm is None):
+            swarm = Swarm(width, height, capacity = 1)
 
-        # create the velocity range between 0 and 10
-        #x_velocity_range = rand() * 10
-        #y_velocity_range = rand() * 10
+        # the swarm that stores the object's position, velocity, acceleration, and speed limit
+        self.swarm = swarm
 
-        # create the velocity range between -10 and 10
-        x_velocity_range = (rand() * 20) - 10
-        y_velocity_range = (rand() * 20) - 10
+        # the object's row in the swarm
+        # (the swarm sets the position, random velocity, and random acceleration)
+        self.index = swarm.add_drone(x, y)
 
-        # the object's velocity on graph
-        self.velocity = Vector(x_velocity_range, y_velocity_range)
-
-
-        # create the drone's acceleration range between 0 and 1
-        x_acceleration_range = rand()
-        y_acceleration_range = rand()
-
-        # divide the acceleration range to 0 and 0.5
-        x_acceleration_range = x_acceleration_range / 2
-        y_acceleration_range = y_acceleration_range / 2
-
-        # the object's acceleration on graph
-        self.acceleration = Vector(x_acceleration_range, y_acceleration_range)
-
-
-        # set object's speed limit
-        self.max_speed = 10
-        self.min_speed = 7
 
         # determine if object is a rock (yes = True, no = False)
         self.rock = False
@@ -113,14 +63,9 @@ class Boids():
         # set object's angle
         self.angle = 0
 
-        # set object's viewing range
-        self.sight_distance = 50
-
         # create a history of drone positions
-        self.position_history = []
-
-        # create a list of drone positions
-        self.positions_list = []
+        # (only the last trail_length positions are kept for the trail)
+        self.position_history = RingBuffer(trail_length)
 
         # random flag
         self.flag = flag
@@ -129,6 +74,59 @@ class Boids():
         self.color = color
 
 
+    """
+    Views of the object's row in the swarm
+    """
+
+    @property
+    def position(self):
+        return Vector(*self.swarm.positions[self.index])
+
+    @position.setter
+    def position(self, value):
+        self.swarm.positions[self.index] = (value.x, value.y)
+
+    @property
+    def velocity(self):
+        return Vector(*self.swarm.velocities[self.index])
+
+    @velocity.setter
+    def velocity(self, value):
+        self.swarm.velocities[self.index] = (value.x, value.y)
+
+    @property
+    def acceleration(self):
+        return Vector(*self.swarm.accelerations[self.index])
+
+    @acceleration.setter
+    def acceleration(self, value):
+        self.swarm.accelerations[self.index] = (value.x, value.y)
+
+    @property
+    def max_speed(self):
+        return self.swarm.max_speeds[self.index]
+
+    @max_speed.setter
+    def max_speed(self, value):
+        self.swarm.max_speeds[self.index] = value
+
+    @property
+    def min_speed(self):
+        return self.swarm.min_speeds[self.index]
+
+    @min_speed.setter
+    def min_speed(self, value):
+        self.swarm.min_speeds[self.index] = value
+
+    @property
+    def sight_distance(self):
+        return self.swarm.sight_distances[self.index]
+
+    @sight_distance.setter
+    def sight_distance(self, value):
+        self.swarm.sight_distances[self.index] = value
+
+
     """
     Self-defined models:
 
@@ -183,11 +181,12 @@ class Boids():
     """
 
     def update_drone_parameters_and_trail(self):
-        # store the drone's position history
-        self.position_history.append([self.position.x, self.position.y])
+        # get the drone's position
+        current_drone_position = self.swarm.positions[self.index]
 
-        # store the drone's positions
-        self.positions_list.append([self.position.x, self.position.y])
+        # store the drone's position history
+        # (the history is full after trail_length positions and the oldest position is removed)
+        self.position_history.append(current_drone_position)
 
 
         """
@@ -205,16 +204,19 @@ class Boids():
         # begin making the shape
         beginShape()
 
+        # get the positions from oldest to newest
+        trail_points = self.position_history.view()
+
         # add the first point to ensure smooth curves
-        curveVertex(self.position_history[0][0], self.position_history[0][1])
+        curveVertex(trail_points[0][0], trail_points[0][1])
 
         # go through every point
-        for point in self.position_history:
+        for point in trail_points:
             # plot the point
             vertex(point[0], point[1])
 
         # add the last point to ensure smooth curves
-        curveVertex(self.position_history[-1][0], self.position_history[-1][1])
+        curveVertex(trail_points[-1][0], trail_points[-1][1])
 
         # close the shape
         endShape(CLOSE)
@@ -225,12 +227,10 @@ class Boids():
         NOTE: ONLY REMOVE 1 position from the history. Removing more at a time
               will cause the erasure to look laggy. Removing 1 will make it
               look the smoothest.
-        """
 
-        # check if positions history has 10 rows
-        if (len(self.position_history) >= 10):
-            # remove the first 1 rows from the history
-            self.position_history = self.position_history[1:]
+        NOTE 2: The ring buffer already does this. Once it is full, adding a position
+                overwrites the oldest one.
+        """
 
 
         # update the drone's position
@@ -345,6 +345,17 @@ class Boids():
     """
 
     def border_avoidance(self):
+        # get the swarm's border_avoidance rule (its settings may have been tuned or loaded)
+        border_rule = self.swarm.behaviors["border_avoidance"]
+
+        # a rule that is turned off does not change the drone's velocity
+        if (not border_rule.enabled):
+            return Vector(0, 0)
+
+        # the border margin and the factor that changes the drone's direction
+        border_margin = border_rule.margin
+        change_border_direction_factor = border_rule.weight
+
         # get the current drone's position
         current_drone_x_position = self.position.x
         current_drone_y_position = self.position.y
@@ -406,6 +417,13 @@ class Boids():
     """
 
     def rock_avoidance(self, list):
+        # get the swarm's rock_avoidance rule (its settings may have been tuned or loaded)
+        rock_rule = self.swarm.behaviors["rock_avoidance"]
+
+        # a rule that is turned off does not change the drone's velocity
+        if (not rock_rule.enabled):
+            return Vector(0, 0)
+
         # get the current drone's position
         current_drone_position = self.position
 
@@ -418,22 +436,22 @@ class Boids():
         # go through each rock
         for rock in list:
             # create an area of avoidance for each rock
-            x_position_rock_avoidance = rock[0] + avoid_rock_radius
-            y_position_rock_avoidance = rock[1] + avoid_rock_radius 
+            x_position_rock_avoidance = rock[0] + rock_rule.avoid_rock_radius
+            y_position_rock_avoidance = rock[1] + rock_rule.avoid_rock_radius 
             position_rock_avoidance = Vector(x_position_rock_avoidance, y_position_rock_avoidance)
 
             # calculate the distance magnitude between the drone and rock
             distance_magnitude = math.dist(current_drone_position, position_rock_avoidance)
 
             # check if the distance between the drone and rock is less than the allowed distance
-            # (add 10 to increase the sight distance)
+            # (add the rule's sight offset, 10 by default, to increase the sight distance)
             """
             NOTE: We need to check if the drone is close to a rock unlike shown in the pseudocode
                   here (http://www.kfish.org/boids/pseudocode.html). The reason being is that
                   there is no point in changing the drone's trajectory when the rock is far from
                   the drone at the other side of the map.
             """
-            if (distance_magnitude < (self.sight_distance + 10)):
+            if (distance_magnitude < (self.sight_distance + rock_rule.sight_offset)):
                 # calulate the distance between the drone and rock
                 distance_between_drone_and_rock = current_drone_position - position_rock_avoidance
 
@@ -441,7 +459,7 @@ class Boids():
                 rock_avoid_direction = rock_avoid_direction + distance_between_drone_and_rock
 
         # multiply the avoid direction by the rock avoid percentage
-        rock_avoid_velocity = rock_avoidance_percentage_factor * rock_avoid_direction
+        rock_avoid_velocity = rock_rule.weight * rock_avoid_direction
 
         # add the velocity to the current drone's velocity
         current_drone_velocity = current_drone_velocity + rock_avoid_velocity
@@ -461,6 +479,13 @@ class Boids():
     """
 
     def rule_one_separation(self, drones):
+        # get the swarm's separation rule (its settings may have been tuned or loaded)
+        separation = self.swarm.behaviors["separation"]
+
+        # a rule that is turned off does not change the drone's velocity
+        if (not separation.enabled):
+            return Vector(0, 0)
+
         # get the current drone's position
         current_drone_position = self.position
 
@@ -497,7 +522,7 @@ class Boids():
                       is that there is no point in changing the drone's trajectory when the drone is
                       far from the other drone at the other side of the map.
                 """
-                if (distance_magnitude < (self.sight_distance)):
+                if (distance_magnitude < (self.sight_distance + separation.sight_offset)):
                     # calculate the distance between the two drones
                     distance_between_drones = current_drone_position - other_drone_position
 
@@ -510,7 +535,7 @@ class Boids():
                     drone_avoid_direction = drone_avoid_direction + distance_between_drones
 
         # multiply the avoid direction by the drone avoid percentage
-        drone_avoid_velocity = drone_avoidance_percentage_factor * drone_avoid_direction
+        drone_avoid_velocity = separation.weight * drone_avoid_direction
 
         # add the velocity to the current drone's velocity
         current_drone_velocity = current_drone_velocity + drone_avoid_velocity
@@ -528,6 +553,13 @@ class Boids():
     """
 
     def rule_two_alignment(self, drones):
+        # get the swarm's alignment rule (its settings may have been tuned or loaded)
+        alignment = self.swarm.behaviors["alignment"]
+
+        # a rule that is turned off does not change the drone's velocity
+        if (not alignment.enabled):
+            return Vector(0, 0)
+
         # get the current drone's position
         current_drone_position = self.position
 
@@ -567,7 +599,7 @@ class Boids():
                       is that there is no point in changing the drone's trajectory when the drone is
                       far from the other drone at the other side of the map.
                 """
-                if (distance_magnitude < (self.sight_distance + 30)):
+                if (distance_magnitude < (self.sight_distance + alignment.sight_offset)):
                     # increase the number of nearby drones
                     number_of_nearby_drones = number_of_nearby_drones + 1
 
@@ -589,7 +621,7 @@ class Boids():
             subtract_drone_velocity = average_drone_velocity - current_drone_velocity
 
             # multiply the average velocity by the match velocity percentage
-            drone_alignment_velocity = match_velocity_percentage_factor * subtract_drone_velocity
+            drone_alignment_velocity = alignment.weight * subtract_drone_velocity
 
             # update the current drone's velocity
             current_drone_velocity = current_drone_velocity + drone_alignment_velocity
@@ -607,6 +639,13 @@ class Boids():
     """
 
     def rule_three_cohesion(self, drones):
+        # get the swarm's cohesion rule (its settings may have been tuned or loaded)
+        cohesion = self.swarm.behaviors["cohesion"]
+
+        # a rule that is turned off does not change the drone's velocity
+        if (not cohesion.enabled):
+            return Vector(0, 0)
+
         # get the current drone's position
         current_drone_position = self.position
 
@@ -646,7 +685,7 @@ class Boids():
                       is that there is no point in changing the drone's trajectory when the drone is
                       far from the other drone at the other side of the map.
                 """
-                if (distance_magnitude < (self.sight_distance + 30)):
+                if (distance_magnitude < (self.sight_distance + cohesion.sight_offset)):
                     # increase the number of nearby drones
                     number_of_nearby_drones = number_of_nearby_drones + 1
 
@@ -665,7 +704,7 @@ class Boids():
             distance_between_mass_and_drone = center_of_mass - current_drone_position
 
             # multiply the distance by the go to center percentage
-            drone_cohesion_velocity = go_to_center_percentage_factor * distance_between_mass_and_drone
+            drone_cohesion_velocity = cohesion.weight * distance_between_mass_and_drone
 
             # update the current drone's velocity
             current_drone_velocity = current_drone_velocity + drone_cohesion_velocity
@@ -674,4 +713,105 @@ class Boids():
         #self.velocity = current_drone_velocity
 
         # return the drone cohesion velocity
-        return drone_cohesion_velocity
\ No newline at end of file
+        return drone_cohesion_velocity
+
+    """
+    Rules 1, 2, and 3 together
+    Function that calculates the separation, alignment, and cohesion velocities in a single
+    pass over the drones
+
+    NOTE: This returns the same velocities as calling rule_one_separation(),
+          rule_two_alignment(), and rule_three_cohesion() one after the other (adding the
+          separation velocity to the drone's velocity before the alignment rule), but the
+          distance to each drone is only calculated once.
+    """
+
+    def boids_rules(self, drones):
+        # get the swarm's separation, alignment, and cohesion rules (their settings may have been tuned or loaded)
+        separation = self.swarm.behaviors["separation"]
+        alignment = self.swarm.behaviors["alignment"]
+        cohesion = self.swarm.behaviors["cohesion"]
+
+        # get the current drone's position
+        current_drone_position = self.position
+
+        # get the current drone's velocity
+        current_drone_velocity = self.velocity
+
+        # the direction needed to avoid colliding with a drone
+        drone_avoid_direction = Vector(0, 0)
+
+        # the number of drones nearby current drone for the alignment and cohesion rules
+        number_of_aligning_drones = 0
+        number_of_cohesion_drones = 0
+
+        # the total drone velocity and position of nearby drones
+        total_drone_velocity = Vector(0, 0)
+        total_drone_position = Vector(0, 0)
+
+        # the drone separation, alignment, and cohesion velocities
+        drone_avoid_velocity = Vector(0, 0)
+        drone_alignment_velocity = Vector(0, 0)
+        drone_cohesion_velocity = Vector(0, 0)
+
+        # go through each existing drone
+        for drone in drones:
+            # check if the current drone is not itself
+            if (drone is not self):
+                # get the other drone's position
+                other_drone_position = drone.position
+
+                # calculate the distance magnitude between the current drone and another drone
+                distance_magnitude = math.dist(current_drone_position, other_drone_position)
+
+                # Rule 1: Separation
+                # check if the distance between the two drones is less than the drone's sight distance
+                # (add the rule's sight offset, 0 by default)
+                if (distance_magnitude < (self.sight_distance + separation.sight_offset)):
+                    # add the distance between the two drones to the total
+                    drone_avoid_direction = drone_avoid_direction + (current_drone_position - other_drone_position)
+
+                # Rule 2: Alignment
+                # check if the distance between the two drones is less than the drone's sight distance
+                # (add the rule's sight offset, 30 by default, to increase sight distance)
+                if (distance_magnitude < (self.sight_distance + alignment.sight_offset)):
+                    # increase the number of nearby drones and add the velocity to the total
+                    number_of_aligning_drones = number_of_aligning_drones + 1
+                    total_drone_velocity = total_drone_velocity + drone.velocity
+
+                # Rule 3: Cohesion
+                # check if the distance between the two drones is less than the drone's sight distance
+                # (add the rule's sight offset, 30 by default, to increase sight distance)
+                if (distance_magnitude < (self.sight_distance + cohesion.sight_offset)):
+                    # increase the number of nearby drones and add the position to the total
+                    number_of_cohesion_drones = number_of_cohesion_drones + 1
+                    total_drone_position = total_drone_position + other_drone_position
+
+        # multiply the avoid direction by the drone avoid percentage
+        # (a rule that is turned off does not change the drone's velocity)
+        if (separation.enabled):
+            drone_avoid_velocity = separation.weight * drone_avoid_direction
+
+        # add the separation velocity to the current drone's velocity before the alignment rule
+        current_drone_velocity = current_drone_velocity + drone_avoid_velocity
+
+        # check if the number of nearby drones is not 0
+        """
+        NOTE: We check if there are any nearby drones to avoid dividing by 0.
+        """
+        if ((alignment.enabled) and (number_of_aligning_drones != 0)):
+            # divide the total velocity by the number of nearby drones to get the average velocity
+            average_drone_velocity = total_drone_velocity / number_of_aligning_drones
+
+            # multiply the difference from the average velocity by the match velocity percentage
+            drone_alignment_velocity = alignment.weight * (average_drone_velocity - current_drone_velocity)
+
+        if ((cohesion.enabled) and (number_of_cohesion_drones != 0)):
+            # divide the total position by the number of nearby drones to get the center of mass
+            center_of_mass = total_drone_position / number_of_cohesion_drones
+
+            # multiply the distance to the center of mass by the go to center percentage
+            drone_cohesion_velocity = cohesion.weight * (center_of_mass - current_drone_position)
+
+        # return the separation, alignment, and cohesion velocities
+        return drone_avoid_velocity, drone_alignment_velocity, drone_cohesion_velocity
@@ -0,0 +1,157 @@
+"""
+Import Libraries
+"""
+
+import math
+import time
+
+from swarm import Swarm
+from recorder import TrajectoryRecorder
+
+
+"""
+Create area size
+"""
+
+area_height = 1000
+area_width = 1000
+
+
+"""
+Create time step
+
+NOTE: main.py moves every drone once per frame and p5 draws about 60 frames per second,
+      so each tick of the headless simulation is 1/60 of a second by default. The drones
+      move the same amount per tick no matter what the time step is; the time step only
+      sets the simulation time recorded for each tick.
+"""
+
+default_time_step = 1 / 60
+
+
+"""
+Function that creates a swarm of drones scattered throughout the graph
+"""
+
+def create_swarm(number_of_drones, rng):
+    # the swarm that stores every drone's position, velocity, acceleration, and speed limit
+    # (add 100 for shifting the grid)
+    swarm = Swarm(area_width + 100, area_height + 100, capacity = number_of_drones, rng = rng)
+
+    # go through each drone
+    for i in range(number_of_drones):
+        # calculate a random x and y position
+        # (add 100 for shifting the grid)
+        x_position = rng.random() * 1000 + 100
+        y_position = rng.random() * 1000 + 100
+
+        # add the drone to the swarm
+        swarm.add_drone(x_position, y_position)
+
+    # return the swarm
+    return swarm
+
+
+"""
+Function that creates rocks scattered throughout the graph
+"""
+
+def create_rocks_positions(number_of_rocks, rng):
+    # list of rock positions
+    rocks_positions = []
+
+    # go through each rock
+    for i in range(number_of_rocks):
+        # calculate a random x and y position
+        # (add 100 for shifting the grid)
+        x_position = rng.random() * 1000 + 100
+        y_position = rng.random() * 1000 + 100
+
+        # store the rock's position
+        rocks_positions.append([x_position, y_position])
+
+    # return the rock positions
+    return rocks_positions
+
+
+"""
+Function that runs the simulation without a window
+
+NOTE: The simulation runs for the given number of ticks, or for the given number of
+      simulated seconds if the number of ticks is not given. Returns a TrajectoryRecorder
+      with the time of every stride-th tick and every drone's position and velocity at
+      that time (recorded after the speed check and before the drones move, the same
+      point in the tick main.py records them).
+
+NOTE 2: A recorder can be handed in instead (for example a TrajectoryWriter to stream a
+        long run to disk). It is returned the same way but is not closed.
+
+NOTE 3: If StreamingMetrics are handed in, they are updated every tick at the same time the
+        trajectory is recorded. With record set to False the trajectory is not stored at
+        all (None is returned) and only the metrics are kept.
+
+NOTE 4: If a ConvergenceDetector is handed in, the simulation stops as soon as the
+        formation has converged (after recording that tick). The detector keeps the
+        convergence time.
+"""
+
+def run_headless(swarm, rocks_positions, time_step = default_time_step, number_of_ticks = None, simulation_seconds = 30, stride = 1, recorder = None, metrics = None, record = True, convergence = None):
+    # find the number of ticks needed to reach the simulation time
+    if (number_of_ticks is None):
+        number_of_ticks = math.ceil(simulation_seconds / time_step)
+
+    # create the trajectory recorder with room for every recorded tick
+    if ((recorder is None) and (record)):
+        recorder = TrajectoryRecorder(swarm.number_of_drones, stride = stride, chunk_size = max(1, math.ceil(number_of_ticks / stride)))
+
+    # go through each tick
+    # (the same steps as Swarm.step(), with the recording after the speed check like main.py)
+    for tick in range(number_of_ticks):
+        # update the drones' velocities if they are over/under the max/min speed
+        swarm.drone_speed_check()
+
+        # store the drones' positions and velocities
+        if (recorder is not None):
+            recorder.record(tick * time_step, swarm.positions, swarm.velocities)
+
+        # update the metrics
+        if (metrics is not None):
+            metrics.update(swarm, rocks_positions)
+
+        # stop if the formation has converged
+        if ((convergence is not None) and (convergence.update(swarm, tick * time_step))):
+            break
+
+        # update the drones' positions and apply the Boids algorithm and self defined models
+        swarm.update_positions()
+        swarm.apply_rules(rocks_positions)
+
+    # return the recorded trajectories
+    return recorder
+
+
+"""
+Run a 30 second trial without a window
+
+NOTE: The run's manifest (its seed, settings, and trajectory checksum) is saved to
+      manifest.json so the run can be repeated with manifest.replay_manifest().
+"""
+
+if __name__ == "__main__":
+    # the manifest functions (imported here since manifest.py imports this file)
+    from manifest import run_simulation, save_manifest
+
+    # the amount of drones and rocks in the system
+    number_of_drones = 10
+    number_of_rocks = 5
+
+    # create the drones and rocks, run the simulation, and time it
+    start_time = time.perf_counter()
+    recorder, manifest = run_simulation(number_of_drones = number_of_drones, number_of_rocks = number_of_rocks)
+    end_time = time.perf_counter()
+
+    # save the run's manifest
+    save_manifest(manifest, "manifest.json")
+
+    # print how long the simulation took
+    print("Simulated " + str(recorder.number_of_ticks) + " ticks in " + ('%.3f' % (end_time - start_time)) + " seconds (seed " + str(manifest["seed"]) + ")")
@@ -3,20 +3,30 @@ Import Libraries
 """
 
 import numpy as np
-from numpy.random import rand
 from numpy.linalg import norm
 
 import math
+import atexit
 
 from p5 import size, background, run, setup, draw, exit, save_frame
 from p5 import rect, Vector, stroke, circle, fill, line, beginShape, vertex, no_fill, curveVertex
 from p5 import pushMatrix, translate, rotate, endShape, popMatrix, CLOSE
 from p5 import text_font, create_font, text, textAlign, CENTER
 from p5 import millis
+import p5
 
 import matplotlib.pyplot as plt
 
 from boids import Boids
+from swarm import Swarm
+from recorder import TrajectoryRecorder
+from plots import plot_positions
+from renderer import Renderer, CachedLayer
+from headless import default_time_step
+from manifest import new_seed, create_manifest, save_manifest
+from profiler import Profiler
+from screenshots import ScreenshotWriter
+from metrics import ConvergenceDetector
 
 
 """
@@ -37,32 +47,78 @@ area_width = 1000
 
 
 """
-Create time array
+Create time step
 """
 
-time = []
-#time.append(0)
+global time_step
+time_step = 0
 
 
 """
-Create time step
+Create the profiler
+
+NOTE: Set profile to True to time each phase of draw() (the screenshots, the graph, the
+      drones, the trails, and the simulation) and count the nearby drones each rule
+      checks and finds. The 50th, 95th, and 99th percentiles are printed when the
+      program exits. The profiler costs next to nothing when it is turned off.
 """
 
-global time_step
-time_step = 0
+profile = False
+profiler = Profiler(profile)
+
+# print the profile when the program exits
+atexit.register(profiler.report)
 
 
 """
-Create flags
+Create the convergence detector
+
+NOTE: Set stop_on_convergence to True to end the simulation as soon as the formation has
+      settled (see ConvergenceDetector for the thresholds) instead of always running for
+      30 seconds. The time it settled is printed when the simulation ends.
 """
 
-flag_0 = False
-flag_1 = False
-flag_2 = False
-flag_3 = False
-flag_4 = False
-flag_5 = False
-flag_6 = False
+stop_on_convergence = False
+convergence = ConvergenceDetector() if (stop_on_convergence) else None
+
+
+"""
+Create the screenshot writer
+
+NOTE: A screenshot is taken at each of the screenshot times (in seconds). Use
+      interval = 5 instead of times = [...] to take one every 5 seconds. The frames are
+      encoded and saved to disk by a background thread, so taking a screenshot does not
+      slow down the frame it is taken in.
+
+NOTE 2: p5 holds on to the shapes drawn in draw() and only draws them into the window's
+        buffer once draw() returns. The shapes are drawn first (the same as p5's own
+        screenshots do) so the screenshot has the whole frame in it.
+"""
+
+# function that reads the window's pixels
+def capture_frame():
+    # p5's renderer
+    renderer = p5.core.p5.renderer
+
+    # draw the shapes p5 is holding on to and read the window's buffer
+    renderer.flush_geometry()
+    return renderer.fbuffer.read(mode = "color", alpha = False)
+
+screenshot_writer = ScreenshotWriter(capture_frame, times = [0, 5, 10, 15, 20, 25, 30], file_name_format = "Screenshots/Simulation at %g seconds.jpg")
+
+# wait for the last screenshots to be saved when the program exits
+atexit.register(screenshot_writer.close)
+
+
+"""
+Create the random number generator
+
+NOTE: Every random number used to scatter the drones and rocks comes from this generator.
+      Set the seed to a number (for example the seed of a saved manifest) to repeat a run.
+"""
+
+seed = new_seed()
+rng = np.random.default_rng(seed)
 
 
 """
@@ -75,6 +131,11 @@ number_of_drones = 10
 # list of drones
 drones = []
 
+# the swarm that stores every drone's position, velocity, acceleration, and speed limit
+# (add 100 for shifting the grid)
+swarm = Swarm(area_width + 100, area_height + 100, capacity = number_of_drones, rng = rng)
+swarm.profiler = profiler
+
 # list of drone colors
 colors = ["firebrick", "purple", "green", "dodgerblue", "gold", "black", "blue", "magenta", "greenyellow", "turquoise"]
 
@@ -82,56 +143,74 @@ colors = ["firebrick", "purple", "green", "dodgerblue", "gold", "black", "blue",
 for i in range(number_of_drones):
     # calculate a random x position (600, 600 is the center of the graph)
     # (add 100 for shifting the grid)
-    x_position = rand() * 1000 + 100
+    x_position = rng.random() * 1000 + 100
 
     # calculate a random y position
     # (add 100 for shifting the grid)
-    y_position = rand() * 1000 + 100
+    y_position = rng.random() * 1000 + 100
 
     # create drone object
     # (add 100 for shifting the grid)
     if (i == 0):
-        drone = Boids(x_position, y_position, area_width + 100, area_height + 100, True, colors[i])
+        drone = Boids(x_position, y_position, area_width + 100, area_height + 100, True, colors[i], swarm = swarm)
 
     else:
-        drone = Boids(x_position, y_position, area_width + 100, area_height + 100, False, colors[i])
+        drone = Boids(x_position, y_position, area_width + 100, area_height + 100, False, colors[i], swarm = swarm)
 
     # store the drone object in an array
     drones.append(drone)
 
 
+"""
+Create the trajectory recorder
+
+NOTE: The recorder stores the time, position, and velocity of every drone at every frame
+      in columns shared by the whole fleet.
+"""
+
+recorder = TrajectoryRecorder(number_of_drones)
+
+
 """
 Create rocks and scatter them throughout the graph
+
+NOTE: The rocks never move, so only their positions are stored (drawn from the same seeded
+      generator as the drones, the same way headless.create_rocks_positions() does).
 """
 
 # the amount of rocks in the system
 number_of_rocks = 5
 
-# list of rocks
-rocks = []
+# list of rock positions
 rocks_positions = []
 
 # go through each rock
 for i in range(number_of_rocks):
     # calculate a random x position (600, 600 is the center of the graph)
     # (add 100 for shifting the grid)
-    x_position = rand() * 1000 + 100
+    x_position = rng.random() * 1000 + 100
 
     # calculate a random y position
     # (add 100 for shifting the grid)
-    y_position = rand() * 1000 + 100
-
-    # create rock object
-    # (add 100 for shifting the grid)
-    rock = Boids(x_position, y_position, area_width + 100, area_height + 100, False, "red")
-
-    # store the rock object in an array
-    rocks.append(rock)
+    y_position = rng.random() * 1000 + 100
 
     # store the rock's position
     rocks_positions.append([x_position, y_position])
 
 
+"""
+Create the renderer
+
+NOTE: The renderer draws every drone, trail, and rock with a few shapes instead of one
+      shape per object, so the number of drawing calls made each frame does not grow
+      with the number of drones. p5 still turns every outline and trail line into
+      triangles itself, so the frame time does grow with the number of drones (see
+      Renderer).
+"""
+
+renderer = Renderer(swarm, colors, rocks_positions)
+
+
 """
 NOTE: These are to create a set number of drones and rocks at random spots in the graph.
       The only things that are allowed to be changed are the set numbers and giving each
@@ -160,10 +239,14 @@ NOTE: The setup function should NEVER be touched unless you need to physically a
 
 
 """
-Function that draws and animates the legend the window
+Function that draws the legend the window (drawn once into the legend layer)
 """
 
-def draw_legend():
+def draw_legend_background():
+    # set the font
+    # (the layer fills itself with white)
+    text_font(create_font("Roboto-Black.ttf", size = 20))
+
     # create legend
 
     # x and y positions
@@ -237,22 +320,31 @@ def draw_legend():
 
 
 """
-Function that draws and animates the graph inside the window
+Function that draws the legend the window
+
+NOTE: The legend never changes, so it is drawn once into an offscreen buffer (the legend
+      layer) and the buffer is copied onto the window every frame.
 """
 
-def draw_graph(time_step):
+def draw_legend():
+    legend_layer.draw()
+
+
+"""
+Function that draws the graph inside the window (drawn once into the graph layer)
+"""
+
+def draw_graph_background():
+    # set the font
+    # (the layer fills itself with white)
+    text_font(create_font("Roboto-Black.ttf", size = 20))
+
     # set the line color
     stroke(175)
 
     # fill color
     fill(0)
 
-    # put simulation time onto graph
-    textAlign(CENTER)
-    print_time = '%.3f' % time_step
-    time_string = "Time: " + str(print_time) + " seconds"
-    text(time_string, 600, 60)
-
     # put simulation title onto graph
     textAlign(CENTER)
     title_string = "Simulation of the Boids Algorithm"
@@ -322,6 +414,43 @@ def draw_graph(time_step):
         y = y + line_spacing
 
 
+"""
+Function that draws and animates the graph inside the window
+
+NOTE: The grid, labels, and title never change, so they are drawn once into an offscreen
+      buffer (the graph layer) and the buffer is copied onto the window every frame. Only
+      the time is drawn on top of it each frame.
+"""
+
+def draw_graph(time_step):
+    # draw the grid, labels, and title
+    graph_layer.draw()
+
+    # set the line color
+    stroke(175)
+
+    # fill color
+    fill(0)
+
+    # put simulation time onto graph
+    textAlign(CENTER)
+    print_time = '%.3f' % time_step
+    time_string = "Time: " + str(print_time) + " seconds"
+    text(time_string, 600, 60)
+
+
+"""
+Create the cached layers
+
+NOTE: The graph layer covers the whole window. The legend layer only covers the right
+      side of the window where the legend is (it is only seen if the window is made wider
+      for the legend).
+"""
+
+graph_layer = CachedLayer(draw_graph_background, 0, 0, window_width, window_height)
+legend_layer = CachedLayer(draw_legend_background, 1120, 0, 1300 - 1120, window_height)
+
+
 """
 Function that draws and animates things inside the window
 """
@@ -333,85 +462,17 @@ def draw():
     # print time
     #print(time_step)
 
-    # global flags
-    global flag_0
-    global flag_1
-    global flag_2
-    global flag_3
-    global flag_4
-    global flag_5
-    global flag_6
-
-    # check if simulation is at 0 seconds and take screenshot of simulation
-    if ((time_step >= 0) and (flag_0 == False)):
-        # set flag to True
-        flag_0 = True
-
-        # screenshot the simulation
-        save_frame("Screenshots/Simulation at 0 seconds.jpg")
-
-    # check if simulation is at 5 seconds and take screenshot of simulation
-    if ((time_step >= 5) and (flag_1 == False)):
-        # set flag to True
-        flag_1 = True
-
-        # screenshot the simulation
-        save_frame("Screenshots/Simulation at 5 seconds.jpg")
-
-    # check if simulation is at 10 seconds and take screenshot of simulation
-    if ((time_step >= 10) and (flag_2 == False)):
-        # set flag to True
-        flag_2 = True
-
-        # screenshot the simulation
-        save_frame("Screenshots/Simulation at 10 seconds.jpg")
-
-    # check if simulation is at 15 seconds and take screenshot of simulation
-    if ((time_step >= 15) and (flag_3 == False)):
-        # set flag to True
-        flag_3 = True
-
-        # screenshot the simulation
-        save_frame("Screenshots/Simulation at 15 seconds.jpg")
-
-    # check if simulation is at 20 seconds and take screenshot of simulation
-    if ((time_step >= 20) and (flag_4 == False)):
-        # set flag to True
-        flag_4 = True
-
-        # screenshot the simulation
-        save_frame("Screenshots/Simulation at 20 seconds.jpg")
-
-    # check if simulation is at 25 seconds and take screenshot of simulation
-    if ((time_step >= 25) and (flag_5 == False)):
-        # set flag to True
-        flag_5 = True
-
-        # screenshot the simulation
-        save_frame("Screenshots/Simulation at 25 seconds.jpg")
-
-    # check if simulation is at 30 seconds and take screenshot of simulation
-    if ((time_step >= 30) and (flag_6 == False)):
-        # set flag to True
-        flag_6 = True
-
-        # screenshot the simulation
-        save_frame("Screenshots/Simulation at 30 seconds.jpg")
-
-    # check if the current time reaches the end of the simulation
-    if (time_step >= 30):
-        # print time
-        #print(time_step)
-
-        # exit the simulation
-        exit()
+    # start timing the tick
+    tick_start = profiler.start()
 
     # set the background color to white
+    phase_start = tick_start
     background(255, 255, 255)
 
     # draw the graph and legend
     draw_graph(time_step)
-    #draw_legend()  # NOTE: adding a legend causes the simulation to lag a lot
+    #draw_legend()  # NOTE: the legend is drawn once and copied every frame, so it no longer lags (set window_width to 1300 to show it)
+    profiler.stop("draw_graph", phase_start)
 
     """
     NOTE: The code before this note should NEVER be changed/touched.
@@ -420,74 +481,88 @@ def draw():
     """
 
 
-    # go through each rock
-    for rock in rocks:
-        # show rock on graph
-        rock.create_rock()
+    # show every rock on graph
+    phase_start = profiler.start()
+    renderer.draw_rocks()
 
-    # go through each drone
-    for drone in drones:
-        # self defined models
-        
-        # show the drone's position and direction
-        drone.drone_position_and_direction()
+    # self defined models
 
-        # update the drone's velocity if velocity is over/under the max/min speed
-        drone.drone_speed_check()
+    # show every drone's position and direction
+    renderer.draw_drones()
+    profiler.stop("draw_drones", phase_start)
 
-        # update the drone's parameters and trail
-        drone.update_drone_parameters_and_trail()
+    # update every drone's velocity if velocity is over/under the max/min speed
+    phase_start = profiler.start()
+    swarm.drone_speed_check()
 
+    # store the current time and every drone's position and velocity
+    recorder.record(time_step, swarm.positions, swarm.velocities)
+    profiler.stop("simulation", phase_start)
 
-        # Boids algorithm
+    # update every drone's trail and position
+    phase_start = profiler.start()
+    renderer.draw_trails()
+    profiler.stop("trails", phase_start)
 
-        # Rule 1: Separation
-        # check if the drone is near another drone and avoid it
-        rule_1_velocity = drone.rule_one_separation(drones)
-        #drone.rule_one_separation(drones)
-        drone.velocity = drone.velocity + rule_1_velocity
+    phase_start = profiler.start()
+    swarm.update_positions()
 
-        # Rule 2: Alignment
-        # check if the drone is near other drones and match their average velocity
-        rule_2_velocity = drone.rule_two_alignment(drones)
-        #drone.rule_two_alignment(drones)
-        drone.velocity = drone.velocity + rule_2_velocity
 
-        # Rule 3: Cohesion
-        # check if the drone is near other drones and go to their center of mass
-        rule_3_velocity = drone.rule_three_cohesion(drones)
-        #drone.rule_three_cohesion(drones)
-        drone.velocity = drone.velocity + rule_3_velocity
+    # Boids algorithm and self defined models
 
+    # Rule 1: Separation, Rule 2: Alignment, Rule 3: Cohesion, border avoidance, and rock avoidance
+    # (computed for every drone at once by the swarm)
+    swarm.apply_rules(rocks_positions)
+    profiler.stop("simulation", phase_start)
 
-        # self defined models
 
-        # check if the drone is near the border and avoid it
-        border_avoid_velocity = drone.border_avoidance()
-        #drone.border_avoidance()
-        drone.velocity = drone.velocity + border_avoid_velocity
+    """
+    NOTE: The velocity MUST be updated whenever a NEW velocity is calculated. This
+          will give the drone a much smoother trajectory and make sure the defined
+          behaviors are shown in real-time. Adding them together at the end as
+          shown in the pseudocode here (http://www.kfish.org/boids/pseudocode.html)
+          will cause some issues where the behaviors will lag behind. Additionally,
+          the position MUST NOT be updated at the end as well. It is already
+          updated right after the trails are drawn, so updating it twice will
+          drastically and incorrectly increase the drone's distance.
+
+    NOTE 2: Swarm.apply_rules() keeps this order. Every rule is added to the
+            velocities of the whole fleet before the next rule is calculated.
+
+    NOTE 3: The drones are updated at the same time (synchronously), not one after
+            another as the original loop over the drones did. Every drone moves, then
+            every drone's rules use the same positions and the other drones'
+            velocities from before the rules, so a drone no longer sees the drones
+            before it in the list after they have already moved this tick. The
+            trajectories are different from the original loop's (see Swarm.apply_rules()).
+    """
 
-        # check if the drone is near a rock and avoid it
-        rock_avoid_velocity = drone.rock_avoidance(rocks_positions)
-        #drone.rock_avoidance(rocks_positions)
-        drone.velocity = drone.velocity + rock_avoid_velocity
+    # take the screenshots whose time has been reached
+    # (taken after the frame is drawn so a screenshot shows its own time, and saved
+    # to disk by the screenshot writer's thread)
+    phase_start = profiler.start()
+    screenshot_writer.update(time_step)
+    profiler.stop("save_frame", phase_start)
 
+    # check if the current time reaches the end of the simulation (or the formation has settled)
+    # (the last frame is drawn and its screenshot taken before exiting)
+    if ((time_step >= 30) or ((convergence is not None) and (convergence.update(swarm, time_step)))):
+        # print time
+        #print(time_step)
 
-        """
-        NOTE: The velocity MUST be updated whenever a NEW velocity is calculated. This
-              will give the drone a much smoother trajectory and make sure the defined
-              behaviors are shown in real-time. Adding them together at the end as
-              shown in the pseudocode here (http://www.kfish.org/boids/pseudocode.html)
-              will cause some issues where the behaviors will lag behind. Additionally,
-              the position MUST NOT be updated at the end as well. It is already
-              updated in the update_drone_parameters_and_trail() function, so updating
-              it twice will drastically and incorrectly increase the drone's distance.
-        """
+        # store the last tick's phase times and counters
+        profiler.end_tick(tick_start)
 
-    # find the current time in seconds and add it to the time list
-    time.append(time_step)
+        # wait for the screenshots to be saved and exit the simulation
+        screenshot_writer.close()
+        exit()
+
+    # find the current time in seconds
     time_step = millis() / 1000
     #time_step = second()
+
+    # store the tick's phase times and counters
+    profiler.end_tick(tick_start)
         
 
 """
@@ -498,227 +573,36 @@ run()
 
 
 """
-Create plots for the drones' x and y velocities
-"""
-
-# create a figure
-#plt.figure()
-fig = plt.figure(num = 1, figsize = (20, 15), dpi = 80, facecolor = 'w', edgecolor = 'k')
-
-# incrementor
-i = 1
-
-# go through all the drones
-for drone in drones:
-    #drone.plot_drones_equilibrium(time)
-    # grab the drone's list of positions
-    drone_positions = drone.positions_list
-
-    # create empty lists
-    magnitudes = []
-    x_positions = []
-    y_positions = []
-    #magnitudes.append(0)
-
-    # go through the drone's positions
-    for position in drone_positions:
-        # get the x and y positions
-        # subtract it by 100 due to the graph shift
-        # divide it by 10 to get them in meters
-        # subtract y position from 100 to get true y position
-        x_position = (position[0] - 100) / 10
-        y_position = 100 - ((position[1] - 100) / 10)
-
-        #magnitude = math.sqrt((x_position * x_position) + (y_position * y_position))
-        #magnitudes.append(magnitude)
-
-        # add the x position to the list
-        x_positions.append(x_position)
-
-    if (i <= 5):
-        # plot the drone's x position over time
-        plt.plot(time, x_positions, label = "Rover #" + str(i), color = drone.color)
-
-    # increment the incrementor
-    i = i + 1
-
-# make the plot
-plt.xlabel("Time (seconds)")
-plt.ylabel("X Position (meters)")
-plt.legend(bbox_to_anchor = (1.0, 1.0), loc = "upper left")
-plt.title("Rovers' X Velocity (Meters / Second)")
-plt.grid()
+Save the run's manifest
 
-# save the plot
-plt.savefig("Plots/Rovers 1 to 5 X Position.jpg")
-
-# show the plot
-plt.show()
-
-
-
-# create a figure
-#plt.figure()
-fig = plt.figure(num = 1, figsize = (20, 15), dpi = 80, facecolor = 'w', edgecolor = 'k')
-
-# incrementor
-i = 1
-
-# go through all the drones
-for drone in drones:
-    #drone.plot_drones_equilibrium(time)
-    # grab the drone's list of positions
-    drone_positions = drone.positions_list
-
-    # create empty lists
-    magnitudes = []
-    x_positions = []
-    y_positions = []
-    #magnitudes.append(0)
-
-    # go through the drone's positions
-    for position in drone_positions:
-        # get the x and y positions
-        # subtract it by 100 due to the graph shift
-        # divide it by 10 to get them in meters
-        # subtract y position from 100 to get true y position
-        x_position = (position[0] - 100) / 10
-        y_position = 100 - ((position[1] - 100) / 10)
-
-        #magnitude = math.sqrt((x_position * x_position) + (y_position * y_position))
-        #magnitudes.append(magnitude)
-
-        # add the x position to the list
-        x_positions.append(x_position)
-
-    if (i >= 6):
-        # plot the drone's x position over time
-        plt.plot(time, x_positions, label = "Rover #" + str(i), color = drone.color)
-
-    # increment the incrementor
-    i = i + 1
-
-# make the plot
-plt.xlabel("Time (seconds)")
-plt.ylabel("X Position (meters)")
-plt.legend(bbox_to_anchor = (1.0, 1.0), loc = "upper left")
-plt.title("Rovers' X Velocity (Meters / Second)")
-plt.grid()
-
-# save the plot
-plt.savefig("Plots/Rovers 6 to 10 X Position.jpg")
-
-# show the plot
-plt.show()
-
-
-
-# create a figure
-fig = plt.figure(num = 1, figsize = (20, 15), dpi = 80, facecolor = 'w', edgecolor = 'k')
-
-# incrementor
-i = 1
-
-# go through all the drones
-for drone in drones:
-    #drone.plot_drones_equilibrium(time)
-    # grab the drone's list of positions
-    drone_positions = drone.positions_list
-
-    # create empty lists
-    magnitudes = []
-    x_positions = []
-    y_positions = []
-    #magnitudes.append(0)
-
-    # go through the drone's positions
-    for position in drone_positions:
-        # get the x and y positions
-        # subtract it by 100 due to the graph shift
-        # divide it by 10 to get them in meters
-        # subtract y position from 100 to get true y position
-        x_position = (position[0] - 100) / 10
-        y_position = 100 - ((position[1] - 100) / 10)
-
-        #magnitude = math.sqrt((x_position * x_position) + (y_position * y_position))
-        #magnitudes.append(magnitude)
-
-        # add the y position to the list
-        y_positions.append(y_position)
-
-    if (i <= 5):
-        # plot the drone's y position over time
-        plt.plot(time, y_positions, label = "Rover #" + str(i), color = drone.color)
-
-    # increment the incrementor
-    i = i + 1
-
-# make the plot
-plt.xlabel("Time (seconds)")
-plt.ylabel("Y Position (meters)")
-plt.legend(bbox_to_anchor = (1.0, 1.0), loc = "upper left")
-plt.title("Rovers' Y Velocity (Meters / Second)")
-plt.grid()
-
-# save the plot
-plt.savefig("Plots/Rovers 1 to 5 Y Position.jpg")
-
-# show the plot
-plt.show()
-
-
-# create a figure
-fig = plt.figure(num = 1, figsize = (20, 15), dpi = 80, facecolor = 'w', edgecolor = 'k')
-
-# incrementor
-i = 1
-
-# go through all the drones
-for drone in drones:
-    #drone.plot_drones_equilibrium(time)
-    # grab the drone's list of positions
-    drone_positions = drone.positions_list
+NOTE: The manifest holds the seed, the amount of drones and rocks, every rule's settings,
+      and the checksum of the drones' positions. manifest.replay_manifest() runs the same
+      simulation without a window and checks that the drones moved the same way.
+"""
 
-    # create empty lists
-    magnitudes = []
-    x_positions = []
-    y_positions = []
-    #magnitudes.append(0)
+save_manifest(create_manifest(seed, swarm, rocks_positions, recorder, default_time_step, recorder.number_of_ticks), "manifest.json")
 
-    # go through the drone's positions
-    for position in drone_positions:
-        # get the x and y positions
-        # subtract it by 100 due to the graph shift
-        # divide it by 10 to get them in meters
-        # subtract y position from 100 to get true y position
-        x_position = (position[0] - 100) / 10
-        y_position = 100 - ((position[1] - 100) / 10)
+# print when the formation settled
+if ((convergence is not None) and (convergence.converged)):
+    print("The formation converged at " + ('%.3f' % convergence.convergence_time) + " seconds")
 
-        #magnitude = math.sqrt((x_position * x_position) + (y_position * y_position))
-        #magnitudes.append(magnitude)
 
-        # add the y position to the list
-        y_positions.append(y_position)
+"""
+Get the recorded times and positions
+"""
 
-    if (i >= 6):
-        # plot the drone's y position over time
-        plt.plot(time, y_positions, label = "Rover #" + str(i), color = drone.color)
+time = recorder.times()
+positions = recorder.positions()
 
-    # increment the incrementor
-    i = i + 1
 
-# make the plot
-plt.xlabel("Time (seconds)")
-plt.ylabel("Y Position (meters)")
-plt.legend(bbox_to_anchor = (1.0, 1.0), loc = "upper left")
-plt.title("Rovers' Y Velocity (Meters / Second)")
-plt.grid()
+"""
+Create plots for the drones' x and y positions
 
-# save the plot
-plt.savefig("Plots/Rovers 6 to 10 Y Position.jpg")
+NOTE: The plots module converts every recorded position to meters at once and makes
+      one plot for each group of 5 rovers and each axis.
+"""
 
-# show the plot
-plt.show()
+plot_positions(time, positions, colors = colors, group_size = 5, folder = "Plots", show = True)
 
 
 
@@ -734,7 +618,7 @@ i = 1
 for drone in drones:
     #drone.plot_drones_equilibrium(time)
     # grab the drone's list of positions
-    drone_positions = drone.positions_list
+    drone_positions = positions[:, drone.index]
 
     # create empty lists
     magnitudes = []
@@ -789,7 +673,7 @@ i = 1
 for drone in drones:
     #drone.plot_drones_equilibrium(time)
     # grab the drone's list of positions
-    drone_positions = drone.positions_list
+    drone_positions = positions[:, drone.index]
 
     # create empty lists
     magnitudes = []
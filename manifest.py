@@ -0,0 +1,207 @@
+"""
+Import Libraries
+"""
+
+import hashlib
+import json
+import math
+
+import numpy as np
+
+from headless import create_swarm, create_rocks_positions, run_headless, default_time_step, area_width, area_height
+from behaviors import default_pipeline
+
+
+"""
+Create the manifest version
+
+NOTE: The version is saved in every manifest and changed if the way a run is created from
+      its manifest ever changes (so an old manifest is not replayed the wrong way).
+"""
+
+manifest_version = 1
+
+
+"""
+Create the names of the manifest values that change the run
+
+NOTE: Every other value of a manifest (the number of samples, the NumPy version, and the
+      checksum) is a result of the run.
+"""
+
+parameter_names = ("version", "seed", "number_of_drones", "number_of_rocks", "width", "height", "time_step", "number_of_ticks", "stride", "settings")
+
+
+"""
+Function that creates a new seed
+
+NOTE: The seed is taken from the operating system's random numbers, so every run gets a
+      different one. It is saved in the run's manifest so the run can be repeated.
+"""
+
+def new_seed():
+    return np.random.SeedSequence().entropy
+
+
+"""
+Function that creates the drones and rocks of a seeded simulation
+
+NOTE: Every random number of the simulation comes from one generator made from the seed
+      (the drones are created first, then the rocks), so the same seed always creates the
+      same drones and rocks. The rule settings (see BehaviorPipeline.settings()) are
+      loaded into the swarm if they are given.
+"""
+
+def create_simulation(seed, number_of_drones, number_of_rocks, settings = None):
+    # the simulation's random number generator
+    rng = np.random.default_rng(seed)
+
+    # create the drones and rocks
+    swarm = create_swarm(number_of_drones, rng)
+    rocks_positions = create_rocks_positions(number_of_rocks, rng)
+
+    # change the rules' settings
+    if (settings is not None):
+        swarm.behaviors.load_settings(settings)
+
+    # return the drones and rocks
+    return swarm, rocks_positions
+
+
+"""
+Function that fills in every rule setting that is not given with the default one
+"""
+
+def full_settings(settings = None):
+    behaviors = default_pipeline()
+
+    if (settings is not None):
+        behaviors.load_settings(settings)
+
+    return behaviors.settings()
+
+
+"""
+Function that returns the values that change a run (the start of its manifest)
+
+NOTE: Two runs with the same values record the same trajectory, so these values are used
+      to find a run that has already been done (see result_cache.py).
+"""
+
+def simulation_parameters(seed, number_of_drones, number_of_rocks, time_step, number_of_ticks, stride, settings = None):
+    return {
+        "version": manifest_version,
+        "seed": int(seed),
+        "number_of_drones": number_of_drones,
+        "number_of_rocks": number_of_rocks,
+        # (add 100 for shifting the grid, the same as create_swarm())
+        "width": area_width + 100,
+        "height": area_height + 100,
+        "time_step": time_step,
+        "number_of_ticks": number_of_ticks,
+        "stride": stride,
+        "settings": full_settings(settings),
+    }
+
+
+"""
+Function that calculates a fingerprint of a recorded trajectory
+
+NOTE: Two trajectories with the same checksum have the same positions bit for bit. Only
+      the positions are used because the times of main.py come from the clock (and the
+      velocities follow from the positions), so a run of main.py and its headless
+      replay have the same checksum.
+"""
+
+def trajectory_checksum(recorder):
+    positions = recorder.positions()
+
+    checksum = hashlib.sha256()
+    checksum.update(repr((positions.shape, positions.dtype.str)).encode())
+    checksum.update(np.ascontiguousarray(positions).tobytes())
+
+    return checksum.hexdigest()
+
+
+"""
+Function that creates the manifest of a run
+
+NOTE: The manifest holds everything needed to repeat the run (the seed, the amount of
+      drones and rocks, the time step, the number of ticks, the stride, and every rule's
+      settings) and the checksum of the trajectory it recorded.
+"""
+
+def create_manifest(seed, swarm, rocks_positions, recorder, time_step, number_of_ticks):
+    return {
+        "version": manifest_version,
+        "seed": int(seed),
+        "number_of_drones": swarm.number_of_drones,
+        "number_of_rocks": len(rocks_positions),
+        "width": swarm.width,
+        "height": swarm.height,
+        "time_step": time_step,
+        "number_of_ticks": number_of_ticks,
+        "stride": recorder.stride,
+        "number_of_samples": recorder.number_of_samples,
+        "settings": swarm.behaviors.settings(),
+        "numpy_version": np.__version__,
+        "checksum": trajectory_checksum(recorder),
+    }
+
+
+"""
+Functions that save a manifest to a JSON file and read it back
+"""
+
+def save_manifest(manifest, file_name):
+    with open(file_name, "w") as file:
+        json.dump(manifest, file, indent = 4)
+
+def load_manifest(file_name):
+    with open(file_name) as file:
+        return json.load(file)
+
+
+"""
+Function that runs a seeded simulation without a window and creates its manifest
+
+NOTE: A new seed is created if one is not given. Returns the recorded trajectories and
+      the run's manifest.
+"""
+
+def run_simulation(seed = None, number_of_drones = 10, number_of_rocks = 5, time_step = default_time_step, number_of_ticks = None, simulation_seconds = 30, stride = 1, settings = None):
+    # create a seed for the run
+    if (seed is None):
+        seed = new_seed()
+
+    # find the number of ticks needed to reach the simulation time
+    if (number_of_ticks is None):
+        number_of_ticks = math.ceil(simulation_seconds / time_step)
+
+    # create the drones and rocks
+    swarm, rocks_positions = create_simulation(seed, number_of_drones, number_of_rocks, settings)
+
+    # run the simulation
+    recorder = run_headless(swarm, rocks_positions, time_step = time_step, number_of_ticks = number_of_ticks, stride = stride)
+
+    # return the trajectories and the manifest
+    return recorder, create_manifest(seed, swarm, rocks_positions, recorder, time_step, number_of_ticks)
+
+
+"""
+Function that runs a manifest's simulation again
+
+NOTE: Returns the recorded trajectories and whether their checksum matches the manifest's
+      (it only matches if the run was repeated exactly).
+"""
+
+def replay_manifest(manifest):
+    # check that the manifest can be replayed
+    if (manifest["version"] != manifest_version):
+        raise ValueError("Unsupported manifest version: " + str(manifest["version"]))
+
+    # run the simulation again
+    recorder, replayed_manifest = run_simulation(manifest["seed"], manifest["number_of_drones"], manifest["number_of_rocks"], time_step = manifest["time_step"], number_of_ticks = manifest["number_of_ticks"], stride = manifest["stride"], settings = manifest["settings"])
+
+    # return the trajectories and whether they match
+    return recorder, replayed_manifest["checksum"] == manifest["checksum"]
@@ -0,0 +1,410 @@
+"""
+Import Libraries
+"""
+
+import numpy as np
+
+from spatial_hash import SpatialHash
+from ring_buffer import RingBuffer
+
+
+"""
+Function that calculates how aligned the drones' directions are (1 = every drone is going
+the same direction, 0 = the directions cancel out)
+"""
+
+def polarization(velocities):
+    # each drone's direction (velocity divided by its magnitude)
+    speeds = np.sqrt((velocities[:, 0] * velocities[:, 0]) + (velocities[:, 1] * velocities[:, 1]))
+    directions = velocities[speeds > 0] / speeds[speeds > 0, None]
+
+    # the magnitude of the average direction
+    if (len(directions) == 0):
+        return 0.0
+
+    average_direction = directions.mean(axis = 0)
+    return float(np.sqrt((average_direction * average_direction).sum()))
+
+
+"""
+Function that calculates the average distance from the drones to their center of mass
+"""
+
+def cohesion_radius(positions):
+    center_of_mass = positions.mean(axis = 0)
+    distances = positions - center_of_mass
+
+    return float(np.sqrt((distances * distances).sum(axis = 1)).mean())
+
+
+"""
+Function that counts the groups of connected drones
+
+NOTE: Two drones are connected if they are a pair (drones[k], neighbors[k]), and a group is
+      every drone that can be reached through connected drones. Each drone starts as its
+      own group. Every round, the group of each pair's first drone joins the pair's second
+      drone's group if its label is smaller, then every drone follows the labels to the
+      group's root (pointer jumping). This repeats until no group changes, so the work is
+      proportional to the number of pairs times a small number of rounds.
+"""
+
+def connected_components(number_of_drones, drones, neighbors):
+    # every drone starts as its own group
+    labels = np.arange(number_of_drones)
+
+    while True:
+        # join each pair's groups (to the smaller label)
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, labels[drones], labels[neighbors])
+
+        # point every drone at its group's root
+        while True:
+            jumped_labels = new_labels[new_labels]
+            if (np.array_equal(jumped_labels, new_labels)):
+                break
+            new_labels = jumped_labels
+
+        # stop when no group changed
+        if (np.array_equal(new_labels, labels)):
+            break
+        labels = new_labels
+
+    # count the groups (each group has one drone that is its own root)
+    return int(np.count_nonzero(labels == np.arange(number_of_drones)))
+
+
+"""
+Create the RunningStatistics class
+
+NOTE: The running statistics keep the count, mean, variance (Welford's method), smallest,
+      largest, and last value of a metric without storing every value.
+"""
+
+class RunningStatistics():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.squared_differences = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.last = np.nan
+
+
+    """
+    Function that adds a value
+    """
+
+    def update(self, value):
+        self.count = self.count + 1
+
+        difference = value - self.mean
+        self.mean = self.mean + (difference / self.count)
+        self.squared_differences = self.squared_differences + (difference * (value - self.mean))
+
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.last = value
+
+
+    """
+    Function that returns the standard deviation of the values
+    """
+
+    def standard_deviation(self):
+        if (self.count < 2):
+            return 0.0
+
+        return float(np.sqrt(self.squared_differences / (self.count - 1)))
+
+
+    """
+    Function that returns the statistics as a dictionary
+    """
+
+    def summary(self):
+        return {"count": self.count, "mean": self.mean, "standard_deviation": self.standard_deviation(), "minimum": self.minimum, "maximum": self.maximum, "last": self.last}
+
+
+"""
+Create the StreamingMetrics class
+
+NOTE: The streaming metrics are updated every tick from the swarm's current positions and
+      velocities, so the formation can be studied without storing the trajectories. Each
+      update costs O(N) plus the number of nearby pairs (the drones and rocks are put into
+      spatial hashes), and the memory used does not grow with the number of ticks.
+
+          polarization              how aligned the drones' directions are
+          cohesion_radius           the average distance to the center of mass
+          nearest_neighbor_distance the average distance from each drone to its closest drone
+          minimum_rock_clearance    the closest any drone is to a rock
+          flock_components          the number of groups of drones within link_distance
+
+      The nearest neighbor distance of every drone is also added to a histogram (from 0 to
+      neighbor_radius). Drones without another drone within neighbor_radius are counted
+      as past the last bin, and drones without a rock within clearance_radius are not
+      close enough to count for the rock clearance (it is infinity if no drone is).
+
+NOTE 2: Distances are passed in graph units and stored in meters (divided by 10, the same
+        as the plots and trials).
+"""
+
+class StreamingMetrics():
+    # the metrics calculated every tick
+    metric_names = ["polarization", "cohesion_radius", "nearest_neighbor_distance", "minimum_rock_clearance", "flock_components"]
+
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, neighbor_radius = 50, link_distance = 50, clearance_radius = 100, number_of_bins = 50):
+        # the distances used to find nearby drones and rocks
+        self.neighbor_radius = neighbor_radius
+        self.link_distance = link_distance
+        self.clearance_radius = clearance_radius
+
+        # the running statistics of each metric
+        self.statistics = {name: RunningStatistics() for name in self.metric_names}
+
+        # the histogram of nearest neighbor distances (in meters) and the drones past its last bin
+        self.bin_edges = np.linspace(0, neighbor_radius / 10, number_of_bins + 1)
+        self.histogram = np.zeros(number_of_bins, dtype = np.int64)
+        self.number_without_neighbors = 0
+
+        # the spatial hashes of the drones and rocks (and the rocks the rock hash was built from)
+        self.drone_index = None
+        self.rock_index = None
+        self.rocks_positions = None
+
+        # the number of ticks added
+        self.number_of_ticks = 0
+
+
+    """
+    Function that finds each drone's nearest neighbor distance and the pairs of linked drones
+    """
+
+    def _nearby_drones(self, swarm):
+        # the largest distance searched
+        search_distance = max(self.neighbor_radius, self.link_distance)
+
+        # put every drone into its cell
+        # (add 100 to shift graph)
+        if (self.drone_index is None):
+            self.drone_index = SpatialHash(swarm.width + 100, swarm.height + 100, search_distance)
+        self.drone_index.rebuild(swarm.positions)
+
+        # find every pair of drones within the search distance
+        drones, neighbors, distance_magnitudes = self.drone_index.neighbor_pairs(swarm.positions, search_distance)
+
+        # the closest drone to each drone (infinity if none are within the neighbor radius)
+        nearest_distances = np.full(swarm.number_of_drones, np.inf)
+        within_radius = distance_magnitudes < self.neighbor_radius
+        np.minimum.at(nearest_distances, drones[within_radius], distance_magnitudes[within_radius])
+
+        # the pairs of linked drones
+        linked = distance_magnitudes < self.link_distance
+
+        return nearest_distances, drones[linked], neighbors[linked]
+
+
+    """
+    Function that finds the closest any drone is to a rock (infinity if none are within the
+    clearance radius)
+    """
+
+    def _rock_clearance(self, swarm, rocks_positions):
+        if (len(rocks_positions) == 0):
+            return np.inf
+
+        # put the rocks into a spatial hash if they have changed
+        # (add 100 to shift graph)
+        if ((self.rock_index is None) or (rocks_positions is not self.rocks_positions)):
+            self.rock_index = SpatialHash(swarm.width + 100, swarm.height + 100, self.clearance_radius)
+            self.rock_index.rebuild(np.asarray(rocks_positions, dtype = float).reshape(-1, 2))
+            self.rocks_positions = rocks_positions
+
+        # find the rocks near each drone
+        drones, rocks, distance_magnitudes = self.rock_index.query(swarm.positions, self.clearance_radius)
+
+        return float(distance_magnitudes.min(initial = np.inf))
+
+
+    """
+    Function that updates the metrics with the swarm's current positions and velocities
+
+    NOTE: Returns the tick's metrics (distances in meters).
+    """
+
+    def update(self, swarm, rocks_positions):
+        # the nearest neighbors and linked drones
+        nearest_distances, linked_drones, linked_neighbors = self._nearby_drones(swarm)
+
+        # add the nearest neighbor distances to the histogram
+        has_neighbor = np.isfinite(nearest_distances)
+        nearest_distances = nearest_distances[has_neighbor] / 10
+        bins = np.minimum((nearest_distances / self.bin_edges[1]).astype(int), len(self.histogram) - 1)
+        self.histogram = self.histogram + np.bincount(bins, minlength = len(self.histogram))
+        self.number_without_neighbors = self.number_without_neighbors + int(np.count_nonzero(~has_neighbor))
+
+        # calculate the tick's metrics
+        metrics = {
+            "polarization": polarization(swarm.velocities),
+            "cohesion_radius": cohesion_radius(swarm.positions) / 10,
+            "nearest_neighbor_distance": float(nearest_distances.mean()) if (len(nearest_distances) > 0) else np.inf,
+            "minimum_rock_clearance": self._rock_clearance(swarm, rocks_positions) / 10,
+            "flock_components": connected_components(swarm.number_of_drones, linked_drones, linked_neighbors),
+        }
+
+        # update the running statistics
+        for name, value in metrics.items():
+            if (np.isfinite(value)):
+                self.statistics[name].update(value)
+
+        self.number_of_ticks = self.number_of_ticks + 1
+
+        # return the tick's metrics
+        return metrics
+
+
+    """
+    Function that estimates a percentile of the nearest neighbor distances from the histogram
+
+    NOTE: The percentile is between 0 and 100. Drones without a neighbor within the neighbor
+          radius count as farther than every bin (infinity is returned if the percentile
+          falls on them).
+    """
+
+    def nearest_neighbor_percentile(self, percentile):
+        # the number of distances up to the end of each bin
+        cumulative_counts = np.cumsum(self.histogram)
+        total = cumulative_counts[-1] + self.number_without_neighbors
+        if (total == 0):
+            return np.nan
+
+        # find the bin the percentile falls in
+        target = (percentile / 100) * total
+        if (target > cumulative_counts[-1]):
+            return np.inf
+
+        bin_index = int(np.searchsorted(cumulative_counts, target))
+
+        # blend across the bin
+        previous_count = cumulative_counts[bin_index - 1] if (bin_index > 0) else 0
+        fraction = (target - previous_count) / max(1, self.histogram[bin_index])
+        return float(self.bin_edges[bin_index] + (fraction * (self.bin_edges[bin_index + 1] - self.bin_edges[bin_index])))
+
+
+    """
+    Function that returns the statistics of every metric
+    """
+
+    def summary(self):
+        summary = {name: statistics.summary() for name, statistics in self.statistics.items()}
+
+        summary["nearest_neighbor_distance"]["p50"] = self.nearest_neighbor_percentile(50)
+        summary["nearest_neighbor_distance"]["p95"] = self.nearest_neighbor_percentile(95)
+
+        return summary
+
+
+
+"""
+Create the ConvergenceDetector class
+
+NOTE: The detector decides when the formation has settled. A tick is stable when the
+      average polarization of the last patience ticks is at least polarization_threshold
+      and the average cohesion radius of the last patience ticks differs from the average
+      of the patience ticks before them by no more than cohesion_tolerance (a fraction of
+      the average). Once patience ticks in a row are stable, the swarm has converged, and
+      the convergence time is the time the stable ticks started. Only the last patience
+      polarizations and the last 2 * patience cohesion radii are kept.
+
+NOTE 2: The averages are used because the drones keep turning away from the borders and
+        rocks, so the polarization and cohesion radius of a settled swarm still swing
+        from tick to tick.
+
+NOTE 3: The default polarization_threshold is low because the drones of the default
+        world never line up closely: they keep turning away from the borders and rocks.
+        In 20 seeds of the 10 drone, 5 rock world of main.py, the average polarization of
+        patience ticks was at most 0.51 to 0.75 with the default settings, and drones
+        flying in random directions average about 0.28 (1 / sqrt(10)). 0.4 is above the
+        90th percentile (0.36) of a swarm with alignment and cohesion turned off, and
+        with the cohesion radius check and patience ticks in a row, runs with the rules
+        turned on converge (about half of the seeds within 30 seconds) while runs with
+        them off almost never do. A higher threshold (0.5) lets almost no default run converge.
+        These numbers depend on the rules and their settings, so measure them again (and
+        pick a threshold for the swarm being run) before stopping runs early.
+"""
+
+class ConvergenceDetector():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, polarization_threshold = 0.4, cohesion_tolerance = 0.1, patience = 120):
+        # the thresholds and the number of stable ticks needed
+        self.polarization_threshold = polarization_threshold
+        self.cohesion_tolerance = cohesion_tolerance
+        self.patience = patience
+
+        # the polarizations of the last patience ticks and the cohesion radii of the last 2 * patience ticks
+        self.polarizations = RingBuffer(patience, ())
+        self.cohesion_radii = RingBuffer(2 * patience, ())
+
+        # the number of stable ticks in a row and the time they started
+        self.stable_ticks = 0
+        self.stable_start_time = None
+
+        # whether the swarm has converged and when
+        self.converged = False
+        self.convergence_time = None
+
+
+    """
+    Function that returns the detector's settings
+    """
+
+    def settings(self):
+        return {"polarization_threshold": self.polarization_threshold, "cohesion_tolerance": self.cohesion_tolerance, "patience": self.patience}
+
+
+    """
+    Function that checks the swarm's current formation and returns whether it has converged
+    """
+
+    def update(self, swarm, time):
+        if (self.converged):
+            return True
+
+        # measure the formation
+        self.polarizations.append(polarization(swarm.velocities))
+        self.cohesion_radii.append(cohesion_radius(swarm.positions) / 10)
+
+        # check if the tick is stable
+        # (once there are 2 * patience cohesion radii to compare)
+        stable = False
+        if (len(self.cohesion_radii) == (2 * self.patience)):
+            cohesion_radii = self.cohesion_radii.view()
+            previous_radius = cohesion_radii[:self.patience].mean()
+            current_radius = cohesion_radii[self.patience:].mean()
+
+            stable = (self.polarizations.view().mean() >= self.polarization_threshold) and (abs(current_radius - previous_radius) <= (self.cohesion_tolerance * current_radius))
+
+        # count the stable ticks in a row
+        if (stable):
+            if (self.stable_ticks == 0):
+                self.stable_start_time = time
+            self.stable_ticks = self.stable_ticks + 1
+        else:
+            self.stable_ticks = 0
+
+        # check if the swarm has been stable long enough
+        if (self.stable_ticks >= self.patience):
+            self.converged = True
+            self.convergence_time = self.stable_start_time
+
+        return self.converged
@@ -0,0 +1,45 @@
+"""
+Changeable parameters
+
+NOTE: These parameters are meant to help smoothly tune the changes in a drone's trajectory.
+      Not having these parameters would result in the drone's having jittery movements that
+      are not realistic. When one is driving and they need to make a right turn, the driver
+      would start slowly apply pressure to the brakes and gradually turn the steering wheel
+      to the right in order to make the turn as smooth as possible. Without the gradual
+      turning and slow pressure, there is a high chance the car might turn over. 
+
+NOTE 2: These are the starting values of the rules in behaviors.py. Each Swarm gets its own
+        copy of the rules (swarm.behaviors), so a swarm can be tuned, or have rules turned
+        off, without changing these values.
+"""
+
+global border_margin                        # create a border margin to have the drone object change direction once it gets close to the border
+
+global change_border_direction_factor       # a factor that helps change the drone's direction when it gets close to the border
+
+global avoid_rock_radius                    # avoidance radius of the rock
+
+global rock_avoidance_percentage_factor     # the percentage that can adjust the drone's velocity to prevent collision with a rock (curves the trajectory)
+
+global drone_avoidance_percentage_factor    # the percentage that can adjust the drone's velocity to prevent collision with a drone (curves the trajectory)
+
+global match_velocity_percentage_factor     # the percentage that can adjust the drone's velocity to match average velocity of nearby drones
+
+global go_to_center_percentage_factor       # the percentage that can adjust the drone's velocity to go to the center of mass of nearby drones 
+
+
+#border_margin = 50 + 100                   # (add 100 to shift graph)
+border_margin = 75 + 100                    # (add 100 to shift graph)
+#change_border_direction_factor = 4
+change_border_direction_factor = 10
+
+avoid_rock_radius = 0                       # NOTE: This would most likely shift the rock's position rather than create a circle of avoidance
+rock_avoidance_percentage_factor = 0.25     # NOTE: The higher the percentage the sharper the change in trajectory (set it low for smoother curves)
+#rock_avoidance_percentage_factor = 0.1
+
+drone_avoidance_percentage_factor = 0.15    # NOTE: The higher the percentage the sharper the change in trajectory (set it low for smoother curves)
+#drone_avoidance_percentage_factor = 0.1
+
+match_velocity_percentage_factor = 0.1      # NOTE: Don't set this to a high percentage or the code will break
+
+go_to_center_percentage_factor = 0.005      # NOTE: Don't set this to a percentage higher than 0.05 or the code will break
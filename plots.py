@@ -0,0 +1,150 @@
+"""
+Import Libraries
+"""
+
+import math
+import os
+
+import numpy as np
+
+import matplotlib.pyplot as plt
+
+
+"""
+Function that converts positions on the graph to meters
+
+NOTE: Subtract 100 due to the graph shift and divide by 10 to get meters. The y position
+      is subtracted from 100 to get the true y position (the graph's y axis points down).
+      Works on any array whose last axis is (x, y), so a whole trajectory is converted at
+      once.
+"""
+
+def to_meters(positions):
+    # create the array of positions in meters
+    meters = np.empty(positions.shape)
+
+    # convert the x and y positions
+    meters[..., 0] = (positions[..., 0] - 100) / 10
+    meters[..., 1] = 100 - ((positions[..., 1] - 100) / 10)
+
+    # return the positions in meters
+    return meters
+
+
+"""
+Function that shrinks a long trajectory down to the points that can be seen on a plot
+
+NOTE: A plot is only so many pixels wide, so drawing more points than that only slows the
+      plot down. The ticks are split into buckets and each bucket keeps the smallest and
+      largest value of every rover, which draws the same lines at the plot's resolution.
+
+NOTE 2: The smallest and largest values are kept in the order they happened (the first one
+        is placed at the bucket's first time and the second one at its last time), so a
+        falling line still falls instead of turning into a rising sawtooth.
+"""
+
+def decimate(times, values, max_points = 2000):
+    # check if the trajectory is already short enough
+    if (len(times) <= max_points):
+        return times, values
+
+    # split the ticks into buckets (each bucket becomes 2 points)
+    bucket_size = math.ceil(len(times) / (max_points // 2))
+    starts = np.arange(0, len(times), bucket_size)
+    ends = np.minimum(starts + bucket_size, len(times)) - 1
+
+    # keep the first and last time of each bucket
+    bucket_times = np.empty(2 * len(starts))
+    bucket_times[0::2] = times[starts]
+    bucket_times[1::2] = times[ends]
+
+    # split the values into buckets
+    # (the last bucket is filled up with the last value so every bucket is the same size)
+    number_of_extra_ticks = (len(starts) * bucket_size) - len(times)
+    padded_values = np.concatenate((values, np.repeat(values[-1:], number_of_extra_ticks, axis = 0)))
+    buckets = padded_values.reshape((len(starts), bucket_size) + values.shape[1:])
+
+    # find the smallest and largest value of each bucket and which came first
+    smallest_values = buckets.min(axis = 1)
+    largest_values = buckets.max(axis = 1)
+    smallest_first = buckets.argmin(axis = 1) <= buckets.argmax(axis = 1)
+
+    # keep the smallest and largest value of each bucket in the order they happened
+    bucket_values = np.empty((2 * len(starts),) + values.shape[1:])
+    bucket_values[0::2] = np.where(smallest_first, smallest_values, largest_values)
+    bucket_values[1::2] = np.where(smallest_first, largest_values, smallest_values)
+
+    # return the shrunk trajectory
+    return bucket_times, bucket_values
+
+
+"""
+Function that splits the rovers into groups for the plots
+
+NOTE: Rovers are plotted 5 at a time (the same as main.py used to). Large fleets are split
+      into at most 10 groups so there are never more than 20 plots.
+"""
+
+def rover_groups(number_of_rovers, group_size = None):
+    # pick the group size if it is not given
+    if (group_size is None):
+        group_size = max(5, math.ceil(number_of_rovers / 10))
+
+    # return the first and last rover of each group
+    return [(first, min(first + group_size, number_of_rovers)) for first in range(0, number_of_rovers, group_size)]
+
+
+"""
+Function that plots the rovers' x and y positions over time
+
+NOTE: The trajectory is converted to meters once, shrunk to the plot's resolution, and
+      each plot draws all of its rovers with a single plot call. One plot is made for each group of rovers and each axis and
+      saved as "Rovers <first> to <last> <X/Y> Position.jpg" in the folder.
+"""
+
+def plot_positions(times, positions, colors = None, group_size = None, folder = "Plots", show = False):
+    # convert the whole trajectory to meters
+    meters = to_meters(positions)
+
+    # only keep the points that can be seen on the plot
+    times, meters = decimate(np.asarray(times), meters)
+
+    # the amount of rovers
+    number_of_rovers = meters.shape[1]
+
+    # go through each axis
+    for axis, axis_name in enumerate(["X", "Y"]):
+        # go through each group of rovers
+        for first, last in rover_groups(number_of_rovers, group_size):
+            # create a figure
+            fig = plt.figure(figsize = (20, 15), dpi = 80, facecolor = 'w', edgecolor = 'k')
+
+            # plot the group's positions over time
+            lines = plt.plot(times, meters[:, first:last, axis])
+
+            # label and color each rover's line
+            for rover, plot_line in zip(range(first, last), lines):
+                plot_line.set_label("Rover #" + str(rover + 1))
+
+                if ((colors is not None) and (rover < len(colors))):
+                    plot_line.set_color(colors[rover])
+
+            # make the plot
+            plt.xlabel("Time (seconds)")
+            plt.ylabel(axis_name + " Position (meters)")
+            plt.title("Rovers' " + axis_name + " Velocity (Meters / Second)")
+            plt.grid()
+
+            # only add a legend if it can be read
+            if ((last - first) <= 20):
+                plt.legend(bbox_to_anchor = (1.0, 1.0), loc = "upper left")
+
+            # save the plot
+            plt.savefig(os.path.join(folder, "Rovers " + str(first + 1) + " to " + str(last) + " " + axis_name + " Position.jpg"))
+
+            # show the plot
+            if (show):
+                plt.show()
+
+            # close the figure
+            plt.close(fig)
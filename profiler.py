@@ -0,0 +1,139 @@
+"""
+Import Libraries
+"""
+
+import time
+
+import numpy as np
+
+
+"""
+Create the Profiler class
+
+NOTE: The profiler records how long each phase of a tick takes (for example the
+      simulation, the trails, the graph, and the screenshots of main.draw()) and how many
+      nearby drones (or rocks) each rule checked and found. start() and stop() time a
+      phase, count() adds to a rule's counters, and end_tick() stores the tick's totals.
+      report() prints the 50th, 95th, and 99th percentile of every phase and counter.
+
+NOTE 2: The profiler is turned off unless enabled is True. When it is turned off, start(),
+        stop(), count(), and end_tick() return straight away without reading the clock or
+        storing anything, so leaving the calls in the code costs next to nothing.
+"""
+
+class Profiler():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, enabled = False):
+        # whether the profiler is recording
+        self.enabled = enabled
+
+        # the time of each phase and the counters of each rule during the current tick
+        self.tick_phases = {}
+        self.tick_counters = {}
+
+        # the time of each phase and the counters of each rule for every tick
+        self.phase_times = {}
+        self.counters = {}
+
+        # the number of ticks recorded
+        self.number_of_ticks = 0
+
+
+    """
+    Functions that time a phase
+
+    NOTE: start() returns the time the phase started, which is handed to stop(). A phase
+          timed more than once in a tick is added up.
+    """
+
+    def start(self):
+        if (not self.enabled):
+            return 0
+
+        return time.perf_counter()
+
+    def stop(self, name, start_time):
+        if (not self.enabled):
+            return
+
+        self.tick_phases[name] = self.tick_phases.get(name, 0) + (time.perf_counter() - start_time)
+
+
+    """
+    Function that adds to a rule's counters
+
+    NOTE: checks is the number of pairs whose distance the rule compared to its sight
+          distance, and found is the number of those pairs that were close enough.
+    """
+
+    def count(self, name, checks, found):
+        if (not self.enabled):
+            return
+
+        counters = self.tick_counters.setdefault(name, [0, 0])
+        counters[0] = counters[0] + checks
+        counters[1] = counters[1] + found
+
+
+    """
+    Function that stores the current tick's phase times and counters
+
+    NOTE: If the tick's start time is given, the whole tick is stored as the "tick" phase.
+    """
+
+    def end_tick(self, start_time = None):
+        if (not self.enabled):
+            return
+
+        # time the whole tick
+        if (start_time is not None):
+            self.stop("tick", start_time)
+
+        # store the tick's phase times
+        for name, seconds in self.tick_phases.items():
+            self.phase_times.setdefault(name, []).append(seconds)
+
+        # store the tick's counters
+        for name, (checks, found) in self.tick_counters.items():
+            self.counters.setdefault(name + " checks", []).append(checks)
+            self.counters.setdefault(name + " found", []).append(found)
+
+        # start the next tick
+        self.tick_phases = {}
+        self.tick_counters = {}
+        self.number_of_ticks = self.number_of_ticks + 1
+
+
+    """
+    Function that returns the 50th, 95th, and 99th percentile of every phase (in
+    milliseconds) and counter (per tick)
+    """
+
+    def summary(self):
+        summary = {}
+
+        for name, seconds in self.phase_times.items():
+            summary[name + " (ms)"] = np.percentile(1000 * np.asarray(seconds), [50, 95, 99])
+
+        for name, values in self.counters.items():
+            summary[name] = np.percentile(values, [50, 95, 99])
+
+        return summary
+
+
+    """
+    Function that prints the summary
+    """
+
+    def report(self):
+        if (not self.enabled):
+            return
+
+        print("Profile of " + str(self.number_of_ticks) + " ticks")
+        print("%-32s %12s %12s %12s" % ("", "p50", "p95", "p99"))
+
+        for name, (p50, p95, p99) in self.summary().items():
+            print("%-32s %12.3f %12.3f %12.3f" % (name, p50, p95, p99))
@@ -0,0 +1,122 @@
+"""
+Import Libraries
+"""
+
+import numpy as np
+
+
+"""
+Create the TrajectoryRecorder class
+
+NOTE: The recorder stores the whole fleet's trajectory in columns (time, drone id, x, y,
+      x velocity, y velocity) with one row per drone per recorded tick. The columns are
+      created in chunks and grow when they are full, so recording a tick never creates a
+      new Python list. Rows are stored tick by tick, so the positions of a tick are next
+      to each other.
+
+NOTE 2: The stride only records every stride-th tick (a stride of 1 records every tick).
+"""
+
+class TrajectoryRecorder():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, number_of_drones, stride = 1, chunk_size = 1024, dtype = np.float32):
+        # the amount of drones recorded each tick
+        self.number_of_drones = number_of_drones
+
+        # record every stride-th tick
+        self.stride = stride
+
+        # the number of ticks to make room for whenever the columns are full
+        self.chunk_size = chunk_size
+
+        # the number of ticks given to the recorder and the number of ticks recorded
+        self.number_of_ticks = 0
+        self.number_of_samples = 0
+
+        # the columns (one row per drone per recorded tick)
+        number_of_rows = chunk_size * number_of_drones
+        self.time = np.zeros(number_of_rows, dtype = np.float64)
+        self.drone_id = np.zeros(number_of_rows, dtype = np.int32)
+        self.x = np.zeros(number_of_rows, dtype = dtype)
+        self.y = np.zeros(number_of_rows, dtype = dtype)
+        self.vx = np.zeros(number_of_rows, dtype = dtype)
+        self.vy = np.zeros(number_of_rows, dtype = dtype)
+
+
+    """
+    Function that makes room for more ticks
+    """
+
+    def _grow(self):
+        # double the room (at least one more chunk)
+        number_of_rows = len(self.time) + max(len(self.time), self.chunk_size * self.number_of_drones)
+
+        # copy the columns into the bigger columns
+        for name in ("time", "drone_id", "x", "y", "vx", "vy"):
+            column = getattr(self, name)
+            bigger_column = np.zeros(number_of_rows, dtype = column.dtype)
+            bigger_column[:len(column)] = column
+            setattr(self, name, bigger_column)
+
+
+    """
+    Function that records the fleet's positions and velocities at a tick
+    """
+
+    def record(self, time, positions, velocities):
+        # count the tick
+        tick = self.number_of_ticks
+        self.number_of_ticks = self.number_of_ticks + 1
+
+        # only record every stride-th tick
+        if ((tick % self.stride) != 0):
+            return
+
+        # make room for the tick if the columns are full
+        start = self.number_of_samples * self.number_of_drones
+        end = start + self.number_of_drones
+        if (end > len(self.time)):
+            self._grow()
+
+        # write the tick's rows
+        self.time[start:end] = time
+        self.drone_id[start:end] = np.arange(self.number_of_drones)
+        self.x[start:end] = positions[:, 0]
+        self.y[start:end] = positions[:, 1]
+        self.vx[start:end] = velocities[:, 0]
+        self.vy[start:end] = velocities[:, 1]
+
+        # count the recorded tick
+        self.number_of_samples = self.number_of_samples + 1
+
+
+    """
+    Functions that return the recorded columns as (ticks) and (ticks, drones, 2) arrays
+
+    NOTE: The times are a view of the time column. The positions and velocities put the x
+          and y columns together, so they are copies.
+    """
+
+    def times(self):
+        return self.time[:self.number_of_samples * self.number_of_drones:self.number_of_drones]
+
+    def positions(self):
+        return self._stack(self.x, self.y)
+
+    def velocities(self):
+        return self._stack(self.vx, self.vy)
+
+    def _stack(self, x_column, y_column):
+        # the recorded rows
+        number_of_rows = self.number_of_samples * self.number_of_drones
+
+        # put the x and y columns together as (ticks, drones, 2)
+        values = np.empty((self.number_of_samples, self.number_of_drones, 2), dtype = x_column.dtype)
+        values[:, :, 0] = x_column[:number_of_rows].reshape(self.number_of_samples, self.number_of_drones)
+        values[:, :, 1] = y_column[:number_of_rows].reshape(self.number_of_samples, self.number_of_drones)
+
+        # return the values
+        return values
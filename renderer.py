@@ -0,0 +1,241 @@
+"""
+Import Libraries
+"""
+
+import numpy as np
+
+import p5
+from p5 import stroke, fill, no_fill, vertex, beginShape, endShape
+from p5 import TRIANGLES, LINES
+from p5 import create_graphics, image, translate, background
+
+from ring_buffer import RingBuffer
+from shapes import arrow_vertices, rock_radius, rock_segments
+
+
+"""
+Create the Renderer class
+
+NOTE: The renderer draws the whole fleet with a few shapes instead of one shape per drone.
+      The arrows of every drone with the same color are one shape of triangles, every
+      drone's trail is one shape of lines, and every rock is one shape of triangles. The
+      arrow corners are rotated and moved for every drone at once with NumPy.
+
+NOTE 2: Each shape's corners are handed to p5's renderer as one NumPy array (the same call
+        endShape() makes with the corners vertex() collected) instead of one vertex()
+        call per corner. Renderers without that call (skia) get the corners one vertex()
+        at a time.
+
+NOTE 3: p5's renderer (vispy) turns every line (the outlines and the trails) into
+        triangles with a Python loop, which takes most of the frame time, so the frame
+        time still grows with the number of drones. With p5 0.8.2 and software OpenGL,
+        drawing and flushing a frame took about 30 ms for 10 drones, 75 ms for 100
+        drones, and 440 ms for 1000 drones (520 ms with one vertex() call per corner).
+"""
+
+class Renderer():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, swarm, colors, rocks_positions, trail_length = 10):
+        # the swarm to draw
+        self.swarm = swarm
+
+        # the drones of each color
+        # (the colors are repeated if there are more drones than colors)
+        self.color_groups = {}
+        for index in range(swarm.number_of_drones):
+            self.color_groups.setdefault(colors[index % len(colors)], []).append(index)
+
+        # every drone's trail (the last trail_length positions of the whole fleet)
+        self.trail = RingBuffer(trail_length, (swarm.number_of_drones, 2))
+
+        # the corners of every rock's triangles (the rocks never move, so this is only done once)
+        angles = np.linspace(0, 2 * np.pi, rock_segments + 1)
+        circle = rock_radius * np.stack((np.cos(angles), np.sin(angles)), axis = 1)
+        rocks = np.asarray(rocks_positions, dtype = float).reshape(-1, 1, 2)
+        self.rock_triangles = np.empty((len(rocks), rock_segments, 3, 2))
+        self.rock_triangles[:, :, 0] = rocks
+        self.rock_triangles[:, :, 1] = rocks + circle[None, :-1]
+        self.rock_triangles[:, :, 2] = rocks + circle[None, 1:]
+
+
+    """
+    Function that calculates the corners of every drone's arrow
+    """
+
+    def arrow_vertices(self):
+        return arrow_vertices(self.swarm.positions, self.swarm.velocities)
+
+
+    """
+    Function that draws a list of corners as a single shape
+    """
+
+    def _draw_shape(self, kind, vertices):
+        # every corner as an (x, y) row
+        vertices = vertices.reshape(-1, 2)
+
+        # check if there is anything to draw
+        if (len(vertices) == 0):
+            return
+
+        # hand every corner to p5's renderer at once
+        renderer = p5.core.p5.renderer
+        if (hasattr(renderer, "shape")):
+            renderer.shape(vertices, [], kind)
+            return
+
+        # begin making the shape
+        beginShape(kind)
+
+        # go through every corner
+        # (tolist() turns the whole array into Python numbers at once)
+        for x, y in vertices.tolist():
+            vertex(x, y)
+
+        # end making the shape
+        endShape()
+
+
+    """
+    Function that draws every rock
+    """
+
+    def draw_rocks(self):
+        # set the rocks to red
+        stroke("red")
+        fill("red")
+
+        # draw every rock
+        self._draw_shape(TRIANGLES, self.rock_triangles)
+
+
+    """
+    Function that draws every drone and the direction it is going
+    """
+
+    def draw_drones(self):
+        # calculate every drone's arrow
+        vertices = self.arrow_vertices()
+
+        # go through each color
+        for color, indices in self.color_groups.items():
+            # set the drones' border and fill color
+            stroke(color)
+            fill(color)
+
+            # draw the arrows of every drone with this color
+            self._draw_shape(TRIANGLES, vertices[indices])
+
+
+    """
+    Function that stores every drone's position and draws every drone's trail
+
+    NOTE: Each trail is drawn as a closed loop the same way
+          Boids.update_drone_parameters_and_trail() draws it.
+    """
+
+    def draw_trails(self):
+        # store the drones' positions
+        self.trail.append(self.swarm.positions)
+
+        # get the positions from oldest to newest (trail points, drones, 2)
+        trail_points = self.trail.view()
+
+        # connect each point to the next one and the newest point back to the oldest one
+        segments = np.empty((len(trail_points), self.swarm.number_of_drones, 2, 2))
+        segments[:, :, 0] = trail_points
+        segments[:, :, 1] = np.roll(trail_points, -1, axis = 0)
+
+        # set the trails to orange
+        stroke("orange")
+
+        # don't fill the shape
+        no_fill()
+
+        # draw every trail
+        self._draw_shape(LINES, segments)
+
+
+"""
+Create the CachedLayer class
+
+NOTE: A cached layer is a part of the window that never changes (like the graph's grid and
+      labels or the legend). The first time it is drawn, draw_function() draws it into an
+      offscreen buffer, and every frame after that the buffer is copied onto the window
+      with a single image() call instead of drawing every line and text again.
+      draw_function() draws in window coordinates; only the part inside the layer's
+      rectangle (x, y, width, height) is kept.
+
+NOTE 2: p5's default renderer (vispy) can't create offscreen buffers. When create_graphics()
+        is not supported, draw_function() draws straight onto the window every frame
+        instead (the same as before the layers were cached). The buffer is filled with
+        white before draw_function() draws into it, so draw_function() does not set the
+        background itself.
+"""
+
+class CachedLayer():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, draw_function, x, y, width, height):
+        # the function that draws the layer
+        self.draw_function = draw_function
+
+        # the part of the window the layer covers
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+        # the offscreen buffer (created the first time the layer is drawn)
+        self.graphics = None
+
+        # whether the renderer can create offscreen buffers (found the first time the layer is drawn)
+        self.cached = True
+
+
+    """
+    Function that draws the layer onto the window
+    """
+
+    def draw(self):
+        # create the offscreen buffer the first time
+        if ((self.graphics is None) and (self.cached)):
+            try:
+                self.graphics = create_graphics(self.width, self.height)
+
+            # draw straight onto the window if the renderer can't create offscreen buffers
+            except NotImplementedError:
+                self.cached = False
+
+            # draw the layer into the offscreen buffer
+            else:
+                with self.graphics:
+                    # fill the buffer with white
+                    background(255, 255, 255)
+
+                    # move the window coordinates onto the buffer
+                    translate(-self.x, -self.y)
+
+                    # draw the layer
+                    self.draw_function()
+
+        # draw the layer onto the window every frame if it is not cached
+        if (not self.cached):
+            self.draw_function()
+            return
+
+        # copy the buffer onto the window
+        image(self.graphics, self.x, self.y)
+
+
+    """
+    Function that makes the layer be drawn again the next time (if what it draws changed)
+    """
+
+    def clear(self):
+        self.graphics = None
@@ -0,0 +1,237 @@
+"""
+Import Libraries
+"""
+
+import hashlib
+import json
+import os
+import zipfile
+
+import numpy as np
+
+from manifest import trajectory_checksum
+
+
+"""
+Function that creates the name of a run from the values that change it
+
+NOTE: The values are the ones returned by manifest.simulation_parameters(). They are
+      written as JSON with sorted keys, so the same values always give the same name.
+"""
+
+def cache_key(parameters):
+    return hashlib.sha256(json.dumps(parameters, sort_keys = True).encode()).hexdigest()
+
+
+"""
+Create the CachedTrajectory class
+
+NOTE: A finished run read back from the cache. It has the same functions as the
+      TrajectoryRecorder, so it can be used in place of the recorder of a new run.
+"""
+
+class CachedTrajectory():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, times, positions, velocities, stride, number_of_ticks):
+        self._times = times
+        self._positions = positions
+        self._velocities = velocities
+
+        self.number_of_drones = positions.shape[1]
+        self.stride = stride
+        self.number_of_ticks = number_of_ticks
+        self.number_of_samples = len(times)
+
+
+    """
+    Functions that return the recorded times, positions, and velocities
+    """
+
+    def times(self):
+        return self._times
+
+    def positions(self):
+        return self._positions
+
+    def velocities(self):
+        return self._velocities
+
+
+"""
+Create the ResultCache class
+
+NOTE: The cache stores finished headless runs in a folder, one file per run named after
+      the hash of the values that change the run (see cache_key()). Each file holds the
+      recorded trajectory, the run's metrics, and its manifest. Asking for a run that has
+      already been done reads it back instead of simulating it again.
+
+NOTE 2: When the files add up to more than max_size bytes, the runs used the longest time
+        ago are deleted first. A file's modified time is set every time it is used, so it
+        keeps track of when the run was last used. Files are written to a temporary file
+        and renamed, so processes sharing the folder never read a half written run.
+"""
+
+class ResultCache():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, folder, max_size = 2 ** 30):
+        # the folder the runs are stored in
+        self.folder = folder
+
+        # the most bytes the stored runs can take up
+        self.max_size = max_size
+
+        # create the folder
+        os.makedirs(folder, exist_ok = True)
+
+
+    """
+    Function that returns the file a run is stored in
+    """
+
+    def file_name(self, key):
+        return os.path.join(self.folder, key + ".npz")
+
+
+    """
+    Function that reads a run from the cache
+
+    NOTE: Returns the trajectory, the metrics, and the manifest, or None if the run is not
+          stored. A stored run that can't be read (a cut off or broken file) or whose
+          positions do not match its manifest's checksum is deleted and treated as not
+          stored.
+    """
+
+    def get(self, key):
+        # the file the run is stored in
+        file_name = self.file_name(key)
+
+        # read the run
+        try:
+            with np.load(file_name) as data:
+                times = data["times"]
+                positions = data["positions"]
+                velocities = data["velocities"]
+                details = json.loads(str(data["details"]))
+
+            # rebuild the trajectory
+            manifest = details["manifest"]
+            trajectory = CachedTrajectory(times, positions, velocities, manifest["stride"], manifest["number_of_ticks"])
+
+        # the run is not stored (or was deleted by another process)
+        except FileNotFoundError:
+            return None
+
+        # the stored run can't be read
+        except (zipfile.BadZipFile, OSError, EOFError, IndexError, KeyError, TypeError, ValueError):
+            self.remove(key)
+            return None
+
+        # check that the stored positions are the ones the run recorded
+        if (trajectory_checksum(trajectory) != manifest["checksum"]):
+            self.remove(key)
+            return None
+
+        # mark the run as just used
+        try:
+            os.utime(file_name)
+        except FileNotFoundError:
+            pass
+
+        # return the trajectory, metrics, and manifest
+        return trajectory, details["metrics"], manifest
+
+
+    """
+    Function that stores a run in the cache
+
+    NOTE: metrics is a dictionary of the run's metrics (names and numbers). The runs used
+          the longest time ago are deleted if the cache is too big afterwards.
+    """
+
+    def put(self, key, recorder, metrics, manifest):
+        # the file the run is stored in and the temporary file it is written to
+        file_name = self.file_name(key)
+        temporary_file_name = file_name + "." + str(os.getpid()) + ".tmp"
+
+        # the metrics and manifest
+        details = json.dumps({"metrics": metrics, "manifest": manifest})
+
+        # write the run and move it into place
+        with open(temporary_file_name, "wb") as file:
+            np.savez(file, times = recorder.times(), positions = recorder.positions(), velocities = recorder.velocities(), details = np.array(details))
+        os.replace(temporary_file_name, file_name)
+
+        # make room for the run
+        self.evict()
+
+
+    """
+    Function that deletes a run from the cache
+    """
+
+    def remove(self, key):
+        try:
+            os.remove(self.file_name(key))
+        except FileNotFoundError:
+            pass
+
+
+    """
+    Function that returns every stored run's file, size, and last time it was used
+    """
+
+    def entries(self):
+        entries = []
+
+        for entry in os.scandir(self.folder):
+            # skip the temporary files
+            if (not entry.name.endswith(".npz")):
+                continue
+
+            # the file may be deleted by another process
+            try:
+                status = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            entries.append((entry.path, status.st_size, status.st_mtime))
+
+        return entries
+
+
+    """
+    Function that returns the number of bytes the stored runs take up
+    """
+
+    def size(self):
+        return sum(size for path, size, last_used in self.entries())
+
+
+    """
+    Function that deletes the runs used the longest time ago until the cache fits in max_size
+    """
+
+    def evict(self):
+        # the stored runs from the longest time ago to the most recent
+        entries = sorted(self.entries(), key = lambda entry: entry[2])
+
+        # the number of bytes the stored runs take up
+        total_size = sum(size for path, size, last_used in entries)
+
+        # delete runs until the cache is small enough
+        for path, size, last_used in entries:
+            if (total_size <= self.max_size):
+                break
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+            total_size = total_size - size
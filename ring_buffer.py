@@ -0,0 +1,79 @@
+"""
+Import Libraries
+"""
+
+import numpy as np
+
+
+"""
+Create the RingBuffer class
+
+NOTE: The ring buffer holds the last few values added to it in an array that is created
+      once. Every value is written twice (at its spot and at its spot + capacity), so the
+      values from oldest to newest are always next to each other in the array and can be
+      handed out as a view without copying them.
+"""
+
+class RingBuffer():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, capacity, shape = (2,)):
+        # the most values the buffer can hold
+        self.capacity = capacity
+
+        # the values (written twice so the buffer never needs to be unwrapped)
+        self.values = np.zeros((2 * capacity,) + tuple(shape))
+
+        # where the next value is written
+        self.head = 0
+
+        # the number of values in the buffer
+        self.count = 0
+
+
+    """
+    Function that adds a value to the buffer (removing the oldest value if it is full)
+    """
+
+    def append(self, value):
+        # write the value at its spot and its spot + capacity
+        self.values[self.head] = value
+        self.values[self.head + self.capacity] = value
+
+        # move to the next spot
+        self.head = (self.head + 1) % self.capacity
+
+        # count the value if the buffer is not full
+        if (self.count < self.capacity):
+            self.count = self.count + 1
+
+
+    """
+    Function that returns the values from oldest to newest (a view, not a copy)
+    """
+
+    def view(self):
+        # find where the oldest value is
+        start = (self.head - self.count) % self.capacity
+
+        # return the values from oldest to newest
+        return self.values[start:start + self.count]
+
+
+    """
+    Function that returns the number of values in the buffer
+    """
+
+    def __len__(self):
+        return self.count
+
+
+    """
+    Function that removes every value from the buffer
+    """
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
@@ -0,0 +1,173 @@
+"""
+Import Libraries
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+from spatial_hash import SpatialHash
+
+
+"""
+Create the RockField class
+
+NOTE: The rocks never move, so the rock avoidance velocity only depends on where the drone
+      is. The rock field calculates that velocity once at every point of a grid over the
+      graph (the same sum Swarm.rock_avoidance() calculates, honoring avoid_rock_radius,
+      the sight distance + the rule's sight offset, and rock_avoidance_percentage_factor).
+      Each drone then gets its velocity by blending the 4 grid points around it (bilinear
+      interpolation), so the cost per drone does not depend on the number of rocks.
+
+NOTE 2: The blended velocity is an approximation. It is exact on the grid points, and a
+        smaller resolution (the spacing between grid points) makes it closer everywhere
+        else. The field uses a single sight distance for every drone.
+"""
+
+class RockField():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, width, height, rocks_positions, avoid_rock_radius, sight_distance, rock_avoidance_percentage_factor, resolution = 5, sight_offset = 10):
+        # the spacing between grid points
+        self.resolution = resolution
+
+        # the parameters the field was calculated with
+        self.avoid_rock_radius = avoid_rock_radius
+        self.sight_distance = sight_distance
+        self.sight_offset = sight_offset
+        self.rock_avoidance_percentage_factor = rock_avoidance_percentage_factor
+
+        # create an area of avoidance for each rock
+        self.rocks = np.asarray(rocks_positions, dtype = float).reshape(-1, 2) + avoid_rock_radius
+
+        # the grid points (covering the whole graph)
+        self.x_points = np.arange(0, width + resolution, resolution, dtype = float)
+        self.y_points = np.arange(0, height + resolution, resolution, dtype = float)
+
+        # the rock avoidance velocity at each grid point (calculated by build() or read by load())
+        self.velocities = None
+
+
+    """
+    Function that calculates the rock avoidance velocity at every grid point
+    """
+
+    def build(self, chunk_size = 16384):
+        # every grid point's position
+        grid_x, grid_y = np.meshgrid(self.x_points, self.y_points, indexing = "ij")
+        grid_points = np.stack((grid_x.ravel(), grid_y.ravel()), axis = 1)
+
+        # the distance at which rocks are avoided
+        # (add the rock avoidance rule's sight offset to increase the sight distance)
+        avoid_distance = self.sight_distance + self.sight_offset
+
+        # put the rocks into a spatial hash
+        rock_index = SpatialHash(self.x_points[-1], self.y_points[-1], avoid_distance)
+        rock_index.rebuild(self.rocks)
+
+        # the rock avoid direction at each grid point
+        rock_avoid_directions = np.zeros((len(grid_points), 2))
+
+        # go through the grid points a chunk at a time (so the pairs of points and rocks fit in memory)
+        for start in range(0, len(grid_points), chunk_size):
+            chunk_points = grid_points[start:start + chunk_size]
+
+            # find the rocks near each grid point
+            points, rocks, distance_magnitudes = rock_index.query(chunk_points, avoid_distance)
+
+            # add the distances of the nearby rocks to the total
+            distances_between_points_and_rocks = chunk_points[points] - self.rocks[rocks]
+            rock_avoid_directions[start:start + chunk_size, 0] = np.bincount(points, weights = distances_between_points_and_rocks[:, 0], minlength = len(chunk_points))
+            rock_avoid_directions[start:start + chunk_size, 1] = np.bincount(points, weights = distances_between_points_and_rocks[:, 1], minlength = len(chunk_points))
+
+        # multiply the avoid directions by the rock avoid percentage
+        velocities = self.rock_avoidance_percentage_factor * rock_avoid_directions
+        self.velocities = velocities.reshape(len(self.x_points), len(self.y_points), 2)
+
+
+    """
+    Function that finds the rock avoidance velocity at each position
+
+    NOTE: Positions outside of the grid use the closest edge of the grid.
+    """
+
+    def lookup(self, positions):
+        # find the grid square each position is in and how far across the square it is
+        x = np.clip(positions[:, 0] / self.resolution, 0, len(self.x_points) - 1)
+        y = np.clip(positions[:, 1] / self.resolution, 0, len(self.y_points) - 1)
+        x_cells = np.minimum(x.astype(int), len(self.x_points) - 2)
+        y_cells = np.minimum(y.astype(int), len(self.y_points) - 2)
+        x_fractions = (x - x_cells)[:, None]
+        y_fractions = (y - y_cells)[:, None]
+
+        # blend the velocities of the 4 corners of the square
+        bottom = ((1 - x_fractions) * self.velocities[x_cells, y_cells]) + (x_fractions * self.velocities[x_cells + 1, y_cells])
+        top = ((1 - x_fractions) * self.velocities[x_cells, y_cells + 1]) + (x_fractions * self.velocities[x_cells + 1, y_cells + 1])
+
+        # return the blended velocities
+        return ((1 - y_fractions) * bottom) + (y_fractions * top)
+
+
+    """
+    Function that creates a name for the field from the rock layout and parameters
+
+    NOTE: Two fields with the same name were calculated from the same rocks and parameters,
+          so the name can be used to find a saved field.
+    """
+
+    def cache_key(self):
+        key = hashlib.sha256()
+        key.update(self.rocks.tobytes())
+        key.update(repr((self.avoid_rock_radius, self.sight_distance, self.sight_offset, self.rock_avoidance_percentage_factor, self.resolution, len(self.x_points), len(self.y_points))).encode())
+
+        return key.hexdigest()
+
+
+    """
+    Functions that save the field to a file and read it back
+
+    NOTE: The field is written to a temporary file in the same folder and then moved to the
+          file name, so a run that is stopped while saving never leaves a broken file.
+    """
+
+    def save(self, file_name):
+        # the temporary file the field is written to
+        temporary_file_name = file_name + "." + str(os.getpid()) + ".tmp"
+
+        # write the field and move it into place
+        # (an open file is used so np.save() does not add .npy to the temporary file name)
+        try:
+            with open(temporary_file_name, "wb") as file:
+                np.save(file, self.velocities)
+            os.replace(temporary_file_name, file_name)
+
+        # remove the temporary file if the field could not be saved
+        except BaseException:
+            if (os.path.exists(temporary_file_name)):
+                os.remove(temporary_file_name)
+            raise
+
+    def load(self, file_name):
+        self.velocities = np.load(file_name)
+
+
+    """
+    Function that reads the field from the cache folder, or calculates and saves it
+    """
+
+    def load_or_build(self, cache_folder):
+        # the file the field is saved in
+        file_name = os.path.join(cache_folder, "rock_field_" + self.cache_key() + ".npy")
+
+        # read the field if it has already been calculated
+        if (os.path.exists(file_name)):
+            self.load(file_name)
+
+        # calculate the field and save it
+        else:
+            self.build()
+            os.makedirs(cache_folder, exist_ok = True)
+            self.save(file_name)
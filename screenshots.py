@@ -0,0 +1,142 @@
+"""
+Import Libraries
+"""
+
+import os
+import queue
+import threading
+
+import numpy as np
+from PIL import Image
+
+
+"""
+Function that saves a frame (an array of pixels) as an image file
+"""
+
+def save_image(frame, file_name):
+    Image.fromarray(np.asarray(frame)).save(file_name)
+
+
+"""
+Create the ScreenshotWriter class
+
+NOTE: The writer takes a screenshot at each of the given times (in seconds), or every
+      interval seconds if an interval is given instead. update() is called every frame
+      with the current time; once a screenshot time is reached, capture_frame() reads the
+      window's pixels and the frame is handed to a background thread that encodes it and
+      writes it to disk, so the frame loop never waits for the disk. A frame that reaches
+      more than one screenshot time at once is saved once for each time (the same as
+      checking each time on its own).
+
+NOTE 2: The file name is made from file_name_format with the screenshot time filled in.
+        At most queue_size frames wait for the thread; if the thread falls that far
+        behind, update() waits for it instead of using more memory. close() waits for
+        every frame to be written.
+"""
+
+class ScreenshotWriter():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, capture_frame, times = None, interval = None, file_name_format = "Screenshots/Simulation at %g seconds.jpg", save_frame = save_image, queue_size = 8):
+        # check that the screenshot times are given one way
+        if ((times is None) == (interval is None)):
+            raise ValueError("Give either the screenshot times or the interval between screenshots")
+
+        if ((interval is not None) and (interval <= 0)):
+            raise ValueError("The interval between screenshots must be more than 0 seconds")
+
+        # the functions that read the window's pixels and save them
+        self.capture_frame = capture_frame
+        self.save_frame = save_frame
+
+        # the screenshot times (sorted) or the interval between screenshots
+        self.times = sorted(times) if (times is not None) else None
+        self.interval = interval
+        self.file_name_format = file_name_format
+
+        # the number of screenshots taken (and the next one to take)
+        self.number_of_screenshots = 0
+
+        # the frames waiting to be written and the thread that writes them
+        # (the thread is a daemon so it never keeps the program open)
+        self.frames = queue.Queue(maxsize = queue_size)
+        self.thread = threading.Thread(target = self._write_frames, daemon = True)
+        self.thread.start()
+        self.closed = False
+
+
+    """
+    Function that returns the time of the next screenshot (None if there are no more)
+    """
+
+    def next_time(self):
+        if (self.interval is not None):
+            return self.number_of_screenshots * self.interval
+
+        if (self.number_of_screenshots < len(self.times)):
+            return self.times[self.number_of_screenshots]
+
+        return None
+
+
+    """
+    Function that takes the screenshots whose time has been reached
+    """
+
+    def update(self, time):
+        frame = None
+
+        # go through every screenshot time that has been reached
+        next_time = self.next_time()
+        while ((next_time is not None) and (time >= next_time)):
+            # read the window's pixels once for this frame
+            if (frame is None):
+                frame = self.capture_frame()
+
+            # hand the frame to the thread
+            self.frames.put((frame, self.file_name_format % next_time))
+
+            # move on to the next screenshot
+            self.number_of_screenshots = self.number_of_screenshots + 1
+            next_time = self.next_time()
+
+
+    """
+    Function that writes the frames handed to the thread (runs on the thread)
+    """
+
+    def _write_frames(self):
+        while True:
+            # wait for a frame (None means the writer is closed)
+            item = self.frames.get()
+            if (item is None):
+                break
+
+            frame, file_name = item
+
+            # create the folder and save the frame
+            folder = os.path.dirname(file_name)
+            if (folder != ""):
+                os.makedirs(folder, exist_ok = True)
+
+            # (a frame that can't be saved is reported and skipped so the thread keeps going)
+            try:
+                self.save_frame(frame, file_name)
+            except Exception as error:
+                print("Could not save " + file_name + ": " + str(error))
+
+
+    """
+    Function that waits for every frame to be written and stops the thread
+    """
+
+    def close(self):
+        if (self.closed):
+            return
+
+        self.closed = True
+        self.frames.put(None)
+        self.thread.join()
@@ -0,0 +1,42 @@
+"""
+Import Libraries
+"""
+
+import numpy as np
+
+
+"""
+Create the arrow and rock shapes
+
+NOTE: The arrow is the same arrow drawn by Boids.drone_position_and_direction() (pointing
+      along the x axis before it is rotated). The rock is a circle with a diameter of 20
+      (the same as Boids.create_rock()). The shapes are kept apart from the p5 renderer so
+      the offline video renderer (video.py) draws the same shapes without a window.
+"""
+
+arrow_shape = np.array([[16, 0], [-8, 8], [-8, -8]], dtype = float)
+
+rock_radius = 10
+rock_segments = 16
+
+
+"""
+Function that calculates the corners of every drone's arrow
+
+NOTE: Returns an array of (drones, 3, 2) corners. Each arrow is rotated to the angle of the
+      drone's velocity and moved to the drone's position.
+"""
+
+def arrow_vertices(positions, velocities):
+    # the angle of each drone's velocity
+    angles = np.arctan2(velocities[:, 1], velocities[:, 0])
+    cosines = np.cos(angles)[:, None]
+    sines = np.sin(angles)[:, None]
+
+    # rotate the arrow by each angle and move it to each drone's position
+    vertices = np.empty((len(positions), 3, 2))
+    vertices[:, :, 0] = (cosines * arrow_shape[:, 0]) - (sines * arrow_shape[:, 1]) + positions[:, 0, None]
+    vertices[:, :, 1] = (sines * arrow_shape[:, 0]) + (cosines * arrow_shape[:, 1]) + positions[:, 1, None]
+
+    # return the arrow corners
+    return vertices
@@ -0,0 +1,194 @@
+"""
+Import Libraries
+"""
+
+import numpy as np
+
+
+"""
+Create the SpatialHash class
+
+NOTE: The spatial hash splits the graph into square cells that are as wide as the largest
+      sight distance. Two drones can only see each other if they are in the same cell or in
+      neighboring cells, so each drone only needs to check the drones in the 9 cells around
+      it instead of every drone on the graph.
+
+NOTE 2: The same spatial hash can store rocks instead of drones (the rocks never move, so
+        they are only put into their cells once).
+
+NOTE 3: Drones outside of the graph are put in the closest cell at the edge of the graph.
+        This never hides a neighbor; it only adds a few extra drones to check.
+
+NOTE 4: Sorting a few drones into cells and walking through 9 cells costs more than
+        checking every pair, so if no more than dense_limit drones (or rocks) are stored,
+        the cells are skipped and every position is checked against every stored drone.
+"""
+
+class SpatialHash():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, width, height, cell_size, dense_limit = 64):
+        # the size of each cell
+        self.cell_size = cell_size
+
+        # the most drones stored for every pair to be checked instead of using the cells
+        self.dense_limit = dense_limit
+        self.dense = True
+
+        # the number of cells in the x and y directions
+        self.number_of_x_cells = max(1, int(np.ceil(width / cell_size)))
+        self.number_of_y_cells = max(1, int(np.ceil(height / cell_size)))
+
+        # the drones sorted by cell, where each cell starts in that list, and how many drones are in each cell
+        self.sorted_drones = np.zeros(0, dtype = int)
+        self.cell_starts = np.zeros(self.number_of_x_cells * self.number_of_y_cells, dtype = int)
+        self.cell_counts = np.zeros(self.number_of_x_cells * self.number_of_y_cells, dtype = int)
+
+        # the stored drones' positions and cells
+        self.positions = np.zeros((0, 2))
+        self.x_cells = np.zeros(0, dtype = int)
+        self.y_cells = np.zeros(0, dtype = int)
+
+        # the number of distances calculated by the last query
+        self.number_of_checks = 0
+
+
+    """
+    Function that finds the cell of each position (positions outside the graph go in the closest edge cell)
+    """
+
+    def _cells(self, positions):
+        x_cells = np.clip((positions[:, 0] // self.cell_size).astype(int), 0, self.number_of_x_cells - 1)
+        y_cells = np.clip((positions[:, 1] // self.cell_size).astype(int), 0, self.number_of_y_cells - 1)
+
+        return x_cells, y_cells
+
+
+    """
+    Function that puts every drone into its cell
+    """
+
+    def rebuild(self, positions):
+        # store the positions
+        self.positions = positions
+
+        # check every pair if there are only a few drones
+        self.dense = len(positions) <= self.dense_limit
+        if (self.dense):
+            return
+
+        # find the cell of each drone
+        self.x_cells, self.y_cells = self._cells(positions)
+        cells = (self.x_cells * self.number_of_y_cells) + self.y_cells
+
+        # sort the drones by cell
+        self.sorted_drones = np.argsort(cells, kind = "stable")
+
+        # count the drones in each cell and find where each cell starts in the sorted drones
+        self.cell_counts = np.bincount(cells, minlength = self.number_of_x_cells * self.number_of_y_cells)
+        self.cell_starts = np.cumsum(self.cell_counts) - self.cell_counts
+
+
+    """
+    Function that finds every stored drone closer than the given distance to each position
+
+    NOTE: Returns the positions (i), the stored drones close to them (j), and the distance
+          between them. The distance should not be larger than the cell size.
+    """
+
+    def query(self, positions, distance):
+        # check every position against every stored drone if there are only a few drones
+        if (self.dense):
+            return self._query_every_pair(positions, distance)
+
+        # the positions and the stored drones that might be close to them
+        drones = []
+        neighbors = []
+
+        # every position's row
+        all_drones = np.arange(len(positions))
+
+        # find the cell of each position
+        position_x_cells, position_y_cells = self._cells(positions)
+
+        # go through the position's cell and the 8 cells around it
+        for x_offset in (-1, 0, 1):
+            for y_offset in (-1, 0, 1):
+                # find the neighboring cell of each position
+                x_cells = position_x_cells + x_offset
+                y_cells = position_y_cells + y_offset
+
+                # only keep the neighboring cells that are inside the graph
+                inside = (x_cells >= 0) & (x_cells < self.number_of_x_cells) & (y_cells >= 0) & (y_cells < self.number_of_y_cells)
+                cells = (x_cells[inside] * self.number_of_y_cells) + y_cells[inside]
+
+                # the number of stored drones in each neighboring cell
+                counts = self.cell_counts[cells]
+
+                # pair each position with every stored drone in its neighboring cell
+                # (repeat each position once per drone in the cell, then walk through the cell)
+                total = counts.sum()
+                firsts = np.repeat(np.cumsum(counts) - counts, counts)
+                drones.append(np.repeat(all_drones[inside], counts))
+                neighbors.append(self.sorted_drones[np.repeat(self.cell_starts[cells], counts) + np.arange(total) - firsts])
+
+        # combine the pairs from every neighboring cell
+        drones = np.concatenate(drones)
+        neighbors = np.concatenate(neighbors)
+
+        # the number of distances calculated (read by the profiler)
+        self.number_of_checks = len(drones)
+
+        # calculate the distance between each position and its possible neighbor
+        x_distances = positions[drones, 0] - self.positions[neighbors, 0]
+        y_distances = positions[drones, 1] - self.positions[neighbors, 1]
+        distance_magnitudes = np.sqrt((x_distances * x_distances) + (y_distances * y_distances))
+
+        # only keep the pairs that are closer than the distance
+        close = distance_magnitudes < distance
+
+        # return the pairs and their distances
+        return drones[close], neighbors[close], distance_magnitudes[close]
+
+
+    """
+    Function that finds every stored drone closer than the given distance to each position
+    by checking every pair (the same results as query(), sorted by position)
+    """
+
+    def _query_every_pair(self, positions, distance):
+        # the number of distances calculated (read by the profiler)
+        self.number_of_checks = len(positions) * len(self.positions)
+
+        # calculate the distance between every position and every stored drone
+        x_distances = positions[:, 0, None] - self.positions[None, :, 0]
+        y_distances = positions[:, 1, None] - self.positions[None, :, 1]
+        distance_magnitudes = np.sqrt((x_distances * x_distances) + (y_distances * y_distances))
+
+        # only keep the pairs that are closer than the distance
+        close = distance_magnitudes < distance
+        drones, neighbors = np.nonzero(close)
+
+        # return the pairs and their distances
+        return drones, neighbors, distance_magnitudes[close]
+
+
+    """
+    Function that finds every pair of stored drones closer than the given distance
+
+    NOTE: Returns the drones (i), their neighbors (j), and the distance between them. Every
+          pair shows up twice (once as i, j and once as j, i) and no drone is paired with
+          itself.
+    """
+
+    def neighbor_pairs(self, positions, distance):
+        # find the stored drones close to each drone
+        drones, neighbors, distance_magnitudes = self.query(positions, distance)
+
+        # remove the pairs of a drone with itself
+        different = drones != neighbors
+
+        # return the pairs and their distances
+        return drones[different], neighbors[different], distance_magnitudes[different]
@@ -0,0 +1,136 @@
+"""
+Import Libraries
+"""
+
+import numpy as np
+
+# numba is optional (the NumPy kernel is used without it)
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+"""
+Function that calculates every drone's velocity magnitude
+"""
+
+def velocity_magnitudes(velocities):
+    # square the velocities, add them together, and square root them
+    return np.sqrt((velocities[:, 0] * velocities[:, 0]) + (velocities[:, 1] * velocities[:, 1]))
+
+
+"""
+Function that checks every drone's speed and adjusts it accordingly (NumPy kernel)
+
+NOTE: This does the same math in the same order as Boids.drone_speed_check(), so the
+      velocities are bit for bit the same. A drone over the max speed (or under the min
+      speed) has its velocity divided by its magnitude, multiplied by the speed limit, and
+      its acceleration set to 0. The arrays are changed in place.
+
+NOTE 2: A drone that is not moving has no direction to speed up in, so its velocity is
+        divided by 1 instead of its magnitude of 0 and it stays still (Boids divided by 0
+        and raised an error). Both kernels do this, so they agree on every input.
+"""
+
+def speed_check_numpy(velocities, accelerations, min_speeds, max_speeds):
+    # calculate the drones' velocity magnitudes
+    magnitudes = velocity_magnitudes(velocities)
+
+    # find the drones over or under the speed limit and the limit they need to be set to
+    too_fast = max_speeds < magnitudes
+    too_slow = min_speeds > magnitudes
+    out_of_range = too_fast | too_slow
+    speed_limits = np.where(too_fast, max_speeds, min_speeds)
+
+    # divide by 1 for the drones that are not moving
+    magnitudes = np.where(magnitudes == 0, 1, magnitudes)
+
+    # divide the velocity by its magnitude and multiply it by the speed limit
+    velocities[out_of_range] = (velocities[out_of_range] / magnitudes[out_of_range, None]) * speed_limits[out_of_range, None]
+
+    # set the drones' acceleration to 0
+    accelerations[out_of_range] = 0
+
+
+"""
+Function that checks every drone's speed and adjusts it accordingly (loop kernel)
+
+NOTE: This is the same math written as a loop over the drones, which numba compiles to
+      machine code. It is only used when numba is installed.
+"""
+
+def _speed_check_loop(velocities, accelerations, min_speeds, max_speeds):
+    # go through each drone
+    for i in range(velocities.shape[0]):
+        # calculate the drone's velocity magnitude
+        x_velocity = velocities[i, 0]
+        y_velocity = velocities[i, 1]
+        magnitude = np.sqrt((x_velocity * x_velocity) + (y_velocity * y_velocity))
+
+        # check if the drone's velocity is over or under the speed limit
+        if (max_speeds[i] < magnitude):
+            speed_limit = max_speeds[i]
+        elif (min_speeds[i] > magnitude):
+            speed_limit = min_speeds[i]
+        else:
+            continue
+
+        # divide by 1 for a drone that is not moving
+        if (magnitude == 0):
+            magnitude = 1.0
+
+        # divide the velocity by its magnitude and multiply it by the speed limit
+        velocities[i, 0] = (x_velocity / magnitude) * speed_limit
+        velocities[i, 1] = (y_velocity / magnitude) * speed_limit
+
+        # set the drone's acceleration to 0
+        accelerations[i, 0] = 0
+        accelerations[i, 1] = 0
+
+
+# compile the loop kernel if numba is installed
+if (numba is not None):
+    speed_check_numba = numba.njit(cache = True)(_speed_check_loop)
+else:
+    speed_check_numba = None
+
+
+"""
+Function that checks every drone's speed with the fastest kernel available
+"""
+
+def speed_check(velocities, accelerations, min_speeds, max_speeds):
+    if (speed_check_numba is not None):
+        speed_check_numba(velocities, accelerations, min_speeds, max_speeds)
+    else:
+        speed_check_numpy(velocities, accelerations, min_speeds, max_speeds)
+
+
+"""
+Check that both kernels give the same velocities and accelerations (including drones that
+are not moving) and print the result
+"""
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+
+    # random drones, with some of them not moving
+    velocities = rng.normal(0, 10, (1000, 2))
+    velocities[::50] = 0
+    accelerations = rng.normal(0, 1, (1000, 2))
+    min_speeds = np.full(1000, 5.0)
+    max_speeds = np.full(1000, 10.0)
+
+    # run each kernel on its own copy of the drones
+    numpy_velocities, numpy_accelerations = velocities.copy(), accelerations.copy()
+    speed_check_numpy(numpy_velocities, numpy_accelerations, min_speeds, max_speeds)
+
+    loop_velocities, loop_accelerations = velocities.copy(), accelerations.copy()
+    if (speed_check_numba is not None):
+        speed_check_numba(loop_velocities, loop_accelerations, min_speeds, max_speeds)
+    else:
+        _speed_check_loop(loop_velocities, loop_accelerations, min_speeds, max_speeds)
+
+    # print if the kernels agree bit for bit
+    print("Kernels agree: " + str(np.array_equal(numpy_velocities, loop_velocities) and np.array_equal(numpy_accelerations, loop_accelerations)))
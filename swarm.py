@@ -0,0 +1,352 @@
+"""
+Import Libraries
+"""
+
+import numpy as np
+
+from spatial_hash import SpatialHash
+from speed_check import speed_check
+from behaviors import default_pipeline
+from profiler import Profiler
+
+
+"""
+Create the Swarm class
+
+NOTE: The Swarm stores the positions, velocities, accelerations, and speed limits of every
+      drone in contiguous NumPy arrays (one row per drone) so that the Boids rules can be
+      computed for the whole fleet with array operations instead of a Python loop over
+      every drone. The Boids class is a view over one row of these arrays.
+"""
+
+class Swarm():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, width, height, capacity = 16, rng = None):
+        # border values
+        self.width = width
+        self.height = height
+
+        # the random number generator used to create the drones
+        # (a seeded generator makes the swarm the same every run)
+        if (rng is None):
+            rng = np.random.default_rng()
+        self.rng = rng
+
+        # the number of drones in the swarm
+        self.number_of_drones = 0
+
+        # the drones' parameters
+        # (rows after the number of drones are free space for new drones)
+        self._positions = np.zeros((capacity, 2))
+        self._velocities = np.zeros((capacity, 2))
+        self._accelerations = np.zeros((capacity, 2))
+        self._max_speeds = np.zeros(capacity)
+        self._min_speeds = np.zeros(capacity)
+        self._sight_distances = np.zeros(capacity)
+
+        # the rules applied to the drones every time step (made from the changeable parameters)
+        # (every swarm has its own rules so it can be tuned on its own)
+        self.behaviors = default_pipeline()
+
+        # the spatial hash used to find nearby drones and the nearby drones it found
+        # (built by update_neighbors() once the drones have been added)
+        self.spatial_hash = None
+        self.neighbors = None
+
+        # the profiler that counts the nearby drones each rule checks and finds
+        # (turned off unless a turned on Profiler is given to the swarm)
+        self.profiler = Profiler()
+
+
+    """
+    Views of the drones' parameters (one row per drone)
+    """
+
+    @property
+    def positions(self):
+        return self._positions[:self.number_of_drones]
+
+    @positions.setter
+    def positions(self, value):
+        self._positions[:self.number_of_drones] = value
+
+    @property
+    def velocities(self):
+        return self._velocities[:self.number_of_drones]
+
+    @velocities.setter
+    def velocities(self, value):
+        self._velocities[:self.number_of_drones] = value
+
+    @property
+    def accelerations(self):
+        return self._accelerations[:self.number_of_drones]
+
+    @accelerations.setter
+    def accelerations(self, value):
+        self._accelerations[:self.number_of_drones] = value
+
+    @property
+    def max_speeds(self):
+        return self._max_speeds[:self.number_of_drones]
+
+    @property
+    def min_speeds(self):
+        return self._min_speeds[:self.number_of_drones]
+
+    @property
+    def sight_distances(self):
+        return self._sight_distances[:self.number_of_drones]
+
+
+    """
+    Function that adds a drone to the swarm and returns its row
+    """
+
+    def add_drone(self, x, y):
+        # check if the arrays are full and double their size
+        if (self.number_of_drones == len(self._positions)):
+            capacity = max(1, 2 * len(self._positions))
+
+            self._positions = np.resize(self._positions, (capacity, 2))
+            self._velocities = np.resize(self._velocities, (capacity, 2))
+            self._accelerations = np.resize(self._accelerations, (capacity, 2))
+            self._max_speeds = np.resize(self._max_speeds, capacity)
+            self._min_speeds = np.resize(self._min_speeds, capacity)
+            self._sight_distances = np.resize(self._sight_distances, capacity)
+
+        # the drone's row
+        index = self.number_of_drones
+        self.number_of_drones = self.number_of_drones + 1
+
+        # the drone's position on graph
+        self._positions[index] = (x, y)
+
+        # create the velocity range between -10 and 10
+        x_velocity_range = (self.rng.random() * 20) - 10
+        y_velocity_range = (self.rng.random() * 20) - 10
+
+        # the drone's velocity on graph
+        self._velocities[index] = (x_velocity_range, y_velocity_range)
+
+        # create the drone's acceleration range between 0 and 1
+        x_acceleration_range = self.rng.random()
+        y_acceleration_range = self.rng.random()
+
+        # divide the acceleration range to 0 and 0.5
+        x_acceleration_range = x_acceleration_range / 2
+        y_acceleration_range = y_acceleration_range / 2
+
+        # the drone's acceleration on graph
+        self._accelerations[index] = (x_acceleration_range, y_acceleration_range)
+
+        # set drone's speed limit
+        self._max_speeds[index] = 10
+        self._min_speeds[index] = 7
+
+        # set drone's viewing range
+        self._sight_distances[index] = 50
+
+        # return the drone's row
+        return index
+
+
+    """
+    Function that checks every drone's speed and adjusts it accordingly
+    """
+
+    def drone_speed_check(self):
+        # clamp the velocities of the whole fleet
+        # (uses the compiled kernel if numba is installed)
+        speed_check(self.velocities, self.accelerations, self.min_speeds, self.max_speeds)
+
+
+    """
+    Function that updates every drone's position
+    """
+
+    def update_positions(self):
+        self.positions = self.positions + self.velocities
+
+
+    """
+    Function that finds every pair of drones within the largest sight distance
+
+    NOTE: The sight offset is added to the largest sight distance (30 is the offset used by
+          the alignment and cohesion rules). The behavior pipeline calls this once per time
+          step and shares the pairs with every rule that needs them. For a small swarm
+          (no more than the spatial hash's dense_limit drones) every pair is checked
+          instead of using the cells.
+    """
+
+    def update_neighbors(self, sight_offset = 30):
+        # the largest sight distance used by the rules
+        largest_sight_distance = self.sight_distances.max(initial = 0) + sight_offset
+
+        # create a spatial hash with cells as wide as the largest sight distance
+        # (add 100 to shift graph)
+        if ((self.spatial_hash is None) or (self.spatial_hash.cell_size != largest_sight_distance)):
+            self.spatial_hash = SpatialHash(self.width + 100, self.height + 100, largest_sight_distance)
+
+        # put every drone into its cell
+        self.spatial_hash.rebuild(self.positions)
+
+        # find every pair of drones within the largest sight distance
+        self.neighbors = self.spatial_hash.neighbor_pairs(self.positions, largest_sight_distance)
+
+        # return the pairs
+        return self.neighbors
+
+
+    """
+    Function that calculates the velocity of a single rule for every drone
+
+    NOTE: This runs the rule on its own, using the drones' current velocities. A rule that is
+          turned off in the pipeline returns zero velocities (the same as
+          BehaviorPipeline.apply() skipping it).
+    """
+
+    def rule_velocities(self, name, rocks_positions = None):
+        # get the rule
+        rule = self.behaviors[name]
+
+        # a rule that is turned off does not change the drones' velocities
+        if (not rule.enabled):
+            return np.zeros_like(self.velocities)
+
+        # find the nearby drones if the rule needs them
+        neighbor_data = self.behaviors.neighbor_data(self, [rule])
+
+        # return the rule's velocities
+        return rule.velocities(self, self.velocities, neighbor_data, rocks_positions)
+
+
+    """
+    Function that checks which drones are at the border and avoid it
+    """
+
+    def border_avoidance(self):
+        return self.rule_velocities("border_avoidance")
+
+
+    """
+    Function that checks which drones are near a rock and avoid it
+    """
+
+    def rock_avoidance(self, rocks_positions):
+        return self.rule_velocities("rock_avoidance", rocks_positions)
+
+
+    """
+    Function that makes the swarm avoid rocks with a precomputed rock avoidance field
+    (see RockAvoidance.use_rock_field())
+    """
+
+    def use_rock_field(self, resolution = 5, cache_folder = None):
+        self.behaviors["rock_avoidance"].use_rock_field(resolution, cache_folder)
+
+
+    """
+    Boids Algorithm
+
+    Rule 1: Separation
+    Function that checks which drones are near other drones and avoids them
+    """
+
+    def rule_one_separation(self):
+        return self.rule_velocities("separation")
+
+
+    """
+    Rule 2: Alignment
+    Function that makes every drone match the average velocity of nearby drones
+    """
+
+    def rule_two_alignment(self):
+        return self.rule_velocities("alignment")
+
+
+    """
+    Rule 3: Cohesion
+    Function that makes every drone fly towards the center of mass of nearby drones
+    """
+
+    def rule_three_cohesion(self):
+        return self.rule_velocities("cohesion")
+
+
+    """
+    Rules 1, 2, and 3 together
+    Function that calculates the separation, alignment, and cohesion velocities of every drone
+    in a single pass over the nearby drones
+
+    NOTE: The nearby drones are only found once and shared by the three rules. The alignment
+          velocity subtracts the drone's velocity after the separation velocity has been
+          added to it, the same as calling the three rules one after the other. The nearby
+          drones' velocities are the ones from before the rules. A rule that is turned off
+          returns zero velocities.
+    """
+
+    def boids_rules(self):
+        # get the three rules
+        separation = self.behaviors["separation"]
+        alignment = self.behaviors["alignment"]
+        cohesion = self.behaviors["cohesion"]
+
+        # find the nearby drones once for the rules that are turned on
+        neighbor_data = self.behaviors.neighbor_data(self, [rule for rule in [separation, alignment, cohesion] if rule.enabled])
+
+        # calculate each rule's velocities from the velocities left by the rule before it
+        # (a rule that is turned off does not change the drones' velocities)
+        drone_avoid_velocities = np.zeros_like(self.velocities)
+        drone_alignment_velocities = np.zeros_like(self.velocities)
+        drone_cohesion_velocities = np.zeros_like(self.velocities)
+
+        if (separation.enabled):
+            drone_avoid_velocities = separation.velocities(self, self.velocities, neighbor_data, None)
+
+        if (alignment.enabled):
+            drone_alignment_velocities = alignment.velocities(self, self.velocities + drone_avoid_velocities, neighbor_data, None)
+
+        if (cohesion.enabled):
+            drone_cohesion_velocities = cohesion.velocities(self, self.velocities + drone_avoid_velocities + drone_alignment_velocities, neighbor_data, None)
+
+        # return the separation, alignment, and cohesion velocities
+        return drone_avoid_velocities, drone_alignment_velocities, drone_cohesion_velocities
+
+
+    """
+    Function that applies the Boids rules and self defined models to every drone
+
+    NOTE: Each velocity is added to the drones' velocities as soon as it is calculated, so
+          each rule sees the velocities left by the rule before it. The rules, their order,
+          and which of them are turned on come from the swarm's behavior pipeline.
+
+    NOTE 2: The whole fleet is updated at once (synchronously). Every drone moves first, and
+            then every drone's rules are calculated from the same positions and from the
+            other drones' velocities before the rules. The original main.py updated the
+            drones one after another instead, so a drone saw the drones before it in the
+            list after they had already moved and turned this tick. This changes the
+            trajectories (not the rules), so runs do not match the original code exactly.
+    """
+
+    def apply_rules(self, rocks_positions):
+        self.behaviors.apply(self, rocks_positions)
+
+
+    """
+    Function that advances every drone by one time step
+    """
+
+    def step(self, rocks_positions):
+        # update the drones' velocities if they are over/under the max/min speed
+        self.drone_speed_check()
+
+        # update the drones' positions
+        self.update_positions()
+
+        # apply the Boids algorithm and self defined models
+        self.apply_rules(rocks_positions)
@@ -0,0 +1,416 @@
+"""
+Import Libraries
+"""
+
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+import matplotlib.pyplot as plt
+
+import parameters
+from headless import default_time_step
+from world_batch import create_world_batch
+
+
+"""
+Create the tuning factors that can be swept
+
+NOTE: Each factor in parameters.py is the starting value of a rule setting (see
+      BehaviorPipeline.settings()), so a point of the sweep is run by giving the worlds
+      those settings.
+"""
+
+factor_settings = {
+    "border_margin": ("border_avoidance", "margin"),
+    "change_border_direction_factor": ("border_avoidance", "weight"),
+    "rock_avoidance_percentage_factor": ("rock_avoidance", "weight"),
+    "drone_avoidance_percentage_factor": ("separation", "weight"),
+    "match_velocity_percentage_factor": ("alignment", "weight"),
+    "go_to_center_percentage_factor": ("cohesion", "weight"),
+}
+
+
+"""
+Create the sweep result columns
+
+NOTE: Every point of the sweep has one row of the results matrix: the value of each swept
+      factor followed by these columns (averaged over the point's seeds). Distances are in
+      meters (divided by 10 the same way the plots in main.py convert them).
+"""
+
+result_columns = [
+    "final_polarization",       # how aligned the drones' directions are at the end (1 = all the same direction)
+    "final_cohesion_radius",    # the average distance from the drones to their center of mass at the end
+    "minimum_drone_distance",   # the closest two drones got during the run
+    "turn_rate",                # the average change in a drone's direction each tick during the second half of the run (radians)
+    "overshoot",                # the fastest velocity the rules gave a drone divided by its max speed (before the speed check)
+    "escaped",                  # the fraction of worlds where a drone left the graph
+    "non_finite",               # the fraction of worlds where a position or velocity became NaN or infinite
+    "collapsed",                # the fraction of worlds where the drones ended up on top of each other
+    "unstable",                 # the fraction of worlds that blew up (see run_points())
+]
+
+
+"""
+Functions that create the points of a sweep
+
+NOTE: A grid search tries every combination of the given values of each factor. A random
+      search picks each factor uniformly between the given lowest and highest values.
+      Both return the factor names and a (points, factors) array.
+"""
+
+def grid_search_space(factor_values):
+    names = list(factor_values)
+    points = np.array(list(itertools.product(*[factor_values[name] for name in names])), dtype = float)
+
+    return names, points.reshape(-1, len(names))
+
+def random_search_space(factor_ranges, number_of_points, rng = None):
+    if (rng is None):
+        rng = np.random.default_rng()
+
+    names = list(factor_ranges)
+    lows = np.array([factor_ranges[name][0] for name in names], dtype = float)
+    highs = np.array([factor_ranges[name][1] for name in names], dtype = float)
+    points = lows + (rng.random((number_of_points, len(names))) * (highs - lows))
+
+    return names, points
+
+
+"""
+Function that converts a point of the sweep to rule settings
+"""
+
+def point_settings(names, point):
+    settings = {}
+
+    for name, value in zip(names, point):
+        if (name not in factor_settings):
+            raise ValueError("Unknown factor: " + name)
+
+        rule_name, setting_name = factor_settings[name]
+        settings.setdefault(rule_name, {})[setting_name] = float(value)
+
+    return settings
+
+
+"""
+Function that runs points of a sweep and returns their result columns
+
+NOTE: Every point is run once for each seed, and all of the points' worlds are run
+      together as one world batch. A world blew up if a position or velocity became NaN or
+      infinite, a drone left the graph, the drones turned more than turn_rate_limit radians
+      a tick on average (the jittery movement the NOTEs in parameters.py warn about), the
+      rules gave a drone more than overshoot_limit times its max speed, or the swarm
+      collapsed (see NOTE 3).
+
+NOTE 2: The border avoidance only turns a drone once it is near the border, so with the
+        default settings the drones go up to about 20 (2 meters) past the edge of the
+        graph before turning back. A drone has only left the graph once it is more than
+        escape_distance past the edge.
+
+NOTE 3: A swarm collapsed if, for most of the second half of the run, two of its drones
+        were closer than collapse_distance, so they were sitting on top of each other (how
+        the swarm breaks down when a factor is set as high as the NOTEs in parameters.py
+        warn against). Drones that only pass close to each other for a moment do not
+        count. With 8 seeds, the
+        closest two drones were usually 4 to 7 meters apart with the default settings,
+        and under 0.06 meters when match_velocity_percentage_factor was 1.
+"""
+
+def run_points(names, points, seeds, number_of_drones = 10, number_of_rocks = 5, number_of_ticks = 1800, turn_rate_limit = 0.3, overshoot_limit = 10, escape_distance = 50, collapse_distance = 2):
+    number_of_points = len(points)
+    number_of_seeds = len(seeds)
+
+    # create a world for every seed of every point
+    settings = [point_settings(names, point) for point in points for seed in seeds]
+    world_batch = create_world_batch([seed for point in points for seed in seeds], number_of_drones, number_of_rocks, settings)
+    number_of_worlds = world_batch.number_of_worlds
+
+    # the values tracked for every world during the run
+    minimum_drone_distances = np.full(number_of_worlds, np.inf)
+    turn_totals = np.zeros(number_of_worlds)
+    number_of_turns = 0
+    overshoots = np.zeros(number_of_worlds)
+    collapsed_ticks = np.zeros(number_of_worlds)
+    escaped = np.zeros(number_of_worlds, dtype = bool)
+    non_finite = np.zeros(number_of_worlds, dtype = bool)
+
+    # the graph's edges (the graph goes from 100 to the swarm's width and height)
+    lowest_position = 100 - escape_distance
+    highest_positions = np.array([world_batch.width, world_batch.height]) + escape_distance
+
+    # (worlds that blow up can overflow, which is what is being measured)
+    with np.errstate(all = "ignore"):
+        for tick in range(number_of_ticks):
+            # the drones' directions before the tick
+            old_directions = np.arctan2(world_batch.velocities[:, :, 1], world_batch.velocities[:, :, 0])
+
+            # advance every world
+            world_batch.step()
+            positions = world_batch.positions
+            velocities = world_batch.velocities
+
+            # the fastest velocity the rules gave a drone (the speed check runs at the start of the next tick)
+            speeds = np.sqrt((velocities * velocities).sum(axis = 2))
+            overshoots = np.fmax(overshoots, (speeds / world_batch.max_speeds).max(axis = 1))
+
+            # the closest two drones are
+            differences = positions[:, :, None, :] - positions[:, None, :, :]
+            distances = np.sqrt((differences * differences).sum(axis = 3))
+            distances[:, ~world_batch.not_self] = np.inf
+            closest_distances = distances.min(axis = (1, 2))
+            minimum_drone_distances = np.fmin(minimum_drone_distances, closest_distances)
+
+            # the change in every drone's direction and if the drones are on top of each other during the second half of the run
+            if (tick >= (number_of_ticks // 2)):
+                turns = np.arctan2(velocities[:, :, 1], velocities[:, :, 0]) - old_directions
+                turns = np.abs(((turns + np.pi) % (2 * np.pi)) - np.pi)
+                turn_totals = turn_totals + turns.mean(axis = 1)
+                collapsed_ticks = collapsed_ticks + (closest_distances < collapse_distance)
+                number_of_turns = number_of_turns + 1
+
+            # the worlds with a drone off the graph or a value that is NaN or infinite
+            escaped = escaped | ((positions < lowest_position) | (positions > highest_positions)).any(axis = (1, 2))
+            non_finite = non_finite | ~(np.isfinite(positions).all(axis = (1, 2)) & np.isfinite(velocities).all(axis = (1, 2)))
+
+        # the average change in direction
+        turn_rates = turn_totals / max(number_of_turns, 1)
+
+        # the worlds where the drones were on top of each other for most of the second half
+        collapsed = collapsed_ticks > (number_of_turns / 2)
+
+        # the worlds that blew up
+        unstable = non_finite | escaped | collapsed | (turn_rates > turn_rate_limit) | (overshoots > overshoot_limit)
+
+        # the formation at the end (in meters)
+        world_results = np.stack([
+            world_batch.polarizations(),
+            world_batch.cohesion_radii() / 10,
+            minimum_drone_distances / 10,
+            turn_rates,
+            overshoots,
+            escaped,
+            non_finite,
+            collapsed,
+            unstable,
+        ], axis = 1)
+
+    # average every point's worlds
+    return world_results.reshape(number_of_points, number_of_seeds, len(result_columns)).mean(axis = 1)
+
+
+"""
+Functions that run on the processes of a sweep
+
+NOTE: Each process attaches to the shared results matrix once. A task is a range of rows:
+      the process reads the points from the matrix's factor columns and writes the
+      results into its result columns, so only the range is sent to the process and
+      nothing is sent back. The main process removes the shared memory once the sweep is
+      done.
+"""
+
+_shared_memory = None
+_results = None
+_sweep_options = None
+
+def _start_worker(shared_memory_name, shape, options):
+    global _shared_memory, _results, _sweep_options
+
+    _shared_memory = SharedMemory(name = shared_memory_name)
+
+    _results = np.ndarray(shape, dtype = np.float64, buffer = _shared_memory.buf)
+    _sweep_options = options
+
+def _run_rows(start, end):
+    names = _sweep_options["names"]
+    points = _results[start:end, :len(names)]
+
+    _results[start:end, len(names):] = run_points(names, points, **{name: value for name, value in _sweep_options.items() if (name != "names")})
+
+
+"""
+Function that runs a sweep on a pool of processes
+
+NOTE: Returns the results matrix (one row per point: the factors, then result_columns).
+      The matrix lives in shared memory while the sweep runs and every process writes
+      its rows straight into it, so no results are pickled. The points are handed out
+      points_per_task at a time; all of a task's worlds run together as one world batch.
+      The number of processes defaults to the number of CPU cores.
+"""
+
+def run_sweep(names, points, seeds = range(4), number_of_drones = 10, number_of_rocks = 5, simulation_seconds = 30, time_step = default_time_step, number_of_processes = None, points_per_task = 16, turn_rate_limit = 0.3, overshoot_limit = 10, escape_distance = 50, collapse_distance = 2):
+    points = np.asarray(points, dtype = float).reshape(-1, len(names))
+    number_of_points = len(points)
+
+    # check the factor names before starting the processes
+    point_settings(names, np.zeros(len(names)))
+
+    # the number of processes to run the sweep on
+    if (number_of_processes is None):
+        number_of_processes = os.cpu_count()
+
+    # the options of every task
+    options = {
+        "names": list(names),
+        "seeds": list(seeds),
+        "number_of_drones": number_of_drones,
+        "number_of_rocks": number_of_rocks,
+        "number_of_ticks": math.ceil(simulation_seconds / time_step),
+        "turn_rate_limit": turn_rate_limit,
+        "overshoot_limit": overshoot_limit,
+        "escape_distance": escape_distance,
+        "collapse_distance": collapse_distance,
+    }
+
+    # create the results matrix in shared memory and fill in the points
+    shape = (number_of_points, len(names) + len(result_columns))
+    shared_memory = SharedMemory(create = True, size = max(1, int(np.prod(shape)) * 8))
+
+    try:
+        results = np.ndarray(shape, dtype = np.float64, buffer = shared_memory.buf)
+        results[:, :len(names)] = points
+        results[:, len(names):] = np.nan
+
+        # the rows of each task
+        starts = list(range(0, number_of_points, points_per_task))
+        ends = [min(start + points_per_task, number_of_points) for start in starts]
+
+        # run the tasks
+        with ProcessPoolExecutor(max_workers = number_of_processes, initializer = _start_worker, initargs = (shared_memory.name, shape, options)) as executor:
+            for result in executor.map(_run_rows, starts, ends):
+                pass
+
+        # copy the results out of the shared memory
+        results = results.copy()
+
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+
+    # return the results matrix
+    return results
+
+
+"""
+Function that saves the results matrix as a CSV file
+"""
+
+def save_sweep(names, results, file_name):
+    header = ",".join(list(names) + result_columns)
+    np.savetxt(file_name, results, delimiter = ",", header = header, fmt = "%.6g", comments = "")
+
+
+"""
+Function that creates a stability map of two factors
+
+NOTE: Each factor is split into number_of_bins equal bins between its lowest and highest
+      value (a factor with no more values than bins, like a grid, keeps one bin for each
+      value). Returns the value of each bin (the value or the middle of the bin) for both
+      factors and a (y bins, x bins) array with the fraction of the bin's worlds that
+      blew up (the points in a bin are averaged, so a random search fills in contiguous
+      stable and unstable regions). Bins without any points are NaN.
+"""
+
+def factor_bins(column, number_of_bins):
+    values = np.unique(column)
+
+    # one bin for each value
+    if (len(values) <= number_of_bins):
+        return values, np.searchsorted(values, column)
+
+    # equal bins (the highest value goes in the last bin)
+    edges = np.linspace(values[0], values[-1], number_of_bins + 1)
+    indices = np.clip(np.digitize(column, edges) - 1, 0, number_of_bins - 1)
+
+    return (edges[:-1] + edges[1:]) / 2, indices
+
+def stability_map(names, results, x_name, y_name, number_of_bins = 10):
+    x_column = results[:, list(names).index(x_name)]
+    y_column = results[:, list(names).index(y_name)]
+    unstable = results[:, len(names) + result_columns.index("unstable")]
+
+    # the bin of every point
+    x_values, x_indices = factor_bins(x_column, number_of_bins)
+    y_values, y_indices = factor_bins(y_column, number_of_bins)
+
+    # add up the points in each bin
+    totals = np.zeros((len(y_values), len(x_values)))
+    counts = np.zeros((len(y_values), len(x_values)))
+    np.add.at(totals, (y_indices, x_indices), unstable)
+    np.add.at(counts, (y_indices, x_indices), 1)
+
+    # average the points in each bin
+    stability = np.full(totals.shape, np.nan)
+    stability[counts > 0] = totals[counts > 0] / counts[counts > 0]
+
+    return x_values, y_values, stability
+
+
+"""
+Function that prints a stability map
+
+NOTE: "." is a stable pair, "#" is a pair where every world blew up, "+" is a pair where
+      some did, and " " is a pair that was not run.
+"""
+
+def print_stability_map(x_name, y_name, x_values, y_values, stability):
+    print(y_name + " (rows) by " + x_name + " (columns)")
+    print("%12s " % "" + " ".join("%8.4g" % x_value for x_value in x_values))
+
+    for y_value, row in zip(y_values, stability):
+        symbols = [" " if (np.isnan(value)) else ("." if (value == 0) else ("#" if (value == 1) else "+")) for value in row]
+        print("%12.4g " % y_value + " ".join("%8s" % symbol for symbol in symbols))
+
+
+"""
+Function that plots a stability map and saves it as an image
+"""
+
+def plot_stability_map(x_name, y_name, x_values, y_values, stability, file_name):
+    fig, ax = plt.subplots(figsize = (8, 6))
+
+    # color each pair by the fraction of worlds that blew up
+    image = ax.imshow(stability, origin = "lower", cmap = "RdYlGn_r", vmin = 0, vmax = 1, aspect = "auto")
+    fig.colorbar(image, ax = ax, label = "Fraction of worlds that blew up")
+
+    # label each pair with its factor values
+    ax.set_xticks(range(len(x_values)), ["%.4g" % x_value for x_value in x_values], rotation = 45)
+    ax.set_yticks(range(len(y_values)), ["%.4g" % y_value for y_value in y_values])
+    ax.set_xlabel(x_name)
+    ax.set_ylabel(y_name)
+    ax.set_title("Stability Map")
+
+    # save the plot
+    fig.tight_layout()
+    fig.savefig(file_name)
+    plt.close(fig)
+
+
+"""
+Sweep the alignment and cohesion factors, save the results, and show where the code breaks
+"""
+
+if __name__ == "__main__":
+    names, points = grid_search_space({
+        "match_velocity_percentage_factor": [0.05, parameters.match_velocity_percentage_factor, 0.25, 0.5, 1, 1.5, 2],
+        "go_to_center_percentage_factor": [0.001, parameters.go_to_center_percentage_factor, 0.01, 0.05, 0.1, 0.2, 0.5],
+    })
+
+    # run the sweep and time it
+    start_time = time.perf_counter()
+    results = run_sweep(names, points)
+    end_time = time.perf_counter()
+    print("Ran " + str(len(points)) + " points in " + ('%.3f' % (end_time - start_time)) + " seconds")
+
+    # save the results and the stability map
+    save_sweep(names, results, "sweep.csv")
+    x_values, y_values, stability = stability_map(names, results, names[0], names[1])
+    print_stability_map(names[0], names[1], x_values, y_values, stability)
+    plot_stability_map(names[0], names[1], x_values, y_values, stability, "stability_map.png")
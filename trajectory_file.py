@@ -0,0 +1,181 @@
+"""
+Import Libraries
+"""
+
+import json
+
+import numpy as np
+
+
+"""
+Create the TrajectoryWriter class
+
+NOTE: The writer streams the fleet's trajectory to disk instead of keeping it in memory. It
+      fills a chunk of ticks and then appends the chunk to the end of two binary files:
+
+          <file_name>.bin       x, y, x velocity, y velocity of every drone (ticks, drones, 4)
+          <file_name>.time.bin  the time of every tick (ticks)
+
+      A JSON header (<file_name>.json) records the number of drones, the number of ticks
+      written, the stride, and the number type. The header is rewritten after every chunk,
+      so a run that stops early can still be opened up to its last chunk.
+
+NOTE 2: The writer has the same record() function as the TrajectoryRecorder, so it can be
+        handed to run_headless() in place of one.
+"""
+
+class TrajectoryWriter():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, file_name, number_of_drones, stride = 1, chunk_size = 1024, dtype = np.float32):
+        # the files to write
+        self.file_name = file_name
+        self.data_file = open(file_name + ".bin", "wb")
+        self.time_file = open(file_name + ".time.bin", "wb")
+
+        # the amount of drones recorded each tick
+        self.number_of_drones = number_of_drones
+
+        # record every stride-th tick
+        self.stride = stride
+
+        # the number of ticks given to the writer and the number of ticks written
+        self.number_of_ticks = 0
+        self.number_of_samples = 0
+
+        # the chunk of ticks waiting to be written and how many ticks are in it
+        self.chunk = np.zeros((chunk_size, number_of_drones, 4), dtype = dtype)
+        self.chunk_times = np.zeros(chunk_size, dtype = np.float64)
+        self.chunk_count = 0
+
+        # write an empty header
+        self._write_header()
+
+
+    """
+    Function that writes the header
+    """
+
+    def _write_header(self):
+        header = {
+            "number_of_drones": self.number_of_drones,
+            "number_of_samples": self.number_of_samples,
+            "stride": self.stride,
+            "dtype": np.dtype(self.chunk.dtype).str,
+            "fields": ["x", "y", "vx", "vy"],
+        }
+
+        with open(self.file_name + ".json", "w") as header_file:
+            json.dump(header, header_file, indent = 4)
+
+
+    """
+    Function that records the fleet's positions and velocities at a tick
+    """
+
+    def record(self, time, positions, velocities):
+        # count the tick
+        tick = self.number_of_ticks
+        self.number_of_ticks = self.number_of_ticks + 1
+
+        # only record every stride-th tick
+        if ((tick % self.stride) != 0):
+            return
+
+        # add the tick to the chunk
+        self.chunk_times[self.chunk_count] = time
+        self.chunk[self.chunk_count, :, 0:2] = positions
+        self.chunk[self.chunk_count, :, 2:4] = velocities
+        self.chunk_count = self.chunk_count + 1
+
+        # write the chunk if it is full
+        if (self.chunk_count == len(self.chunk)):
+            self.flush()
+
+
+    """
+    Function that writes the ticks waiting in the chunk to disk
+    """
+
+    def flush(self):
+        # append the chunk to the files
+        self.chunk[:self.chunk_count].tofile(self.data_file)
+        self.chunk_times[:self.chunk_count].tofile(self.time_file)
+        self.data_file.flush()
+        self.time_file.flush()
+
+        # count the written ticks and empty the chunk
+        self.number_of_samples = self.number_of_samples + self.chunk_count
+        self.chunk_count = 0
+
+        # update the header
+        self._write_header()
+
+
+    """
+    Function that writes the last chunk and closes the files
+    """
+
+    def close(self):
+        # check if the files are still open
+        if (not self.data_file.closed):
+            self.flush()
+            self.data_file.close()
+            self.time_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
+
+
+"""
+Create the TrajectoryFile class
+
+NOTE: Opens a trajectory written by the TrajectoryWriter by memory mapping its files, so
+      nothing is read from disk until it is used. The times, positions, and velocities are
+      views of the mapped files, not copies.
+"""
+
+class TrajectoryFile():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, file_name):
+        # read the header
+        with open(file_name + ".json") as header_file:
+            header = json.load(header_file)
+
+        # the amount of drones, the number of ticks, and the stride
+        self.number_of_drones = header["number_of_drones"]
+        self.number_of_samples = header["number_of_samples"]
+        self.stride = header["stride"]
+
+        # map the files into memory
+        # (an empty run cannot be mapped, so it gets empty arrays instead)
+        shape = (self.number_of_samples, self.number_of_drones, 4)
+        if (self.number_of_samples == 0):
+            self.data = np.zeros(shape, dtype = header["dtype"])
+            self.time = np.zeros(0)
+        else:
+            self.data = np.memmap(file_name + ".bin", dtype = header["dtype"], mode = "r", shape = shape)
+            self.time = np.memmap(file_name + ".time.bin", dtype = np.float64, mode = "r", shape = (self.number_of_samples,))
+
+
+    """
+    Functions that return the recorded times (ticks) and the positions and velocities
+    (ticks, drones, 2)
+    """
+
+    def times(self):
+        return self.time
+
+    def positions(self):
+        return self.data[:, :, 0:2]
+
+    def velocities(self):
+        return self.data[:, :, 2:4]
@@ -0,0 +1,205 @@
+"""
+Import Libraries
+"""
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from headless import run_headless, default_time_step
+from manifest import create_simulation, create_manifest, simulation_parameters
+from result_cache import ResultCache, cache_key
+from metrics import ConvergenceDetector
+
+
+"""
+Create the trial table columns
+
+NOTE: Every trial adds one row to the table. Distances are in meters (divided by 10 the
+      same way the plots in main.py convert them).
+"""
+
+trial_columns = [
+    ("seed", np.int64),                         # the seed used to scatter the drones and rocks
+    ("number_of_drones", np.int64),             # the amount of drones in the trial
+    ("number_of_rocks", np.int64),              # the amount of rocks in the trial
+    ("number_of_ticks", np.int64),              # the amount of ticks simulated
+    ("final_polarization", np.float64),         # how aligned the drones' directions are at the end (1 = all the same direction)
+    ("final_cohesion_radius", np.float64),      # the average distance from the drones to their center of mass at the end
+    ("minimum_drone_distance", np.float64),     # the closest two drones got during the trial
+    ("minimum_rock_clearance", np.float64),     # the closest a drone got to a rock during the trial
+    ("convergence_time", np.float64),           # when the formation settled in seconds (NaN if it never did or convergence was not checked)
+    ("wall_time", np.float64),                  # how long the trial took to run in seconds
+]
+
+# the columns calculated by trial_metrics()
+metric_names = ["final_polarization", "final_cohesion_radius", "minimum_drone_distance", "minimum_rock_clearance", "convergence_time"]
+
+
+"""
+Function that calculates the metrics of a finished trial
+"""
+
+def trial_metrics(positions, velocities, rocks_positions):
+    # get the drones' final positions and velocities
+    final_positions = positions[-1]
+    final_velocities = velocities[-1]
+
+    # average the drones' directions to get the polarization
+    speeds = np.sqrt((final_velocities ** 2).sum(axis = 1))
+    directions = final_velocities / speeds[:, None]
+    final_polarization = np.sqrt((directions.mean(axis = 0) ** 2).sum())
+
+    # average the distances to the center of mass to get the cohesion radius
+    center_of_mass = final_positions.mean(axis = 0)
+    final_cohesion_radius = np.sqrt(((final_positions - center_of_mass) ** 2).sum(axis = 1)).mean()
+
+    # find the closest two drones got to each other
+    minimum_drone_distance = np.inf
+    for i in range(positions.shape[1] - 1):
+        distances = np.sqrt(((positions[:, i + 1:] - positions[:, i, None]) ** 2).sum(axis = 2))
+        minimum_drone_distance = min(minimum_drone_distance, distances.min())
+
+    # find the closest a drone got to a rock
+    minimum_rock_clearance = np.inf
+    for rock in rocks_positions:
+        distances = np.sqrt(((positions - np.asarray(rock)) ** 2).sum(axis = 2))
+        minimum_rock_clearance = min(minimum_rock_clearance, distances.min())
+
+    # return the metrics in meters
+    return final_polarization, final_cohesion_radius / 10, minimum_drone_distance / 10, minimum_rock_clearance / 10
+
+
+"""
+Function that runs a single seeded trial
+
+NOTE: settings changes the rules (see BehaviorPipeline.settings()). If a cache folder is
+      given, a trial that has already been run with the same seed, amounts, time, and
+      settings is read from the cache instead of being simulated again, and new trials
+      are stored in it (see result_cache.py).
+
+NOTE 2: convergence is a dictionary of ConvergenceDetector settings (an empty dictionary
+        uses the defaults). If it is given, the trial stops as soon as the formation has
+        converged and the convergence time is stored in the table.
+"""
+
+def run_trial(seed, number_of_drones = 10, number_of_rocks = 5, simulation_seconds = 30, time_step = default_time_step, settings = None, cache_folder = None, convergence = None):
+    # start the timer
+    start_time = time.perf_counter()
+
+    # find the number of ticks needed to reach the simulation time
+    number_of_ticks = math.ceil(simulation_seconds / time_step)
+
+    # create the convergence detector
+    detector = None
+    if (convergence is not None):
+        detector = ConvergenceDetector(**convergence)
+
+    # look for the trial in the cache
+    # (the convergence settings change where the trial stops, so they are part of the key)
+    cached = None
+    if (cache_folder is not None):
+        cache = ResultCache(cache_folder)
+        parameters = simulation_parameters(seed, number_of_drones, number_of_rocks, time_step, number_of_ticks, 1, settings)
+        if (detector is not None):
+            parameters["convergence"] = detector.settings()
+        key = cache_key(parameters)
+        cached = cache.get(key)
+
+    # use the stored metrics
+    if (cached is not None):
+        recorder, stored_metrics, manifest = cached
+        metrics = tuple(stored_metrics.get(name, np.nan) for name in metric_names)
+
+    else:
+        # create the drones and rocks from the seed (the same way main.py does)
+        # (the seed gives the trial its own random numbers so it can be repeated)
+        swarm, rocks_positions = create_simulation(seed, number_of_drones, number_of_rocks, settings)
+
+        # run the simulation (until the formation converges if a detector is given)
+        recorder = run_headless(swarm, rocks_positions, time_step = time_step, number_of_ticks = number_of_ticks, convergence = detector)
+
+        # calculate the trial's metrics
+        metrics = trial_metrics(recorder.positions(), recorder.velocities(), rocks_positions)
+
+        # add the convergence time
+        if ((detector is not None) and (detector.converged)):
+            metrics = metrics + (detector.convergence_time,)
+        else:
+            metrics = metrics + (np.nan,)
+
+        # store the trial in the cache
+        # (the manifest has the number of ticks that were run, so replaying it gives the same trajectory)
+        if (cache_folder is not None):
+            manifest = create_manifest(seed, swarm, rocks_positions, recorder, time_step, recorder.number_of_ticks)
+            cache.put(key, recorder, {name: float(value) for name, value in zip(metric_names, metrics)}, manifest)
+
+    # stop the timer
+    wall_time = time.perf_counter() - start_time
+
+    # return the trial's row of the table
+    return (seed, number_of_drones, number_of_rocks, recorder.number_of_ticks) + metrics + (wall_time,)
+
+
+"""
+Function that runs many seeded trials across a pool of processes
+
+NOTE: Returns a table (a NumPy structured array) with one row per seed. The number of
+      processes defaults to the number of CPU cores. settings, cache_folder, and
+      convergence are passed to every trial (see run_trial()).
+"""
+
+def run_trials(seeds, number_of_drones = 10, number_of_rocks = 5, simulation_seconds = 30, time_step = default_time_step, number_of_processes = None, settings = None, cache_folder = None, convergence = None):
+    # the number of processes to run the trials on
+    if (number_of_processes is None):
+        number_of_processes = os.cpu_count()
+
+    # the trial to run for each seed
+    trial = partial(run_trial, number_of_drones = number_of_drones, number_of_rocks = number_of_rocks, simulation_seconds = simulation_seconds, time_step = time_step, settings = settings, cache_folder = cache_folder, convergence = convergence)
+
+    # hand the seeds out to the processes in batches
+    # (batches keep the overhead of sending work to the processes low)
+    chunk_size = max(1, len(seeds) // (4 * number_of_processes))
+
+    # run the trials
+    with ProcessPoolExecutor(max_workers = number_of_processes) as executor:
+        rows = list(executor.map(trial, seeds, chunksize = chunk_size))
+
+    # gather the rows into one table
+    return np.array(rows, dtype = trial_columns)
+
+
+"""
+Function that saves the trial table as a CSV file
+"""
+
+def save_trials(table, file_name):
+    # the column names
+    header = ",".join(table.dtype.names)
+
+    # the format of each column (whole numbers for counts, decimals for metrics)
+    formats = ["%d" if (np.issubdtype(table.dtype[name], np.integer)) else "%.6f" for name in table.dtype.names]
+
+    # save the table
+    np.savetxt(file_name, table, delimiter = ",", header = header, fmt = formats, comments = "")
+
+
+"""
+Run 100 trials and save the table
+"""
+
+if __name__ == "__main__":
+    # run the trials
+    # (trials that have already been run are read from the cache folder)
+    table = run_trials(range(100), cache_folder = "Cache")
+
+    # save the table
+    save_trials(table, "trials.csv")
+
+    # print the average of each metric
+    for name in ["final_polarization", "final_cohesion_radius", "minimum_drone_distance", "minimum_rock_clearance", "wall_time"]:
+        print(name + ": " + ('%.3f' % table[name].mean()))
@@ -0,0 +1,418 @@
+"""
+Import Libraries
+"""
+
+import math
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from shapes import arrow_vertices, rock_radius
+from trajectory_file import TrajectoryFile
+from manifest import create_simulation, new_seed
+from headless import run_headless
+
+
+"""
+Create the window size
+
+NOTE: The recorded positions are in the coordinates of main.py's window (the graph goes
+      from 100 to 1100 in a 1200 by 1200 window). Frames of any other resolution are
+      scaled from this window.
+"""
+
+window_height = 1200
+window_width = 1200
+
+
+"""
+Create the default drone colors (the same as main.py, repeated for more drones)
+"""
+
+default_colors = ["firebrick", "purple", "green", "dodgerblue", "gold", "black", "blue", "magenta", "greenyellow", "turquoise"]
+
+
+"""
+Create the FrameRenderer class
+
+NOTE: The frame renderer draws frames of a recorded trajectory without a window (with
+      PIL), the same way main.py draws them: a white background with the graph's grid and
+      axis labels, red rocks, every drone's arrow in its color, and every drone's orange trail (a
+      closed loop through its last trail_length recorded positions). The background and
+      rocks never change, so they are drawn once and copied for every frame.
+"""
+
+class FrameRenderer():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, times, positions, velocities, rocks_positions, colors, width, height, trail_length = 10):
+        # the recorded trajectory
+        self.times = times
+        self.positions = positions
+        self.velocities = velocities
+
+        # the frame size and the scale from the window to the frame
+        self.width = width
+        self.height = height
+        self.scale = np.array([width / window_width, height / window_height])
+
+        # the drones of each color
+        self.color_groups = {}
+        for index in range(positions.shape[1]):
+            self.color_groups.setdefault(colors[index % len(colors)], []).append(index)
+
+        # the number of recorded positions in each trail
+        self.trail_length = trail_length
+
+        # the font of the title, labels, and time (main.py's font if it can be found)
+        try:
+            self.font = ImageFont.truetype(os.path.join(os.path.dirname(os.path.abspath(__file__)), "Roboto-Black.ttf"), max(1, round(20 * self.scale.mean())))
+        except OSError:
+            self.font = ImageFont.load_default()
+
+        # draw the background and rocks
+        self.background = self.draw_background(rocks_positions)
+
+
+    """
+    Function that draws the graph's grid, labels, title, and rocks (the parts that never change)
+
+    NOTE: The labels are placed the same way as main.draw_graph_background() (centered on
+          the given x position with the text sitting on the given y position).
+    """
+
+    def draw_background(self, rocks_positions):
+        # a white frame
+        background = Image.new("RGB", (self.width, self.height), "white")
+        draw = ImageDraw.Draw(background)
+
+        # put simulation title onto graph
+        draw.text(tuple(np.array([600, 15]) * self.scale), "Simulation of the Boids Algorithm", fill = "black", font = self.font, anchor = "mt")
+
+        # draw the vertical and horizontal lines of the grid (100 apart from 100 to 1100)
+        for value in range(100, 1100 + 1, 100):
+            draw.line([tuple(np.array([value, 100]) * self.scale), tuple(np.array([value, 1100]) * self.scale)], fill = (175, 175, 175))
+            draw.line([tuple(np.array([100, value]) * self.scale), tuple(np.array([1100, value]) * self.scale)], fill = (175, 175, 175))
+
+        # number the vertical lines (0 to 100 meters from left to right) and label the x axis
+        for x_label, x in zip(range(0, 100 + 1, 10), range(100, 1100 + 1, 100)):
+            draw.text(tuple(np.array([x, 1100]) * self.scale), str(x_label), fill = "black", font = self.font, anchor = "ms")
+        draw.text(tuple(np.array([600, 1150]) * self.scale), "X (Meters)", fill = "black", font = self.font, anchor = "ms")
+
+        # number the horizontal lines (100 to 0 meters from top to bottom) and label the y axis
+        for y_label, y in zip(range(100, -1, -10), range(100, 1100 + 1, 100)):
+            draw.text(tuple(np.array([80, y - 10]) * self.scale), str(y_label), fill = "black", font = self.font, anchor = "ms")
+        draw.text(tuple(np.array([50, 610]) * self.scale), "Y", fill = "black", font = self.font, anchor = "ms")
+        draw.text(tuple(np.array([50, 630]) * self.scale), "(Meters)", fill = "black", font = self.font, anchor = "ms")
+
+        # draw every rock
+        radius = rock_radius * self.scale
+        for rock in np.asarray(rocks_positions, dtype = float).reshape(-1, 2) * self.scale:
+            draw.ellipse([tuple(rock - radius), tuple(rock + radius)], fill = "red", outline = "red")
+
+        # return the background
+        return background
+
+
+    """
+    Function that finds the recorded tick shown in each frame (the last tick at or before
+    the frame's time)
+    """
+
+    def frame_samples(self, frame_times):
+        return np.clip(np.searchsorted(self.times, frame_times, side = "right") - 1, 0, len(self.times) - 1)
+
+
+    """
+    Function that draws a frame and returns its pixels (RGB bytes)
+    """
+
+    def render(self, frame_time, sample):
+        # start from the background
+        frame = self.background.copy()
+        draw = ImageDraw.Draw(frame)
+
+        # calculate every drone's arrow in frame coordinates
+        vertices = (arrow_vertices(self.positions[sample], self.velocities[sample]) * self.scale).tolist()
+
+        # draw the arrows of every color
+        for color, indices in self.color_groups.items():
+            for index in indices:
+                draw.polygon([tuple(corner) for corner in vertices[index]], fill = color, outline = color)
+
+        # draw every drone's trail as a closed loop
+        # (the oldest position is connected to the newest one)
+        trail_points = self.positions[max(0, sample - self.trail_length + 1):sample + 1] * self.scale
+        trail_points = np.concatenate((trail_points, trail_points[:1]), axis = 0)
+        for trail in trail_points.transpose(1, 0, 2).tolist():
+            draw.line([tuple(point) for point in trail], fill = "orange")
+
+        # put simulation time onto graph
+        draw.text(tuple(np.array([600, 60]) * self.scale), "Time: " + ('%.3f' % frame_time) + " seconds", fill = "black", font = self.font, anchor = "mt")
+
+        # return the pixels
+        return frame.tobytes()
+
+
+"""
+Functions that run on the processes that draw the frames
+
+NOTE: Each process creates its own frame renderer once and then draws ranges of frames
+      (so the trajectory is only sent to each process once).
+"""
+
+_frame_renderer = None
+
+def _start_worker(times, positions, velocities, rocks_positions, colors, width, height, trail_length):
+    global _frame_renderer
+    _frame_renderer = FrameRenderer(times, positions, velocities, rocks_positions, colors, width, height, trail_length)
+
+def _render_frames(frame_times):
+    samples = _frame_renderer.frame_samples(frame_times)
+    return [_frame_renderer.render(frame_time, sample) for frame_time, sample in zip(frame_times, samples)]
+
+
+"""
+Create the FFmpegEncoder class
+
+NOTE: The encoder pipes the raw frames to ffmpeg, which encodes them as an H.264 video.
+      H.264 needs an even width and height, so a frame with an odd width or height is
+      padded by one pixel on the right or bottom.
+"""
+
+class FFmpegEncoder():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, file_name, width, height, fps):
+        self.file_name = file_name
+        self.process = subprocess.Popen([
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", str(width) + "x" + str(height), "-r", str(fps), "-i", "-",
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-c:v", "libx264", "-pix_fmt", "yuv420p", file_name,
+        ], stdin = subprocess.PIPE)
+
+
+    """
+    Functions that encode a frame and finish the video
+    """
+
+    def write(self, frame):
+        self.process.stdin.write(frame)
+
+    def close(self):
+        # (the pipe is already broken if ffmpeg stopped early)
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+
+        if (self.process.wait() != 0):
+            raise RuntimeError("ffmpeg could not encode " + self.file_name)
+
+
+"""
+Create the ImageSequenceEncoder class
+
+NOTE: The encoder saves every frame as a numbered image in a folder (used when ffmpeg is
+      not installed; ffmpeg can turn the images into a video later).
+"""
+
+class ImageSequenceEncoder():
+    """
+    Function that initializes variables to an object
+    """
+
+    def __init__(self, folder, width, height, extension = "png"):
+        self.folder = folder
+        self.width = width
+        self.height = height
+        self.extension = extension
+        self.number_of_frames = 0
+
+        os.makedirs(folder, exist_ok = True)
+
+
+    """
+    Functions that encode a frame and finish the video
+    """
+
+    def write(self, frame):
+        file_name = os.path.join(self.folder, "frame_%06d." % self.number_of_frames + self.extension)
+        Image.frombytes("RGB", (self.width, self.height), frame).save(file_name)
+        self.number_of_frames = self.number_of_frames + 1
+
+    def close(self):
+        pass
+
+
+"""
+Function that creates the encoder for a video file
+
+NOTE: Uses ffmpeg if it is installed, otherwise the frames are saved as images in a folder
+      named after the video file.
+"""
+
+def create_encoder(file_name, width, height, fps):
+    if (shutil.which("ffmpeg") is not None):
+        return FFmpegEncoder(file_name, width, height, fps)
+
+    folder = os.path.splitext(file_name)[0] + "_frames"
+    print("ffmpeg was not found, saving the frames to " + folder)
+    return ImageSequenceEncoder(folder, width, height)
+
+
+"""
+Function that exports a recorded trajectory as a video
+
+NOTE: The frames are drawn at the given frames per second (fps) and resolution by a pool of
+      processes, frames_per_task frames at a time. The drawn frames are handed in order to
+      a thread that feeds the encoder through a queue. At most queue_size tasks are drawn
+      ahead of the encoder and at most queue_size tasks of frames wait in the queue, so
+      the memory used does not grow with the length of the video. Returns the number of
+      frames.
+
+NOTE 2: If the encoder fails (for example ffmpeg exits and the pipe breaks), the thread
+        stores the error and stops, and the error is raised here instead of waiting
+        forever for the thread to take more frames.
+"""
+
+def export_video(times, positions, velocities, rocks_positions, file_name, fps = 30, width = window_width, height = window_height, colors = default_colors, trail_length = 10, number_of_processes = None, frames_per_task = 16, queue_size = 4, encoder = None):
+    # the time of every frame
+    number_of_frames = math.floor(times[-1] * fps) + 1
+    frame_times = np.arange(number_of_frames) / fps
+
+    # the number of processes to draw the frames on
+    if (number_of_processes is None):
+        number_of_processes = os.cpu_count()
+
+    # create the encoder
+    if (encoder is None):
+        encoder = create_encoder(file_name, width, height, fps)
+
+    # the drawn frames waiting for the encoder and the thread that feeds them to it
+    frames = queue.Queue(maxsize = queue_size)
+
+    # the error that stopped the encoder (if there is one)
+    encoder_errors = []
+
+    def encode_frames():
+        try:
+            while True:
+                task_frames = frames.get()
+                if (task_frames is None):
+                    break
+
+                for frame in task_frames:
+                    encoder.write(frame)
+
+        except Exception as error:
+            encoder_errors.append(error)
+
+    encoder_thread = threading.Thread(target = encode_frames)
+    encoder_thread.start()
+
+    # hand a task's frames to the thread
+    # (waits a second at a time so an encoder that stopped is noticed)
+    def hand_to_encoder(task_frames):
+        while True:
+            if (len(encoder_errors) > 0):
+                raise encoder_errors[0]
+
+            if (not encoder_thread.is_alive()):
+                raise RuntimeError("The video encoder stopped before every frame was encoded")
+
+            try:
+                frames.put(task_frames, timeout = 1)
+                return
+
+            except queue.Full:
+                pass
+
+    # the frames drawn by each task
+    tasks = [frame_times[start:start + frames_per_task] for start in range(0, number_of_frames, frames_per_task)]
+
+    # whether every frame was handed to the thread
+    finished = False
+
+    try:
+        # draw the frames on the pool of processes
+        with ProcessPoolExecutor(max_workers = number_of_processes, initializer = _start_worker, initargs = (np.asarray(times), np.asarray(positions), np.asarray(velocities), rocks_positions, colors, width, height, trail_length)) as executor:
+            # start the first tasks
+            pending = [executor.submit(_render_frames, task) for task in tasks[:queue_size]]
+            next_task = len(pending)
+
+            # hand the tasks' frames to the encoder in order and start a new task for each one done
+            while (len(pending) > 0):
+                task_frames = pending.pop(0).result()
+
+                if (next_task < len(tasks)):
+                    pending.append(executor.submit(_render_frames, tasks[next_task]))
+                    next_task = next_task + 1
+
+                hand_to_encoder(task_frames)
+
+        # tell the thread there are no more frames
+        hand_to_encoder(None)
+        finished = True
+
+    finally:
+        # stop the thread if the frames were not all handed to it
+        # (the queue is emptied first so there is room to tell it to stop)
+        if ((not finished) and encoder_thread.is_alive()):
+            try:
+                while True:
+                    frames.get_nowait()
+            except queue.Empty:
+                pass
+
+            frames.put(None)
+
+        # wait for the encoder to finish the video
+        encoder_thread.join()
+        encoder.close()
+
+    # raise the encoder's error (if it failed after the last frames were handed to it)
+    if (len(encoder_errors) > 0):
+        raise encoder_errors[0]
+
+    # return the number of frames
+    return number_of_frames
+
+
+"""
+Function that exports a trajectory saved by a TrajectoryWriter as a video
+"""
+
+def export_trajectory_file(trajectory_file_name, rocks_positions, file_name, **options):
+    trajectory = TrajectoryFile(trajectory_file_name)
+    return export_video(trajectory.times(), trajectory.positions(), trajectory.velocities(), rocks_positions, file_name, **options)
+
+
+"""
+Run a 30 second, 1000 drone simulation without a window and export it as a video
+"""
+
+if __name__ == "__main__":
+    # create the drones and rocks and run the simulation
+    swarm, rocks_positions = create_simulation(new_seed(), 1000, 5)
+    recorder = run_headless(swarm, rocks_positions, simulation_seconds = 30)
+
+    # export the video and time it
+    start_time = time.perf_counter()
+    number_of_frames = export_video(recorder.times(), recorder.positions(), recorder.velocities(), rocks_positions, "simulation.mp4")
+    end_time = time.perf_counter()
+
+    # print how long the video took
+    print("Exported " + str(number_of_frames) + " frames in " + ('%.3f' % (end_time - start_time)) + " seconds")
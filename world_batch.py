@@ -0,0 +1,299 @@
+"""
+Import Libraries
+"""
+
+import time
+
+import numpy as np
+
+from manifest import create_simulation, full_settings
+from speed_check import speed_check_numpy
+
+
+"""
+Create the WorldBatch class
+
+NOTE: The world batch runs many small, independent worlds at once (for example the 10 drone,
+      5 rock world of main.py with different seeds or rule settings). Every world has the
+      same number of drones, and the worlds are stacked into (worlds, drones, 2) arrays, so
+      one tick of every world is a single set of array operations instead of a Python loop
+      over the worlds.
+
+NOTE 2: Each world has its own rocks and its own rule settings (the weights, sight offsets,
+        border margin, avoid_rock_radius, and which rules are turned on, in the format of
+        BehaviorPipeline.settings()). The rules are applied in the default pipeline order
+        (separation, alignment, cohesion, border avoidance, rock avoidance) with the same
+        math as the Swarm, so a world in the batch moves the same way as the Swarm created
+        from the same seed (up to rounding). The rock avoidance field is not used.
+
+NOTE 3: The nearby drones are found by comparing every pair of drones in each world (the
+        worlds are small, so this is faster than a spatial hash). The memory used per
+        tick grows with worlds * drones * drones and worlds * drones * rocks.
+"""
+
+class WorldBatch():
+    """
+    Function that initializes variables to an object
+
+    NOTE: positions, velocities, and accelerations are (worlds, drones, 2) arrays and the
+          speed limits and sight distances are (worlds, drones) arrays. rocks_positions is
+          a list with each world's rock positions (the worlds can have different numbers
+          of rocks). settings is a list with each world's rule settings (missing settings
+          use the defaults).
+    """
+
+    def __init__(self, width, height, positions, velocities, accelerations, max_speeds, min_speeds, sight_distances, rocks_positions, settings = None):
+        # border values
+        self.width = width
+        self.height = height
+
+        # the drones' parameters
+        self.positions = np.array(positions, dtype = float)
+        self.velocities = np.array(velocities, dtype = float)
+        self.accelerations = np.array(accelerations, dtype = float)
+        self.max_speeds = np.array(max_speeds, dtype = float)
+        self.min_speeds = np.array(min_speeds, dtype = float)
+        self.sight_distances = np.array(sight_distances, dtype = float)
+
+        # the number of worlds and the number of drones in each world
+        self.number_of_worlds, self.number_of_drones = self.positions.shape[:2]
+
+        # each world's rocks (padded to the most rocks in a world, rocks_used marks the real ones)
+        most_rocks = max([len(rocks) for rocks in rocks_positions] + [0])
+        self.rocks_positions = np.zeros((self.number_of_worlds, most_rocks, 2))
+        self.rocks_used = np.zeros((self.number_of_worlds, most_rocks), dtype = bool)
+        for world, rocks in enumerate(rocks_positions):
+            self.rocks_positions[world, :len(rocks)] = np.asarray(rocks, dtype = float).reshape(-1, 2)
+            self.rocks_used[world, :len(rocks)] = True
+
+        # each world's rule settings
+        if (settings is None):
+            settings = [None] * self.number_of_worlds
+        self.settings = [full_settings(world_settings) for world_settings in settings]
+
+        # the rule settings as one value per world
+        self.separation_weights = self._setting("separation", "weight")
+        self.separation_offsets = self._setting("separation", "sight_offset")
+        self.separation_enabled = self._setting("separation", "enabled")
+        self.alignment_weights = self._setting("alignment", "weight")
+        self.alignment_offsets = self._setting("alignment", "sight_offset")
+        self.alignment_enabled = self._setting("alignment", "enabled")
+        self.cohesion_weights = self._setting("cohesion", "weight")
+        self.cohesion_offsets = self._setting("cohesion", "sight_offset")
+        self.cohesion_enabled = self._setting("cohesion", "enabled")
+        self.border_weights = self._setting("border_avoidance", "weight")
+        self.border_margins = self._setting("border_avoidance", "margin")
+        self.border_enabled = self._setting("border_avoidance", "enabled")
+        self.rock_weights = self._setting("rock_avoidance", "weight")
+        self.rock_offsets = self._setting("rock_avoidance", "sight_offset")
+        self.rock_radii = self._setting("rock_avoidance", "avoid_rock_radius")
+        self.rock_enabled = self._setting("rock_avoidance", "enabled")
+
+        # a drone never sees itself
+        self.not_self = ~np.eye(self.number_of_drones, dtype = bool)
+
+        # the number of ticks run
+        self.number_of_ticks = 0
+
+
+    """
+    Function that returns one rule setting of every world, shaped (worlds, 1, 1) so it
+    can be multiplied with the (worlds, drones, 2) arrays
+    """
+
+    def _setting(self, rule_name, setting_name):
+        return np.array([float(world_settings[rule_name][setting_name]) for world_settings in self.settings]).reshape(-1, 1, 1)
+
+
+    """
+    Function that checks every drone's speed and adjusts it accordingly
+
+    NOTE: The worlds' drones are handed to speed_check_numpy() as one flat list of drones,
+          so the batch uses the same speed check as the Swarm.
+    """
+
+    def drone_speed_check(self):
+        # every world's drones as one list of drones
+        velocities = self.velocities.reshape(-1, 2)
+        accelerations = self.accelerations.reshape(-1, 2)
+
+        # update the drones' velocities if they are over/under the max/min speed
+        speed_check_numpy(velocities, accelerations, self.min_speeds.reshape(-1), self.max_speeds.reshape(-1))
+
+        # put the drones back into their worlds
+        # (the flat lists are views of the arrays unless the arrays had to be copied)
+        self.velocities = velocities.reshape(self.velocities.shape)
+        self.accelerations = accelerations.reshape(self.accelerations.shape)
+
+
+    """
+    Function that finds which drones can see each other with a sight offset
+
+    NOTE: Returns a (worlds, drones, drones) array that is 1 where drone i can see drone j
+          and the number of drones each drone can see.
+    """
+
+    def _nearby(self, distance_magnitudes, sight_offsets):
+        nearby = (distance_magnitudes < (self.sight_distances[:, :, None] + sight_offsets)) & self.not_self
+        nearby = nearby.astype(float)
+
+        return nearby, nearby.sum(axis = 2)[:, :, None]
+
+
+    """
+    Function that applies the Boids rules and self defined models to every drone of every world
+
+    NOTE: Each rule's velocity is added as soon as it is calculated, and the nearby drones'
+          velocities are the ones from before the rules (the same as BehaviorPipeline.apply()).
+    """
+
+    def apply_rules(self):
+        positions = self.positions
+
+        # the distance between every pair of drones in each world
+        differences = positions[:, :, None, :] - positions[:, None, :, :]
+        distance_magnitudes = np.sqrt((differences * differences).sum(axis = 3))
+
+        # the drones' velocities before the rules
+        velocities_before_rules = self.velocities.copy()
+
+        # Rule 1: Separation
+        # (the total distance to the nearby drones is the number of them times the drone's position minus their positions)
+        nearby, number_of_nearby_drones = self._nearby(distance_magnitudes, self.separation_offsets)
+        drone_avoid_directions = (number_of_nearby_drones * positions) - (nearby @ positions)
+        self.velocities = self.velocities + (self.separation_enabled * self.separation_weights * drone_avoid_directions)
+
+        # Rule 2: Alignment
+        nearby, number_of_nearby_drones = self._nearby(distance_magnitudes, self.alignment_offsets)
+        has_nearby_drones = number_of_nearby_drones != 0
+        average_drone_velocities = (nearby @ velocities_before_rules) / np.maximum(number_of_nearby_drones, 1)
+        drone_alignment_velocities = np.where(has_nearby_drones, self.alignment_weights * (average_drone_velocities - self.velocities), 0)
+        self.velocities = self.velocities + (self.alignment_enabled * drone_alignment_velocities)
+
+        # Rule 3: Cohesion
+        nearby, number_of_nearby_drones = self._nearby(distance_magnitudes, self.cohesion_offsets)
+        has_nearby_drones = number_of_nearby_drones != 0
+        centers_of_mass = (nearby @ positions) / np.maximum(number_of_nearby_drones, 1)
+        drone_cohesion_velocities = np.where(has_nearby_drones, self.cohesion_weights * (centers_of_mass - positions), 0)
+        self.velocities = self.velocities + (self.cohesion_enabled * drone_cohesion_velocities)
+
+        # border avoidance
+        # (starts from the drones' current velocities, the same as BorderAvoidance)
+        # (add 100 to shift graph)
+        border_changes = np.zeros_like(self.velocities)
+        border_changes = border_changes + (positions < self.border_margins[:, :, 0, None])
+        border_changes = border_changes - (positions > (np.array([self.width, self.height]) + 100 - self.border_margins[:, :, 0, None]))
+        border_avoid_velocities = self.velocities + (self.border_weights * border_changes)
+        self.velocities = self.velocities + (self.border_enabled * border_avoid_velocities)
+
+        # rock avoidance
+        if (self.rocks_positions.shape[1] > 0):
+            # create an area of avoidance for each rock
+            rocks = self.rocks_positions + self.rock_radii
+
+            # the distance between every drone and rock in each world
+            rock_differences = positions[:, :, None, :] - rocks[:, None, :, :]
+            rock_distance_magnitudes = np.sqrt((rock_differences * rock_differences).sum(axis = 3))
+
+            # check which rocks are closer than the allowed distance
+            nearby = (rock_distance_magnitudes < (self.sight_distances[:, :, None] + self.rock_offsets)) & self.rocks_used[:, None, :]
+            nearby = nearby.astype(float)
+
+            # add the distances of the nearby rocks to the total and multiply by the rock avoid percentage
+            rock_avoid_directions = (nearby.sum(axis = 2)[:, :, None] * positions) - (nearby @ rocks)
+            self.velocities = self.velocities + (self.rock_enabled * self.rock_weights * rock_avoid_directions)
+
+
+    """
+    Function that advances every drone of every world by one time step
+    """
+
+    def step(self):
+        # update the drones' velocities if they are over/under the max/min speed
+        self.drone_speed_check()
+
+        # update the drones' positions
+        self.positions = self.positions + self.velocities
+
+        # apply the Boids algorithm and self defined models
+        self.apply_rules()
+
+        self.number_of_ticks = self.number_of_ticks + 1
+
+
+    """
+    Function that advances every world by a number of time steps
+    """
+
+    def run(self, number_of_ticks):
+        for tick in range(number_of_ticks):
+            self.step()
+
+
+    """
+    Functions that measure each world's formation (one value per world)
+    """
+
+    def polarizations(self):
+        speeds = np.sqrt((self.velocities * self.velocities).sum(axis = 2, keepdims = True))
+        directions = self.velocities / np.where(speeds > 0, speeds, 1)
+        average_directions = directions.mean(axis = 1)
+
+        return np.sqrt((average_directions * average_directions).sum(axis = 1))
+
+    def cohesion_radii(self):
+        distances = self.positions - self.positions.mean(axis = 1, keepdims = True)
+
+        return np.sqrt((distances * distances).sum(axis = 2)).mean(axis = 1)
+
+
+"""
+Function that creates a batch of worlds from seeds
+
+NOTE: Each world is created from its seed the same way as a headless run (see
+      manifest.create_simulation()), so a world starts exactly like the run with the same
+      seed. settings is one settings dictionary for every world or a list with one per
+      world.
+"""
+
+def create_world_batch(seeds, number_of_drones, number_of_rocks, settings = None):
+    # one settings dictionary per world
+    if ((settings is None) or isinstance(settings, dict)):
+        settings = [settings] * len(seeds)
+
+    # create each world's drones and rocks
+    swarms = []
+    rocks_positions = []
+    for seed in seeds:
+        swarm, rocks = create_simulation(seed, number_of_drones, number_of_rocks)
+        swarms.append(swarm)
+        rocks_positions.append(rocks)
+
+    # stack the worlds
+    return WorldBatch(
+        swarms[0].width, swarms[0].height,
+        [swarm.positions for swarm in swarms],
+        [swarm.velocities for swarm in swarms],
+        [swarm.accelerations for swarm in swarms],
+        [swarm.max_speeds for swarm in swarms],
+        [swarm.min_speeds for swarm in swarms],
+        [swarm.sight_distances for swarm in swarms],
+        rocks_positions,
+        settings,
+    )
+
+
+"""
+Run 100 ticks of batches of 10 drone, 5 rock worlds and print how many world ticks are
+run each second
+"""
+
+if __name__ == "__main__":
+    for number_of_worlds in [1, 16, 256, 4096]:
+        world_batch = create_world_batch(list(range(number_of_worlds)), 10, 5)
+
+        start_time = time.perf_counter()
+        world_batch.run(100)
+        end_time = time.perf_counter()
+
+        print(str(number_of_worlds) + " worlds: " + ('%.0f' % ((number_of_worlds * 100) / (end_time - start_time))) + " world ticks per second")